@@ -2,10 +2,26 @@ import streamlit as st
 import pandas as pd
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
 import numpy as np
-from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from pathlib import Path
+from telugu_corpus import (
+    DEFAULT_CORPUS_PATH,
+    EXPECTED_COLUMNS,
+    Corpus,
+    SchemaError,
+    ShardError,
+    fingerprint,
+    format_bytes,
+    format_date,
+)
+from telugu_corpus import profiling
+from telugu_corpus.charts import CHART_TABS
+from telugu_corpus.debug import debug_enabled, show_profile
+from telugu_corpus.export import EXPORT_FORMATS
+from telugu_corpus.grid import PAGE_SIZES, page_count, update_selection
+
+GRID_SORT_COLUMNS = ['ID', 'Title', 'Type', 'Author', 'Publisher', 'Magazine', 'Published date', 'Vol', 'STATUS']
+GRID_FILTER_COLUMNS = ['Title', 'Type', 'Author', 'Publisher', 'Magazine']
+AUTHOR_MATCHES = 20
 
 # Set page configuration
 st.set_page_config(
@@ -15,6 +31,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Time the stages of this rerun (shown with ?debug=1, logged to
+# $TELUGU_CORPUS_PROFILE_LOG when set)
+profiling.start("dashboard")
+
 # Custom CSS for Telugu text rendering and styling
 st.markdown("""
 <style>
@@ -69,10 +89,294 @@ st.markdown("""
 # Initialize session state variables
 if 'search_query' not in st.session_state:
     st.session_state.search_query = ""
+if 'search_input' not in st.session_state:
+    st.session_state.search_input = st.session_state.search_query
 if 'fullscreen_mode' not in st.session_state:
     st.session_state.fullscreen_mode = False
-if 'filtered_df' not in st.session_state:
-    st.session_state.filtered_df = None
+if 'selection' not in st.session_state:
+    st.session_state.selection = None
+if 'selected_ids' not in st.session_state:
+    st.session_state.selected_ids = set()
+
+
+def submit_search():
+    st.session_state.search_query = st.session_state.search_input
+
+
+def clear_search():
+    st.session_state.search_query = ""
+    st.session_state.search_input = ""
+
+
+@st.fragment
+def render_charts(corpus, result_rows, state_fp, chart_counts):
+    """Chart tabs; only the open tab builds and sends its figures."""
+    # A fragment rerun (switching tabs) is profiled as a run of its own
+    with profiling.profiled("dashboard.charts"):
+        tabs = st.tabs(list(CHART_TABS), key="viz_tab", on_change="rerun")
+        for (label, build), tab in zip(CHART_TABS.items(), tabs):
+            if not tab.open:
+                continue
+            # Figures are memoized per tab by the filter-state fingerprint,
+            # so reruns that don't change the selection reuse them
+            with profiling.stage("charts.figures"):
+                figures = corpus.memoized(
+                    ('chart_figures', label, state_fp),
+                    lambda: build(chart_counts, lambda: corpus.df['Author'].iloc[result_rows])
+                )
+            # Sending the figures to the browser is timed separately from building them
+            with tab, profiling.stage("charts.render"):
+                show_figures(figures)
+
+
+def show_figures(figures):
+    # Charts of a tab in rows of two; the trend charts take a full row
+    pairs = [name for name in figures if name not in ('authors', 'monthly')]
+    for i in range(0, len(pairs), 2):
+        for column, name in zip(st.columns(2), pairs[i:i + 2]):
+            with column:
+                st.plotly_chart(figures[name], use_container_width=True)
+    for name in ('authors', 'monthly'):
+        if name in figures:
+            st.plotly_chart(figures[name], use_container_width=True)
+            meta = figures[name].layout.meta
+            if meta:
+                st.caption(f"Showing {meta['shown']:,} of {meta['points']:,} points (downsampled)")
+
+
+@st.fragment
+def render_grid(corpus, result_rows, state_fp):
+    """Interactive data table; reruns on its own for paging, sorting and selection."""
+    # A fragment rerun is profiled as a run of its own
+    with profiling.profiled("dashboard.grid"), profiling.stage("grid"):
+        grid_view(corpus, result_rows, state_fp)
+
+
+def grid_view(corpus, result_rows, state_fp):
+    # Display the grid
+    st.markdown("###  Interactive Data Table")
+    
+    # Server-side row model: sorting, column filters and paging run on row
+    # positions here and only the visible page is sent to the browser
+    grid_sort_col1, grid_sort_col2, grid_sort_col3 = st.columns([2, 1, 1])
+    with grid_sort_col1:
+        sort_by = st.selectbox("Sort by", ['(none)'] + GRID_SORT_COLUMNS, key="grid_sort_by")
+    with grid_sort_col2:
+        sort_order = st.selectbox("Order", ["Ascending", "Descending"], key="grid_sort_order")
+    with grid_sort_col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key="grid_page_size")
+    
+    with st.expander("Column filters"):
+        filter_cols = st.columns(len(GRID_FILTER_COLUMNS))
+        column_filters = {
+            col: filter_cols[i].text_input(col, key=f"grid_filter_{col}")
+            for i, col in enumerate(GRID_FILTER_COLUMNS)
+        }
+    
+    with profiling.stage("grid.rows"):
+        grid_rows = corpus.order(
+            result_rows,
+            sort_by=None if sort_by == '(none)' else sort_by,
+            ascending=sort_order == "Ascending",
+            column_filters=column_filters,
+            rows_key=state_fp
+        )
+    total_pages = page_count(len(grid_rows), page_size)
+    
+    # Grid display options
+    grid_col1, grid_col2, grid_col3, grid_col4 = st.columns([2, 1, 1, 1])
+    
+    with grid_col2:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, step=1, key="grid_page")
+    
+    page_start = (min(page, total_pages) - 1) * page_size
+    page_rows = grid_rows[page_start:page_start + page_size]
+    page_df = corpus.records(page_rows)
+    
+    with grid_col1:
+        st.markdown(f"**Showing {len(page_df):,} of {len(grid_rows):,} records (page {min(page, total_pages)} of {total_pages})**")
+    
+    with grid_col3:
+        fit_columns = st.checkbox("Fit columns to width", value=True)
+        show_link_status = st.checkbox("Link status", key="grid_link_status",
+                                       help="Result of the last link check (run `python -m telugu_corpus links`)")
+    
+    with grid_col4:
+        if st.button("Expand/Minimize"):
+            st.session_state.fullscreen_mode = not st.session_state.fullscreen_mode
+            st.rerun(scope="fragment")
+    
+    # Read from the link cache; links are checked from the command line
+    if show_link_status:
+        page_df = page_df.assign(**{'Link status': corpus.link_states(page_rows)})
+    
+    # Configure AgGrid
+    gb = GridOptionsBuilder.from_dataframe(page_df)
+    
+    # Configure column properties
+    gb.configure_column("ID", width=80, type=["numericColumn"], precision=0, pinned='left')
+    gb.configure_column("Title", width=250, wrapText=True, autoHeight=True)
+    gb.configure_column("Type", width=100)
+    gb.configure_column("Author", width=200, wrapText=True, autoHeight=True)
+    gb.configure_column("Publisher", width=130)
+    gb.configure_column("Magazine", width=130)
+    gb.configure_column("Published date", width=120)
+    gb.configure_column("Vol", width=100)
+    gb.configure_column("Link", width=100, cellRenderer="""
+        function(params) {
+            if (params.value) {
+                return '<a href="' + params.value + '" target="_blank" style="color: #007bff; text-decoration: none;">📄 View</a>';
+            }
+            return '';
+        }
+    """)
+    gb.configure_column("STATUS", width=90, type=["booleanColumn"])
+    if show_link_status:
+        gb.configure_column("Link status", width=110)
+    
+    # Hide helper columns
+    if 'Year' in page_df.columns:
+        gb.configure_column("Year", hide=True)
+    if 'Month' in page_df.columns:
+        gb.configure_column("Month", hide=True)
+    if 'Decade' in page_df.columns:
+        gb.configure_column("Decade", hide=True)
+    if 'Date precision' in page_df.columns:
+        gb.configure_column("Date precision", hide=True)
+    
+    # Configure grid options (sorting and filtering happen server-side)
+    gb.configure_default_column(
+        groupable=True,
+        value=True,
+        enableRowGroup=True,
+        aggFunc="count",
+        editable=False,
+        filter=False,
+        sortable=False,
+        resizable=True
+    )
+    
+    gb.configure_side_bar()
+    # Selection is tracked by record ID across pages
+    page_ids = page_df['ID'].tolist()
+    gb.configure_selection(
+        selection_mode="multiple",
+        use_checkbox=True,
+        pre_selected_rows=[i for i, record_id in enumerate(page_ids) if record_id in st.session_state.selected_ids]
+    )
+    
+    gb.configure_grid_options(
+        enableColResize=True,
+        enableRangeSelection=True,
+        domLayout='normal',
+        suppressMenuHide=False,
+        animateRows=True,
+        enableBrowserTooltips=True
+    )
+    
+    gridOptions = gb.build()
+    
+    # Calculate dynamic height
+    if st.session_state.fullscreen_mode:
+        grid_height = 800
+    else:
+        grid_height = min(max(len(page_df) * 35, 400), 600)
+    
+    # Display AgGrid
+    with profiling.stage("grid.aggrid"):
+        grid_response = AgGrid(
+            page_df,
+            gridOptions=gridOptions,
+            data_return_mode=DataReturnMode.AS_INPUT,
+            update_mode=GridUpdateMode.SELECTION_CHANGED,
+            fit_columns_on_grid_load=fit_columns,
+            enable_enterprise_modules=True,
+            height=grid_height,
+            width='100%',
+            reload_data=True,
+            theme='streamlit',
+            key='main_grid'
+        )
+    
+    # Merge this page's selection into the tracked record IDs
+    if grid_response and 'selected_rows' in grid_response and grid_response['selected_rows'] is not None:
+        page_selection = pd.DataFrame(grid_response['selected_rows'])
+        page_selected_ids = page_selection['ID'].tolist() if 'ID' in page_selection else []
+        st.session_state.selected_ids = update_selection(st.session_state.selected_ids, page_ids, page_selected_ids)
+    
+    # Display selection info
+    if st.session_state.selected_ids:
+        st.markdown("### 🎯 Selected Records")
+        selected_df = corpus.df[corpus.df['ID'].isin(st.session_state.selected_ids)]
+        st.write(f"Selected {len(selected_df)} record(s)")
+        if st.button("Clear Selection"):
+            st.session_state.selected_ids = set()
+            st.rerun(scope="fragment")
+        
+        # Show selected records in a compact format
+        for idx, row in selected_df.iterrows():
+            with st.expander(f"📖 {row['Title']} - {row['Author']}"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Type:** {row['Type']}")
+                    st.write(f"**Publisher:** {row['Publisher']}")
+                    st.write(f"**Magazine:** {row['Magazine']}")
+                with col2:
+                    st.write(f"**Published:** {format_date(row['Published date'], row['Date precision'])}")
+                    st.write(f"**Volume:** {row['Vol'] if pd.notna(row['Vol']) else 'N/A'}")
+                    st.write(f"**Status:** {'Active' if row['STATUS'] else 'Inactive'}")
+                if pd.notna(row['Link']) and row['Link']:
+                    st.markdown(f"[📄 View Document]({row['Link']})")
+    
+    # Exports live in the fragment so they follow the grid selection
+    render_export(corpus, result_rows)
+
+
+def render_export(corpus, result_rows):
+    """Download buttons for the current results or the rows selected in the grid."""
+    st.markdown("### Export Options")
+    export_rows = result_rows
+    if st.session_state.selected_ids:
+        scope = st.radio("Export", ["Filtered results", "Selected rows"], horizontal=True, key="export_scope")
+        if scope == "Selected rows":
+            export_rows = np.flatnonzero(corpus.df['ID'].isin(st.session_state.selected_ids).to_numpy())
+    st.caption(f"{len(export_rows):,} records. Files are written to disk in chunks when you click and reused for the same selection; the finished file is held in memory while it downloads.")
+    
+    # Files are generated on click, off the script thread.  Streamlit serves
+    # downloads from memory, so the finished file is read in whole
+    for column, (fmt, (extension, mime)) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with column:
+            st.download_button(
+                f"Download {fmt}",
+                data=lambda fmt=fmt: Path(corpus.export(export_rows, fmt)).read_bytes(),
+                file_name=f"telugu_corpus.{extension}",
+                mime=mime,
+                on_click="ignore",
+                key=f"export_{extension}",
+                use_container_width=True
+            )
+
+
+@st.fragment
+def render_duplicates(corpus, result_rows):
+    """Records of the results whose titles are near duplicates of each other."""
+    st.markdown("### Possible Duplicates")
+    if not st.toggle("Find possible duplicates", key="duplicates_on",
+                     help="Groups records whose titles differ only in spacing, punctuation, zero-width characters or vowel signs"):
+        return
+    same = st.columns(3)
+    fields = [
+        field for column, (field, label) in zip(same, [('Author', "Same author"), ('Magazine', "Same magazine"), ('Year', "Same year")])
+        if column.checkbox(label, key=f"duplicates_same_{field.lower()}")
+    ]
+    with st.spinner("Comparing titles..."), profiling.stage("duplicates.groups"):
+        groups = corpus.duplicates(result_rows, fields)
+    if groups.empty:
+        st.info("No possible duplicates in the filtered results.")
+        return
+    st.caption(f"{groups['Group'].max():,} groups, {len(groups):,} records")
+    st.dataframe(groups, hide_index=True, use_container_width=True)
+
 
 # File upload section
 # Data source selection
@@ -80,12 +384,13 @@ if 'filtered_df' not in st.session_state:
 st.markdown("### Data Source")
 data_source = st.radio(
     "Choose your data source:",
-    ["Use Existing Telugu Corpus data", "Upload your own CSV file"],
+    ["Use Existing Telugu Corpus data", "Upload your own CSV file", "Use a directory of CSV shards"],
     horizontal=True
 )
 
 uploaded_file = None
 existing_file_path = None
+corpus = None
 
 if data_source == "Upload your own CSV file":
     uploaded_file = st.file_uploader(
@@ -93,13 +398,33 @@ if data_source == "Upload your own CSV file":
         type=['csv'],
         help="Upload the sorted_data.csv file containing Telugu corpus information"
     )
+elif data_source == "Use a directory of CSV shards":
+    shard_source = st.text_input(
+        "Directory or glob of CSV shards",
+        key="shard_source",
+        help="Every CSV file of the directory (or matching the glob, e.g. shards/*.csv) is loaded "
+             "as one corpus; the shards must have the same columns"
+    )
+    if shard_source:
+        try:
+            # Shards are parsed in parallel once per version of the files
+            with st.spinner("Loading shards..."), profiling.stage("load"):
+                corpus = Corpus.load(shard_source)
+            existing_file_path = shard_source
+            st.info(f"Using {shard_source} ({len(corpus):,} records)")
+        except ShardError as e:
+            st.error(f"{len(e.errors)} shard(s) could not be loaded:")
+            st.markdown("\n".join(f"- `{Path(path).name}`: {reason}" for path, reason in e.errors.items()))
+        except SchemaError as e:
+            st.error(str(e))
 else:
-    existing_file_path = "sorted_data[1].csv"  # Replace with your actual CSV filename
+    existing_file_path = DEFAULT_CORPUS_PATH  # Replace with your actual CSV filename
     try:
-        # Test if file exists and is readable
-        test_df = pd.read_csv(existing_file_path)
-        st.info(f"Using Existing Telugu corpus data ({len(test_df):,} records)")
-        del test_df  # Clean up memory
+        # Parsed once per process and reused until the file changes
+        with st.spinner("Loading data..."), profiling.stage("load"):
+            corpus = Corpus.load(existing_file_path)
+        deltas = f", {len(corpus.deltas)} update file(s) merged" if corpus.deltas else ""
+        st.info(f"Using Existing Telugu corpus data ({len(corpus):,} records{deltas})")
     except FileNotFoundError:
         st.error(f"Existing Corpus data file '{existing_file_path}' not found in the current directory.")
         existing_file_path = None
@@ -110,12 +435,19 @@ else:
 if uploaded_file is not None or existing_file_path is not None:
     try:
         # Load the data
-        # Load the data
-        with st.spinner("Loading data..."):
-            if uploaded_file is not None:
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_csv("sorted_data[1].csv")
+        if uploaded_file is not None:
+            # New uploads are streamed in chunks; cached ones return at once
+            progress_bar = st.progress(0.0, text="Reading upload...")
+            with profiling.stage("load"):
+                corpus = Corpus.from_upload(
+                    uploaded_file,
+                    progress=lambda done, total: progress_bar.progress(
+                        done / total if total else 1.0,
+                        text=f"Reading upload... {format_bytes(done)} of {format_bytes(total)}"
+                    )
+                )
+            progress_bar.empty()
+        df = corpus.df
         
         # Data validation and preprocessing
         st.success(f"Data loaded successfully! Found {len(df):,} records with {len(df.columns)} columns.")
@@ -133,58 +465,125 @@ if uploaded_file is not None or existing_file_path is not None:
         with col4:
             st.metric("Active Status", f"{df['STATUS'].sum():,}")
         
-        # Data preprocessing for better display
-        df_display = df.copy()
-        
-        # Handle missing values in Vol column
-        df_display['Vol'] = df_display['Vol'].fillna('N/A')
+        # Per-column memory of the shared corpus frame
+        with st.expander("Memory usage"):
+            mem_report = corpus.memory_report()
+            st.caption(f"Corpus frame uses {format_bytes(mem_report['Bytes'].sum())} in this process (shared by all sessions).")
+            st.dataframe(
+                mem_report.assign(Size=mem_report['Bytes'].map(format_bytes))[['Column', 'Dtype', 'Size', 'Share']],
+                hide_index=True
+            )
         
-        # Convert Published date to datetime for better sorting
-        try:
-            df_display['Published date'] = pd.to_datetime(df_display['Published date'])
-            df_display['Year'] = df_display['Published date'].dt.year
-            df_display['Month'] = df_display['Published date'].dt.month
-            df_display['Decade'] = (df_display['Year'] // 10) * 10
-        except:
-            st.warning("Some dates could not be parsed. Displaying as original format.")
-            df_display['Year'] = 'N/A'
-            df_display['Month'] = 'N/A'
-            df_display['Decade'] = 'N/A'
+        # The loader returns the compact canonical frame (categorical strings,
+        # parsed dates and Year/Month/Decade keys), so no per-rerun copy is needed
+        df_display = df
+        
+        date_precision = df_display['Date precision'].value_counts()
+        missing_dates = int(df_display['Year'].isna().sum())
+        if missing_dates:
+            st.warning(
+                f"{missing_dates:,} records have no usable Published date "
+                f"({int(date_precision['invalid']):,} could not be parsed); "
+                "they are left out of date charts and of narrowed year ranges."
+            )
+        partial_dates = int(date_precision['month'] + date_precision['year'])
+        if partial_dates:
+            st.info(f"{partial_dates:,} records only give a publication year or month; they are kept in yearly charts.")
         
         # Sidebar filters
         st.sidebar.header("Filter Options")
         
         # Reset filters button
-        if st.sidebar.button("Reset All Filters"):
-            st.session_state.search_query = ""
-            st.rerun()
+        st.sidebar.button("Reset All Filters", on_click=clear_search)
+        
+        # Filter bitmaps are built, or read from the artifact store, once
+        # per corpus version
+        with profiling.stage("filters.engine"):
+            corpus.engine
+        status_values = {'Active (True)': True, 'Inactive (False)': False}
+        
+        def filter_spec(type_value, author_value, publisher_value, magazine_value, status_value):
+            return {
+                'Type': None if type_value == 'All' else type_value,
+                'Author': tuple(author_value) or None,
+                'Publisher': None if publisher_value == 'All' else publisher_value,
+                'Magazine': None if magazine_value == 'All' else magazine_value,
+                'STATUS': status_values.get(status_value),
+            }
         
-        # Type filter
-        types = ['All'] + sorted(df['Type'].unique().tolist())
-        selected_type = st.sidebar.selectbox("Filter by Type", types, key="type_filter")
+        min_year, max_year = corpus.year_bounds or (None, None)
+        
+        # Everything derived from the filter state below is memoized by the
+        # corpus under its fingerprint, so unrelated reruns don't recompute it
+        search_query = st.session_state.search_query
+        # "Inside texts" searches the full-text index of the linked documents
+        in_texts = corpus.texts is not None and st.session_state.get('search_mode') == "Inside texts"
+        if search_query:
+            with profiling.stage("search"):
+                corpus.search(search_query, in_texts)
+        
+        # Facet counts for every dropdown given the other active filters,
+        # computed in one pass from the widget values of this rerun
+        facet_spec = filter_spec(
+            st.session_state.get('type_filter', 'All'),
+            st.session_state.get('author_filter', []),
+            st.session_state.get('publisher_filter', 'All'),
+            st.session_state.get('magazine_filter', 'All'),
+            st.session_state.get('status_filter', 'All'),
+        )
+        facet_years = corpus.narrow_years(st.session_state.get('year_filter'))
+        with profiling.stage("filters.facets"):
+            facets = corpus.facets(facet_spec, facet_years, search_query, in_texts)
         
-        # Author filter (top 50 most frequent authors)
-        top_authors = df['Author'].value_counts().head(50).index.tolist()
-        authors = ['All'] + top_authors
-        selected_author = st.sidebar.selectbox("Filter by Author (Top 50)", authors, key="author_filter")
+        def with_count(column):
+            counts = facets[column]
+            return lambda value: f"{value} ({counts.sum() if value == 'All' else counts.get(value, 0):,})"
+        
+        # Type filter
+        types = ['All'] + facets['Type'].index.tolist()
+        selected_type = st.sidebar.selectbox("Filter by Type", types, key="type_filter", format_func=with_count('Type'))
+        
+        # Author filter: typeahead over every author through the prefix index
+        # (Telugu script or romanized), most works first; several can be picked
+        author_query = st.sidebar.text_input(
+            "Find authors",
+            key="author_query",
+            placeholder="Name or surname, e.g. శ్రీ or sri",
+            help="Matches the start of any word of an author's name, in Telugu script or in Latin letters."
+        )
+        with profiling.stage("filters.authors"):
+            author_matches = corpus.complete_authors(author_query, AUTHOR_MATCHES)
+        # Picked authors stay available while the typed query changes
+        author_options = list(dict.fromkeys(st.session_state.get('author_filter', []) + author_matches))
+        selected_author = st.sidebar.multiselect(
+            "Filter by Author",
+            author_options,
+            key="author_filter",
+            format_func=with_count('Author'),
+            placeholder="All authors"
+        )
         
         # Publisher filter
-        publishers = ['All'] + sorted(df['Publisher'].unique().tolist())
-        selected_publisher = st.sidebar.selectbox("Filter by Publisher", publishers, key="publisher_filter")
+        publishers = ['All'] + facets['Publisher'].index.tolist()
+        selected_publisher = st.sidebar.selectbox("Filter by Publisher", publishers, key="publisher_filter", format_func=with_count('Publisher'))
         
         # Magazine filter
-        magazines = ['All'] + sorted(df['Magazine'].unique().tolist())
-        selected_magazine = st.sidebar.selectbox("Filter by Magazine", magazines, key="magazine_filter")
+        magazines = ['All'] + facets['Magazine'].index.tolist()
+        selected_magazine = st.sidebar.selectbox("Filter by Magazine", magazines, key="magazine_filter", format_func=with_count('Magazine'))
         
         # Status filter
+        status_counts = facets['STATUS']
         status_options = ['All', 'Active (True)', 'Inactive (False)']
-        selected_status = st.sidebar.selectbox("Filter by Status", status_options, key="status_filter")
+        selected_status = st.sidebar.selectbox(
+            "Filter by Status",
+            status_options,
+            key="status_filter",
+            format_func=lambda value: f"{value} ({status_counts.sum() if value == 'All' else status_counts.get(status_values[value], 0):,})"
+        )
         
         # Year range filter (if dates are available)
         year_range = None
-        if 'Year' in df_display.columns and df_display['Year'].dtype != 'object':
-            min_year = int(df_display['Year'].min())
-            max_year = int(df_display['Year'].max())
+        if min_year is not None:
             year_range = st.sidebar.slider(
                 "Filter by Year Range",
                 min_value=min_year,
@@ -193,304 +592,85 @@ if uploaded_file is not None or existing_file_path is not None:
                 key="year_filter"
             )
         
-        # Apply filters
-        filtered_df = df_display.copy()
-        
-        if selected_type != 'All':
-            filtered_df = filtered_df[filtered_df['Type'] == selected_type]
-        
-        if selected_author != 'All':
-            filtered_df = filtered_df[filtered_df['Author'] == selected_author]
-        
-        if selected_publisher != 'All':
-            filtered_df = filtered_df[filtered_df['Publisher'] == selected_publisher]
-        
-        if selected_magazine != 'All':
-            filtered_df = filtered_df[filtered_df['Magazine'] == selected_magazine]
-        
-        if selected_status == 'Active (True)':
-            filtered_df = filtered_df[filtered_df['STATUS'] == True]
-        elif selected_status == 'Inactive (False)':
-            filtered_df = filtered_df[filtered_df['STATUS'] == False]
-        
-        # Apply year filter if available
-        if year_range and 'Year' in filtered_df.columns and filtered_df['Year'].dtype != 'object':
-            filtered_df = filtered_df[
-                (filtered_df['Year'] >= year_range[0]) & 
-                (filtered_df['Year'] <= year_range[1])
-            ]
-        
-        # Store filtered data in session state
-        st.session_state.filtered_df = filtered_df
+        # Apply filters: the engine ANDs precomputed per-value bitmaps and
+        # returns row positions, so only the final selection is materialized
+        active_filters = filter_spec(selected_type, selected_author, selected_publisher, selected_magazine, selected_status)
+        year_range = corpus.narrow_years(year_range)
+        with profiling.stage("filters.select"):
+            filter_rows = corpus.filter_rows(active_filters, year_range)
+        
+        # Store only the selected row positions and filter spec in session
+        # state; other pages resolve them against the shared corpus
+        st.session_state.selection = corpus.selection(
+            filter_rows,
+            {'filters': active_filters, 'year_range': year_range}
+        )
         
-        # Apply search filter
-        if st.session_state.search_query:
-            search_mask = (
-                filtered_df['Title'].str.contains(st.session_state.search_query, case=False, na=False) |
-                filtered_df['Author'].str.contains(st.session_state.search_query, case=False, na=False) |
-                filtered_df['Type'].str.contains(st.session_state.search_query, case=False, na=False) |
-                filtered_df['Publisher'].str.contains(st.session_state.search_query, case=False, na=False) |
-                filtered_df['Magazine'].str.contains(st.session_state.search_query, case=False, na=False)
-            )
-            filtered_df = filtered_df[search_mask]
+        # Apply search filter through the shared n-gram index (row positions).
+        # Ranked full-text results change when the text index is rebuilt
+        texts_version = corpus.texts.version if in_texts else None
+        state_fp = fingerprint(active_filters, year_range, search_query, in_texts, texts_version)
+        with profiling.stage("search.intersect"):
+            result_rows = corpus.select(active_filters, year_range, search_query, in_texts)
         
         # Display filtered results count
-        st.markdown(f"### Filtered Results: {len(filtered_df):,} records")
+        st.markdown(f"### Filtered Results: {len(result_rows):,} records")
         
         # Data Visualization Section
-        if len(filtered_df) > 0 and 'Year' in filtered_df.columns and filtered_df['Year'].dtype != 'object':
+        if len(result_rows) > 0:
             st.markdown("### Data Visualizations")
             
-            # Create tabs for different visualizations
-            viz_tab1, viz_tab2, viz_tab3 = st.tabs(["Time Series Analysis", "Distribution Charts", "Detailed Analytics"])
-            
-            with viz_tab1:
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Publications by Year (Bar Chart)
-                    yearly_data = filtered_df.groupby('Year').size().reset_index(name='Count')
-                    fig_yearly = px.bar(
-                        yearly_data, 
-                        x='Year', 
-                        y='Count',
-                        title='Publications by Year',
-                        labels={'Count': 'Number of Publications', 'Year': 'Publication Year'},
-                        color='Count',
-                        color_continuous_scale='blues'
-                    )
-                    fig_yearly.update_layout(height=400, showlegend=False)
-                    st.plotly_chart(fig_yearly, use_container_width=True)
-                
-                with col2:
-                    # Publications by Decade (Line Chart)
-                    decade_data = filtered_df.groupby('Decade').size().reset_index(name='Count')
-                    fig_decade = px.line(
-                        decade_data, 
-                        x='Decade', 
-                        y='Count',
-                        title='Publications by Decade',
-                        labels={'Count': 'Number of Publications', 'Decade': 'Decade'},
-                        markers=True
-                    )
-                    fig_decade.update_layout(height=400)
-                    st.plotly_chart(fig_decade, use_container_width=True)
+            # Chart data comes from the pre-aggregated count cube unless the
+            # selection (author filter or search) is not expressible in it
+            def chart_counts(by):
+                return corpus.counts(by, active_filters, year_range, search_query, in_texts)
             
-            with viz_tab2:
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Type Distribution (Pie Chart)
-                    type_data = filtered_df['Type'].value_counts().head(10)
-                    fig_type = px.pie(
-                        values=type_data.values,
-                        names=type_data.index,
-                        title='Distribution by Content Type (Top 10)',
-                        color_discrete_sequence=px.colors.qualitative.Set3
-                    )
-                    fig_type.update_layout(height=400)
-                    st.plotly_chart(fig_type, use_container_width=True)
-                
-                with col2:
-                    # Publisher Distribution (Pie Chart)
-                    publisher_data = filtered_df['Publisher'].value_counts().head(8)
-                    fig_publisher = px.pie(
-                        values=publisher_data.values,
-                        names=publisher_data.index,
-                        title='Distribution by Publisher (Top 8)',
-                        color_discrete_sequence=px.colors.qualitative.Pastel
-                    )
-                    fig_publisher.update_layout(height=400)
-                    st.plotly_chart(fig_publisher, use_container_width=True)
-            
-            with viz_tab3:
-                # Top Authors by Publication Count
-                author_data = filtered_df['Author'].value_counts().head(15)
-                fig_authors = px.bar(
-                    x=author_data.values,
-                    y=author_data.index,
-                    orientation='h',
-                    title='Top 15 Most Prolific Authors',
-                    labels={'x': 'Number of Publications', 'y': 'Author'},
-                    color=author_data.values,
-                    color_continuous_scale='viridis'
-                )
-                fig_authors.update_layout(height=600, showlegend=False)
-                st.plotly_chart(fig_authors, use_container_width=True)
-                
-                # Monthly Publication Trends (if enough data)
-                if len(filtered_df) > 100:
-                    monthly_data = filtered_df.groupby(['Year', 'Month']).size().reset_index(name='Count')
-                    monthly_data['Date'] = pd.to_datetime(monthly_data[['Year', 'Month']].assign(day=1))
-                    
-                    fig_monthly = px.line(
-                        monthly_data, 
-                        x='Date', 
-                        y='Count',
-                        title='Monthly Publication Trends',
-                        labels={'Count': 'Number of Publications', 'Date': 'Publication Date'}
-                    )
-                    fig_monthly.update_layout(height=400)
-                    st.plotly_chart(fig_monthly, use_container_width=True)
+            render_charts(corpus, result_rows, state_fp, chart_counts)
         
-        # Search functionality
+        # Search functionality (the query is applied above on the next rerun;
+        # callbacks update it so an edit costs a single rerun)
         st.markdown("### Search and Filter Data")
         
         search_col1, search_col2 = st.columns([3, 1])
         
         with search_col1:
-            search_query = st.text_input(
+            if corpus.texts is not None:
+                st.radio("Search in", ["Metadata", "Inside texts"], key="search_mode", horizontal=True,
+                         help="Inside texts searches the downloaded documents and ranks the records by relevance")
+            st.text_input(
                 "Search across Title, Author, Type, Publisher, or Magazine",
-                value=st.session_state.search_query,
+                key="search_input",
+                on_change=submit_search,
                 placeholder="Enter search terms...",
-                help="Search is case-insensitive and searches across multiple fields"
+                help="Search is case-insensitive and searches across multiple fields. Every word must match; partial words match as prefixes. Telugu words can also be typed in Latin letters (e.g. katha, sri sri)."
             )
         
         with search_col2:
-            if st.button("Search", type="primary"):
-                st.session_state.search_query = search_query
-                st.rerun()
-            
-            if st.button("Clear Search"):
-                st.session_state.search_query = ""
-                st.rerun()
-        
-        # Update search query in session state
-        if search_query != st.session_state.search_query:
-            st.session_state.search_query = search_query
-            st.rerun()
-        
-        # Configure AgGrid
-        gb = GridOptionsBuilder.from_dataframe(filtered_df)
-        
-        # Configure column properties
-        gb.configure_column("ID", width=80, type=["numericColumn"], precision=0, pinned='left')
-        gb.configure_column("Title", width=250, wrapText=True, autoHeight=True)
-        gb.configure_column("Type", width=100, filter=True)
-        gb.configure_column("Author", width=200, wrapText=True, autoHeight=True)
-        gb.configure_column("Publisher", width=130, filter=True)
-        gb.configure_column("Magazine", width=130, filter=True)
-        gb.configure_column("Published date", width=120, type=["dateColumnFilter"])
-        gb.configure_column("Vol", width=100)
-        gb.configure_column("Link", width=100, cellRenderer="""
-            function(params) {
-                if (params.value) {
-                    return '<a href="' + params.value + '" target="_blank" style="color: #007bff; text-decoration: none;">📄 View</a>';
-                }
-                return '';
-            }
-        """)
-        gb.configure_column("STATUS", width=90, type=["booleanColumn"])
-        
-        # Hide helper columns
-        if 'Year' in filtered_df.columns:
-            gb.configure_column("Year", hide=True)
-        if 'Month' in filtered_df.columns:
-            gb.configure_column("Month", hide=True)
-        if 'Decade' in filtered_df.columns:
-            gb.configure_column("Decade", hide=True)
-        
-        # Configure grid options
-        gb.configure_default_column(
-            groupable=True,
-            value=True,
-            enableRowGroup=True,
-            aggFunc="count",
-            editable=False,
-            filter=True,
-            sortable=True,
-            resizable=True
-        )
-        
-        gb.configure_pagination(paginationAutoPageSize=True, paginationPageSize=50)
-        gb.configure_side_bar()
-        gb.configure_selection(selection_mode="multiple", use_checkbox=True)
-        
-        # Enable filtering and sorting
-        gb.configure_grid_options(
-            enableFilter=True,
-            enableSorting=True,
-            enableColResize=True,
-            enableRangeSelection=True,
-            domLayout='normal',
-            suppressMenuHide=False,
-            animateRows=True,
-            enableBrowserTooltips=True
-        )
-        
-        gridOptions = gb.build()
-        
-        # Display the grid
-        st.markdown("###  Interactive Data Table")
-        
-        # Grid display options
-        grid_col1, grid_col2, grid_col3 = st.columns([2, 1, 1])
+            st.button("Search", type="primary", on_click=submit_search)
+            st.button("Clear Search", on_click=clear_search)
         
-        with grid_col1:
-            st.markdown(f"**Showing {len(filtered_df):,} records**")
+        if in_texts and search_query:
+            st.caption("Records are ranked by relevance to the search (BM25) unless the table is sorted.")
         
-        with grid_col2:
-            fit_columns = st.checkbox("Fit columns to width", value=True)
+        # Data table only reruns itself when paging, sorting or selecting
+        render_grid(corpus, result_rows, state_fp)
         
-        with grid_col3:
-            if st.button("Expand/Minimize"):
-                st.session_state.fullscreen_mode = not st.session_state.fullscreen_mode
-                st.rerun()
-        
-        # Calculate dynamic height
-        if st.session_state.fullscreen_mode:
-            grid_height = 800
-        else:
-            grid_height = min(max(len(filtered_df) * 35, 400), 600)
-        
-        # Display AgGrid
-        grid_response = AgGrid(
-            filtered_df,
-            gridOptions=gridOptions,
-            data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
-            update_mode=GridUpdateMode.SELECTION_CHANGED,
-            fit_columns_on_grid_load=fit_columns,
-            enable_enterprise_modules=True,
-            height=grid_height,
-            width='100%',
-            reload_data=True,
-            theme='streamlit',
-            key='main_grid'
-        )
-        
-        # Display selection info
-        if grid_response and 'selected_rows' in grid_response and grid_response['selected_rows'] is not None and len(grid_response['selected_rows']) > 0:
-            st.markdown("### 🎯 Selected Records")
-            selected_df = pd.DataFrame(grid_response['selected_rows'])
-            st.write(f"Selected {len(selected_df)} record(s)")
-            
-            # Show selected records in a compact format
-            for idx, row in selected_df.iterrows():
-                with st.expander(f"📖 {row['Title']} - {row['Author']}"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write(f"**Type:** {row['Type']}")
-                        st.write(f"**Publisher:** {row['Publisher']}")
-                        st.write(f"**Magazine:** {row['Magazine']}")
-                    with col2:
-                        st.write(f"**Published:** {row['Published date']}")
-                        st.write(f"**Volume:** {row['Vol']}")
-                        st.write(f"**Status:** {'Active' if row['STATUS'] else 'Inactive'}")
-                    if row['Link']:
-                        st.markdown(f"[📄 View Document]({row['Link']})")
-        
-        # Export functionality
-        st.markdown("### Export Options(Coming Soon...)")
-        export_col1, export_col2, export_col3 = st.columns(3)
+        # Near-duplicate titles, only computed once asked for
+        render_duplicates(corpus, result_rows)
         
         
+    except SchemaError as e:
+        st.error(f"Invalid CSV file: {str(e)}")
+        st.info(f"Please ensure your CSV file has the correct format with columns: {', '.join(EXPECTED_COLUMNS)}")
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        st.info("Please ensure your CSV file has the correct format with columns: ID, Title, Type, Author, Publisher, Magazine, Published date, Vol, Link, STATUS")
+        st.info(f"Please ensure your CSV file has the correct format with columns: {', '.join(EXPECTED_COLUMNS)}")
 
 else:
     if data_source=="Upload your own CSV file":
         st.info("Please upload your Telugu corpus CSV file to get started.")
+    elif data_source == "Use a directory of CSV shards":
+        st.info("Enter a directory or glob of CSV shards with the expected columns to get started.")
     else:
         st.info("Existing Telugu corpus data could not be loaded. Please ensure the file exists in the current directory.")
     
@@ -504,7 +684,7 @@ else:
     - **Author**: Author name (Telugu text)
     - **Publisher**: Publisher name
     - **Magazine**: Magazine name
-    - **Published date**: Publication date (YYYY-MM-DD format)
+    - **Published date**: Publication date (YYYY-MM-DD format; YYYY or YYYY-MM also accepted)
     - **Vol**: Volume information (can be empty)
     - **Link**: URL to the document
     - **STATUS**: Boolean (True/False)
@@ -543,3 +723,8 @@ st.markdown("""
 </a>
 </div>
 """, unsafe_allow_html=True)
+
+# Finish this rerun's profile; ?debug=1 shows it in the sidebar
+rerun_profile = profiling.finish()
+if debug_enabled():
+    show_profile(rerun_profile)
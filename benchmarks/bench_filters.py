@@ -0,0 +1,87 @@
+"""Compare chained DataFrame filtering with the bitmap filter engine.
+
+    python benchmarks/bench_filters.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from telugu_corpus.filters import FilterEngine  # noqa: E402
+from telugu_corpus.frame import compact_frame  # noqa: E402
+
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    authors = [f"రచయిత {i}" for i in range(20000)]
+    # Zipf-like author popularity
+    weights = 1 / np.arange(1, len(authors) + 1)
+    raw = pd.DataFrame({
+        'ID': np.arange(n_rows),
+        'Title': "శీర్షిక",
+        'Type': rng.choice(["కథ", "కవిత", "నవల", "వ్యాసం"], n_rows),
+        'Author': rng.choice(authors, n_rows, p=weights / weights.sum()),
+        'Publisher': rng.choice([f"ప్రచురణ {i}" for i in range(40)], n_rows),
+        'Magazine': rng.choice([f"పత్రిక {i}" for i in range(300)], n_rows),
+        'Published date': pd.to_datetime("1930-01-01") + pd.to_timedelta(rng.integers(0, 90 * 365, n_rows), unit="D"),
+        'Vol': rng.integers(1, 50, n_rows),
+        'Link': "",
+        'STATUS': rng.random(n_rows) < 0.8,
+    })
+    return compact_frame(raw)
+
+
+def chained(df, filters, year_range):
+    # The previous Dashboard.py implementation
+    out = df.copy()
+    for col, value in filters.items():
+        if value is not None:
+            out = out[out[col] == value]
+    if year_range:
+        out = out[(out['Year'] >= year_range[0]) & (out['Year'] <= year_range[1])]
+    return out
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    start = time.perf_counter()
+    engine = FilterEngine(df)
+    print(f"rows={args.rows:,} engine build: {time.perf_counter() - start:.3f}s")
+
+    cases = {
+        "type": ({'Type': "కథ"}, None),
+        "type+status+years": ({'Type': "కథ", 'STATUS': True}, (1960, 1990)),
+        "author": ({'Author': "రచయిత 3"}, None),
+        "magazine+publisher": ({'Magazine': "పత్రిక 7", 'Publisher': "ప్రచురణ 2"}, None),
+    }
+    for name, (filters, year_range) in cases.items():
+        old = best_of(lambda: chained(df, filters, year_range), args.repeat)
+        select = best_of(lambda: engine.select(filters, year_range), args.repeat)
+        new = best_of(lambda: df.iloc[engine.select(filters, year_range)], args.repeat)
+        print(
+            f"{name:22s} chained {old * 1e3:8.2f} ms   engine {new * 1e3:8.2f} ms "
+            f"(select {select * 1e3:6.2f} ms)   x{old / new:6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Headless benchmark of every stage of the dashboard pipeline.
+
+Generates (or reuses) synthetic corpora of the requested sizes and times
+each stage on its own: CSV load, preprocessing, filters, search, every
+chart aggregation, the data table payload and every Q&A question.
+Results are written as JSON so two versions can be compared:
+
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 -o after.json
+    python benchmarks/bench_pipeline.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_corpus import write_csv  # noqa: E402
+from telugu_corpus import QUESTIONS, clear_cache, load_corpus, sidecar  # noqa: E402
+from telugu_corpus.authors import AuthorIndex  # noqa: E402
+from telugu_corpus.charts import CHART_TABS  # noqa: E402
+from telugu_corpus.cube import CountCube  # noqa: E402
+from telugu_corpus.dates import parse_dates  # noqa: E402
+from telugu_corpus.duplicates import DuplicateIndex  # noqa: E402
+from telugu_corpus.filters import FilterEngine  # noqa: E402
+from telugu_corpus.frame import compact_frame  # noqa: E402
+from telugu_corpus.grid import order_rows  # noqa: E402
+from telugu_corpus.queries import DERIVED_KEYS, QueryColumns, columns_for  # noqa: E402
+from telugu_corpus.search import SearchIndex  # noqa: E402
+from telugu_corpus.transliterate import phonetic_key  # noqa: E402
+
+# Chart name -> group columns, as in telugu_corpus.charts
+CHARTS = {
+    "yearly": ['Year'],
+    "type": ['Type'],
+    "publisher": ['Publisher'],
+    "monthly": ['Year', 'Month'],
+}
+PAGE_SIZE = 50
+
+
+class Timings:
+    """Runs each stage ``repeat`` times and keeps min and median in ms.
+
+    With ``only``, stages outside those name prefixes run once, untimed.
+    """
+
+    def __init__(self, repeat, only=None):
+        self.repeat = repeat
+        self.only = only
+        self.stages = {}
+
+    def time(self, name, fn, repeat=None):
+        if self.only and not any(name.startswith(prefix) for prefix in self.only):
+            return fn()  # later stages may need the result
+        times, result = [], None
+        for _ in range(repeat or self.repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append((time.perf_counter() - start) * 1e3)
+        self.stages[name] = {'min_ms': round(min(times), 3), 'median_ms': round(statistics.median(times), 3)}
+        print(f"  {name:70s} {min(times):10.2f} ms")
+        return result
+
+
+def _grid_payload(page_df):
+    try:
+        from st_aggrid import GridOptionsBuilder
+    except ImportError:
+        options = None
+    else:
+        options = GridOptionsBuilder.from_dataframe(page_df).build()
+    return options, page_df.to_json(orient="records", date_format="iso")
+
+
+def bench_load(csv_path, t):
+    # CSV load: one-shot pandas parse, sidecar ingest, memory-mapped read
+    raw = t.time("load.read_csv", lambda: pd.read_csv(csv_path), repeat=1)
+    dest = sidecar.sidecar_path(csv_path)
+    t.time("load.build_sidecar", lambda: sidecar.build_sidecar(csv_path, dest), repeat=1)
+    parsed = t.time("load.read_sidecar", lambda: sidecar.read_sidecar(dest))
+
+    # Preprocessing
+    t.time("preprocess.parse_dates", lambda raw=raw: parse_dates(raw['Published date']), repeat=1)
+    t.time("preprocess.compact_frame", lambda parsed=parsed: compact_frame(parsed))
+
+
+def bench_corpus(csv_path, timings):
+    t = timings
+    # The raw frames are dropped before the corpus is loaded
+    bench_load(csv_path, t)
+
+    clear_cache()
+    df = load_corpus(csv_path)
+    all_rows = np.arange(len(df))
+    top_type = df['Type'].value_counts().index[0]
+    top_author = df['Author'].value_counts().index[0]
+    mid_author = df['Author'].value_counts().index[len(df['Author'].cat.categories) // 10]
+
+    # Filters
+    engine = t.time("filters.build", lambda: FilterEngine(df), repeat=1)
+    filter_cases = {
+        "type": ({'Type': top_type}, None),
+        "type+status+years": ({'Type': top_type, 'STATUS': True}, (1950, 1990)),
+        "top_author": ({'Author': top_author}, None),
+        "rare_author": ({'Author': mid_author}, None),
+    }
+    for name, (filters, year_range) in filter_cases.items():
+        t.time(f"filters.select[{name}]", lambda: engine.select(filters, year_range))
+    t.time("filters.facet_counts", lambda: engine.facet_counts({'Type': top_type}, (1950, 1990)))
+    t.time("filters.select[two_authors]", lambda: engine.select({'Author': (top_author, mid_author)}))
+
+    # Author typeahead: one completion per keystroke
+    authors = t.time("authors.build", lambda: AuthorIndex.build(df), repeat=1)
+    for n in (1, 2, 4):
+        t.time(f"authors.complete[{n} chars]", lambda: authors.complete(str(mid_author)[:n]))
+
+    # Cross-field search
+    index = t.time("search.build", lambda: SearchIndex.build(df), repeat=1)
+    title_word = df['Title'].iloc[0].split()[0]
+    searches = {
+        "author": str(top_author).split()[0],
+        "title_prefix": title_word[:2],
+        "two_terms": f"{title_word} {str(top_type)}",
+        "romanized": phonetic_key(title_word)[:4],
+    }
+    for name, query in searches.items():
+        t.time(f"search.query[{name}]", lambda: index.search(query))
+
+    # Chart aggregations, from the cube and from row positions
+    cube = t.time("charts.build_cube", lambda: CountCube.build(df), repeat=1)
+    filters = {'Type': top_type}
+    rows = engine.select(filters)
+    for name, by in CHARTS.items():
+        t.time(f"charts.{name}.cube", lambda: cube.counts(by, filters))
+        t.time(f"charts.{name}.rows", lambda: df[by].iloc[rows].groupby(by, observed=True).size())
+    t.time("charts.authors", lambda: df['Author'].iloc[rows].value_counts().head(20))
+
+    # Figures of each dashboard tab, and the JSON sent to the browser
+    for label, build in CHART_TABS.items():
+        figures = t.time(f"charts.figures[{label}]", lambda: build(lambda by: cube.counts(by, filters), lambda: df['Author'].iloc[rows]))
+        t.time(f"charts.json[{label}]", lambda: [fig.to_json() for fig in figures.values()])
+
+    # Data table: order the selection and build one page's payload
+    ordered = t.time("grid.order_rows", lambda: order_rows(df, rows, 'Author', True, {'Title': title_word[:2]}))
+    t.time("grid.payload", lambda: _grid_payload(df.iloc[ordered[:PAGE_SIZE]]))
+
+    # Q&A: every question of the Q&A page over the whole corpus, unmemoized
+    cols = t.time("qa.query_columns", lambda: QueryColumns(df), repeat=1)
+    duplicates = t.time("qa.duplicate_index", lambda: DuplicateIndex.build(df), repeat=1)
+    for name in DERIVED_KEYS:
+        cols.codes[name], cols.labels[name] = duplicates.key()
+    t.time("duplicates.groups", lambda: duplicates.groups(df, rows))
+    t.time("duplicates.groups[same author]", lambda: duplicates.groups(df, rows, ['Author']))
+    for question, query in QUESTIONS.items():
+        t.time(f"qa[{question}]", lambda: query.run(columns_for(df, query, cols), all_rows))
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(__file__), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, data_dir, seed=0, only=None):
+    os.makedirs(data_dir, exist_ok=True)
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'runs': [],
+    }
+    for n_rows in sizes:
+        csv_path = os.path.join(data_dir, f"synthetic_{n_rows}_{seed}.csv")
+        if not os.path.exists(csv_path):
+            print(f"Generating {n_rows:,} rows -> {csv_path}")
+            write_csv(csv_path, n_rows, seed)
+        print(f"rows={n_rows:,}")
+        timings = Timings(repeat, only)
+        bench_corpus(csv_path, timings)
+        report['runs'].append({'rows': n_rows, 'stages': timings.stages})
+    clear_cache()
+    return report
+
+
+def compare(before_path, after_path):
+    """Print the median time of every stage in two reports and their ratio."""
+    with open(before_path, encoding="utf-8") as f:
+        before = {run['rows']: run['stages'] for run in json.load(f)['runs']}
+    with open(after_path, encoding="utf-8") as f:
+        after = {run['rows']: run['stages'] for run in json.load(f)['runs']}
+    for n_rows in sorted(set(before) & set(after)):
+        print(f"rows={n_rows:,}")
+        for name in sorted(set(before[n_rows]) | set(after[n_rows])):
+            old = before[n_rows].get(name, {}).get('median_ms')
+            new = after[n_rows].get(name, {}).get('median_ms')
+            ratio = f"x{old / new:7.2f}" if old and new else ""
+            print(f"  {name:70s} {old if old is not None else '-':>10} {new if new is not None else '-':>10} {ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="Only run stages starting with these prefixes (e.g. filters qa)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "telugu_corpus_bench"))
+    parser.add_argument("-o", "--output", help="Write the JSON report here")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two JSON reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    report = run(args.rows, args.repeat, args.data_dir, args.seed, args.only)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Generate a synthetic Telugu corpus CSV with the dashboard's schema.
+
+Words are built from Telugu aksharas (consonants, conjuncts and vowel
+signs), so search and normalization see realistic grapheme clusters.
+Authors, magazines, publishers and title words follow Zipf distributions,
+like the real corpus where a few prolific authors and large magazines
+account for most records.  Rows are generated and written in chunks, so
+10M-row corpora need no more memory than 10k-row ones.
+
+    python benchmarks/synthetic_corpus.py --rows 1000000 -o corpus_1m.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['ID', 'Title', 'Type', 'Author', 'Publisher', 'Magazine', 'Published date', 'Vol', 'Link', 'STATUS']
+
+CONSONANTS = list("కఖగఘచఛజఝటఠడఢణతథదధనపఫబభమయరలవశషసహళ")
+VOWEL_SIGNS = ["", "ా", "ి", "ీ", "ు", "ూ", "ె", "ే", "ై", "ొ", "ో", "ౌ", "ం"]
+VIRAMA = "్"
+
+TYPES = ["కథ", "కవిత", "నవల", "వ్యాసం", "కథానిక", "నాటిక", "సమీక్ష", "ఇంటర్వ్యూ", "బాల సాహిత్యం", "అనువాద కథ"]
+MAGAZINE_SUFFIXES = ["పత్రిక", "వారపత్రిక", "మాసపత్రిక", "జ్యోతి", "ప్రభ", "భూమి"]
+PUBLISHER_SUFFIXES = ["ప్రచురణలు", "బుక్ హౌస్", "పబ్లికేషన్స్", "సాహితీ సంస్థ"]
+
+CHUNK_ROWS = 500_000
+ZIPF_EXPONENT = 1.1
+
+
+def make_words(rng, n_words):
+    """Return ``n_words`` distinct Telugu words of 2-4 aksharas."""
+    words = set()
+    while len(words) < n_words:
+        n = n_words - len(words)
+        lengths = rng.integers(2, 5, n)
+        for length in lengths:
+            syllables = []
+            for _ in range(length):
+                akshara = CONSONANTS[rng.integers(len(CONSONANTS))]
+                if rng.random() < 0.12:
+                    # Conjunct: consonant + virama + consonant
+                    akshara += VIRAMA + CONSONANTS[rng.integers(len(CONSONANTS))]
+                syllables.append(akshara + VOWEL_SIGNS[rng.integers(len(VOWEL_SIGNS))])
+            words.add("".join(syllables))
+    return sorted(words)
+
+
+def zipf_weights(n, exponent=ZIPF_EXPONENT):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class CorpusGenerator:
+    """Vocabularies sized for ``n_rows`` plus the row generator."""
+
+    def __init__(self, n_rows, seed=0):
+        self.n_rows = n_rows
+        self.rng = np.random.default_rng(seed)
+        rng = self.rng
+
+        # Shuffled so Zipf ranks are not alphabetical
+        self.words = rng.permutation(make_words(rng, 5_000 + min(n_rows // 20, 45_000)))
+        names = self.words[:2_000]
+        # Author count grows sub-linearly with the corpus (~3k for 10k rows)
+        n_authors = int(min(200_000, 30 * n_rows ** 0.5))
+        self.authors = np.unique(
+            rng.choice(names, n_authors).astype(object) + " " + rng.choice(names, n_authors).astype(object)
+        )
+        self.magazines = np.unique(rng.choice(self.words, 400).astype(object) + " " + rng.choice(MAGAZINE_SUFFIXES, 400))
+        self.publishers = np.unique(rng.choice(self.words, 60).astype(object) + " " + rng.choice(PUBLISHER_SUFFIXES, 60))
+        rng.shuffle(self.authors)
+        rng.shuffle(self.magazines)
+
+    def _zipf(self, values, n):
+        return values[self.rng.choice(len(values), n, p=zipf_weights(len(values)))]
+
+    def _titles(self, n):
+        rng = self.rng
+        lengths = rng.integers(1, 5, n)
+        word_ids = rng.choice(len(self.words), (n, 4), p=zipf_weights(len(self.words), 1.0))
+        titles = self.words[word_ids[:, 0]].astype(object)
+        for i in range(1, 4):
+            more = lengths > i
+            titles[more] = titles[more] + " " + self.words[word_ids[more, i]]
+        return titles
+
+    def _dates(self, n):
+        rng = self.rng
+        days = pd.to_datetime("1900-01-01") + pd.to_timedelta(rng.integers(0, 125 * 365, n), unit="D")
+        dates = days.strftime("%Y-%m-%d").to_numpy(dtype=object)
+        kind = rng.random(n)
+        dates[kind < 0.05] = days[kind < 0.05].strftime("%Y")
+        partial = (kind >= 0.05) & (kind < 0.08)
+        dates[partial] = days[partial].strftime("%Y-%m")
+        dates[(kind >= 0.08) & (kind < 0.1)] = None
+        dates[(kind >= 0.1) & (kind < 0.101)] = "తెలియదు"
+        return dates
+
+    def chunk(self, start, n):
+        """Rows ``start`` .. ``start + n - 1`` as a raw CSV frame."""
+        rng = self.rng
+        ids = np.arange(start + 1, start + n + 1)
+        vol = rng.integers(1, 60, n).astype(object)
+        vol[rng.random(n) < 0.3] = None
+        links = pd.Series(ids).map("https://kathanilayam.com/story/pdf/{}".format).to_numpy(dtype=object)
+        links[rng.random(n) < 0.15] = None
+        return pd.DataFrame({
+            'ID': ids,
+            'Title': self._titles(n),
+            'Type': rng.choice(TYPES, n, p=zipf_weights(len(TYPES), 1.5)),
+            'Author': self._zipf(self.authors, n),
+            'Publisher': self._zipf(self.publishers, n),
+            'Magazine': self._zipf(self.magazines, n),
+            'Published date': self._dates(n),
+            'Vol': vol,
+            'Link': links,
+            'STATUS': rng.random(n) < 0.85,
+        }, columns=COLUMNS)
+
+    def chunks(self, chunk_rows=CHUNK_ROWS):
+        for start in range(0, self.n_rows, chunk_rows):
+            yield self.chunk(start, min(chunk_rows, self.n_rows - start))
+
+
+def generate_frame(n_rows, seed=0):
+    """Return a synthetic raw corpus of ``n_rows`` rows as one frame."""
+    return pd.concat(CorpusGenerator(n_rows, seed).chunks(), ignore_index=True)
+
+
+def write_csv(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Write a synthetic corpus of ``n_rows`` rows to ``path`` chunk by chunk."""
+    generator = CorpusGenerator(n_rows, seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(generator.chunks(chunk_rows)):
+            chunk.to_csv(f, header=i == 0, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of rows (10k-10M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="synthetic_corpus.csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    write_csv(args.output, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Data layer shared by the Telugu corpus dashboard pages."""
+from telugu_corpus.authors import AuthorIndex, author_index
+from telugu_corpus.corpus import Corpus
+from telugu_corpus.cube import CountCube, count_cube
+from telugu_corpus.dates import DateParser, format_date, parse_dates
+from telugu_corpus.delta import Change, add_delta, merge_delta, read_delta
+from telugu_corpus.duplicates import DuplicateIndex, duplicate_index
+from telugu_corpus.filters import FilterEngine, filter_engine
+from telugu_corpus.frame import compact_frame, format_bytes, memory_report
+from telugu_corpus.fulltext import FullTextIndex, build_text_index, open_text_index
+from telugu_corpus.ingest import EXPECTED_COLUMNS, SchemaError
+from telugu_corpus.links import LinkCache, LinkChecker, link_status, refresh_links
+from telugu_corpus.loader import (
+    DEFAULT_CORPUS_PATH,
+    cached_corpus,
+    clear_cache,
+    corpus_key,
+    derived,
+    file_fingerprint,
+    load_corpus,
+    load_sharded_corpus,
+    load_uploaded_corpus,
+    upload_fingerprint,
+)
+from telugu_corpus.memo import fingerprint, memoized
+from telugu_corpus.queries import MISSING_COLUMNS, Query, QueryColumns, answer, query_columns
+from telugu_corpus.questions import QUESTIONS
+from telugu_corpus.search import SearchIndex, graphemes, search_index
+from telugu_corpus.selection import Selection
+from telugu_corpus.shards import ShardError
+
+__all__ = [
+    "AuthorIndex",
+    "author_index",
+    "Corpus",
+    "CountCube",
+    "count_cube",
+    "DateParser",
+    "format_date",
+    "parse_dates",
+    "Change",
+    "add_delta",
+    "merge_delta",
+    "read_delta",
+    "DuplicateIndex",
+    "duplicate_index",
+    "FilterEngine",
+    "filter_engine",
+    "compact_frame",
+    "format_bytes",
+    "memory_report",
+    "FullTextIndex",
+    "build_text_index",
+    "open_text_index",
+    "EXPECTED_COLUMNS",
+    "SchemaError",
+    "LinkCache",
+    "LinkChecker",
+    "link_status",
+    "refresh_links",
+    "DEFAULT_CORPUS_PATH",
+    "cached_corpus",
+    "clear_cache",
+    "corpus_key",
+    "derived",
+    "file_fingerprint",
+    "load_corpus",
+    "load_sharded_corpus",
+    "load_uploaded_corpus",
+    "upload_fingerprint",
+    "fingerprint",
+    "memoized",
+    "MISSING_COLUMNS",
+    "Query",
+    "QueryColumns",
+    "answer",
+    "query_columns",
+    "QUESTIONS",
+    "SearchIndex",
+    "graphemes",
+    "search_index",
+    "Selection",
+    "ShardError",
+]
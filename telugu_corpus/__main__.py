@@ -0,0 +1,5 @@
+import sys
+
+from telugu_corpus.cli import main
+
+sys.exit(main())
@@ -0,0 +1,83 @@
+"""On-disk store for structures derived from a corpus file.
+
+``python -m telugu_corpus build`` computes the filter engine, search index,
+count cube and Q&A columns ahead of time and saves them here; the loader
+then reads them back instead of building them inside a user's session.
+
+Artifacts live in a ``<corpus>.artifacts`` directory next to the CSV, one
+pickle per structure, named by a fingerprint of the source file (mtime and
+size) and of the artifact and sidecar versions.  A changed CSV or a new
+layout simply misses the store and is built in process as before.  Only
+corpora read from files are stored; uploads are not.
+"""
+import hashlib
+import os
+import pickle
+
+from telugu_corpus.sidecar import SIDECAR_VERSION
+
+# Bump when the pickled classes change shape
+ARTIFACT_VERSION = 3
+
+# Derived structures that are worth storing (see ``loader.derived``)
+STORED_ARTIFACTS = (
+    "filter_engine", "search_index", "count_cube", "query_columns", "author_index", "duplicate_index",
+)
+
+ARTIFACT_SUFFIX = ".pkl"
+
+
+def artifact_dir(path):
+    """Return the artifact directory for the corpus file ``path``."""
+    root, _ = os.path.splitext(path)
+    return root + ".artifacts"
+
+
+def _stamp(key):
+    _, _, mtime_ns, size = key
+    return hashlib.sha1(f"{mtime_ns}:{size}:{ARTIFACT_VERSION}:{SIDECAR_VERSION.decode()}".encode()).hexdigest()[:12]
+
+
+def artifact_path(key, name):
+    """Return where artifact ``name`` of the file corpus ``key`` is stored."""
+    return os.path.join(artifact_dir(key[1]), f"{name}-{_stamp(key)}{ARTIFACT_SUFFIX}")
+
+
+def load_artifact(key, name):
+    """Return the stored artifact, or None if there is no usable one."""
+    if key[0] != "file" or name not in STORED_ARTIFACTS:
+        return None
+    path = artifact_path(key, name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+        return None
+
+
+def save_artifact(key, name, value):
+    """Store ``value`` as artifact ``name`` of the file corpus ``key``."""
+    path = artifact_path(key, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first so readers never see a partial pickle
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def prune_artifacts(key):
+    """Delete stored artifacts of older versions of the file corpus ``key``."""
+    directory = artifact_dir(key[1])
+    if not os.path.isdir(directory):
+        return []
+    current = f"-{_stamp(key)}{ARTIFACT_SUFFIX}"
+    removed = []
+    for name in os.listdir(directory):
+        if name.endswith(ARTIFACT_SUFFIX) and not name.endswith(current):
+            os.remove(os.path.join(directory, name))
+            removed.append(name)
+    return removed
@@ -0,0 +1,128 @@
+"""Prefix index over every author for the typeahead author picker.
+
+Each author is reachable through several keys: the normalized name and
+the name from each later word on (so a surname matches too), in Telugu
+script and as a ``phonetic_key`` of the romanized name.  Keys are kept in
+two sorted lists, so the authors matching a typed prefix are one binary
+search away; matches are ranked by the author's number of works.  The
+index is built once per corpus version, and a merged delta only adds the
+keys of authors new to the corpus.
+"""
+import bisect
+
+import numpy as np
+
+from telugu_corpus.loader import derived
+from telugu_corpus.transliterate import has_telugu, normalize, phonetic_key
+
+TOP_K = 20
+
+
+def _word_suffixes(key):
+    """``key`` from each word on: "a b c" -> "a b c", "b c", "c"."""
+    words = key.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _keys(authors, codes):
+    """``(key, code)`` pairs of the authors ``codes``: script and romanized."""
+    script, roman = [], []
+    for code in codes:
+        name = str(authors[code])
+        script.extend((key, code) for key in _word_suffixes(normalize(name)))
+        roman.extend((key, code) for key in _word_suffixes(phonetic_key(name)))
+    return script, roman
+
+
+def _sorted_keys(pairs):
+    pairs.sort()
+    return [key for key, _ in pairs], np.array([code for _, code in pairs], dtype=np.int32)
+
+
+class AuthorIndex:
+    """Sorted prefix keys (script and romanized) mapping to author codes."""
+
+    def __init__(self, authors, works, script_keys, script_codes, roman_keys, roman_codes):
+        self.authors = authors
+        self.works = works
+        self._script_keys = script_keys
+        self._script_codes = script_codes
+        self._roman_keys = roman_keys
+        self._roman_codes = roman_codes
+        self._codes = {name: code for code, name in enumerate(authors)}
+
+    @classmethod
+    def build(cls, df):
+        author = df['Author']
+        authors = np.array(author.cat.categories, dtype=object)
+        codes = author.cat.codes.to_numpy()
+        works = np.bincount(codes[codes >= 0], minlength=len(authors)).astype(np.int64)
+        script, roman = _keys(authors, range(len(authors)))
+        return cls(authors, works, *_sorted_keys(script), *_sorted_keys(roman))
+
+    def updated(self, df, change):
+        """The index of ``df``, the corpus after ``change``, reusing this one."""
+        author = df['Author']
+        authors = np.array(author.cat.categories, dtype=object)
+        # Author codes shift when new names sort between the old ones
+        remap = author.cat.categories.get_indexer(self.authors).astype(np.int32)
+
+        works = np.zeros(len(authors), dtype=np.int64)
+        works[remap] = self.works
+        removed = change.previous['Author'].cat.set_categories(author.cat.categories).cat.codes.to_numpy()
+        added = author.cat.codes.to_numpy()[change.rows]
+        np.subtract.at(works, removed[removed >= 0], 1)
+        np.add.at(works, added[added >= 0], 1)
+
+        new = np.flatnonzero(~np.isin(np.arange(len(authors)), remap))
+        script, roman = _keys(authors, new.tolist())
+        script += zip(self._script_keys, remap[self._script_codes].tolist())
+        roman += zip(self._roman_keys, remap[self._roman_codes].tolist())
+        return AuthorIndex(authors, works, *_sorted_keys(script), *_sorted_keys(roman))
+
+    def __len__(self):
+        return len(self.authors)
+
+    @staticmethod
+    def _prefix_codes(keys, codes, prefix):
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\U0010ffff", lo)
+        return codes[lo:hi]
+
+    def _top(self, codes, k):
+        codes = np.unique(codes)
+        if len(codes) > k:
+            codes = codes[np.argpartition(-self.works[codes], k - 1)[:k]]
+        # Most works first, ties in name order
+        codes = sorted(codes.tolist(), key=lambda code: (-self.works[code], self.authors[code]))
+        return self.authors[codes].tolist()
+
+    def top(self, k=TOP_K):
+        """The ``k`` authors with the most works."""
+        return self._top(np.arange(len(self.authors)), k)
+
+    def complete(self, query, k=TOP_K):
+        """Up to ``k`` authors matching the typed ``query``, most works first.
+
+        A Telugu query matches names and surnames by prefix; a Latin one
+        also matches their romanization ("sri", "chalam", "viswanatha").
+        """
+        query = normalize(query)
+        if not query:
+            return self.top(k)
+        matches = [self._prefix_codes(self._script_keys, self._script_codes, query)]
+        if not has_telugu(query):
+            roman = phonetic_key(query)
+            if roman:
+                matches.append(self._prefix_codes(self._roman_keys, self._roman_codes, roman))
+        return self._top(np.concatenate(matches), k)
+
+    def work_count(self, author):
+        """Number of works of ``author`` in the corpus (0 if unknown)."""
+        code = self._codes.get(author)
+        return 0 if code is None else int(self.works[code])
+
+
+def author_index(df):
+    """Return the shared ``AuthorIndex`` for a cached corpus frame."""
+    return derived(df, "author_index", AuthorIndex.build)
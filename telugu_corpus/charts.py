@@ -0,0 +1,178 @@
+"""Figures of the dashboard's Data Visualizations tabs.
+
+Each tab's figures are built by its own function in ``CHART_TABS``, so the
+dashboard builds (and sends to the browser) only the tab that is open.
+Plotly is imported on first use: reruns and pages that never draw a chart
+do not pay for importing it.
+
+Time series with more than ``WEBGL_POINTS`` points are drawn as WebGL
+(``Scattergl``) traces and downsampled on the server to ``MAX_POINTS``
+points with Largest-Triangle-Three-Buckets (``lttb``), which keeps the
+peaks and troughs that a plain stride would drop.  The figure JSON sent on
+each rerun then stays small however long the series is.
+"""
+import numpy as np
+import pandas as pd
+
+from telugu_corpus import profiling
+
+# Series longer than this are drawn with WebGL
+WEBGL_POINTS = 500
+
+# Points kept of a downsampled series
+MAX_POINTS = 1000
+
+# The monthly trend is only drawn for selections larger than this
+MONTHLY_MIN_RECORDS = 100
+
+
+def lttb(x, y, threshold=MAX_POINTS):
+    """Positions of the ``threshold`` points of ``(x, y)`` kept by LTTB.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the point kept before it
+    and the mean of the next bucket.  ``x`` must be sorted.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def time_series(data, x, y, title, labels):
+    """A line chart of ``data``, as WebGL and downsampled when it is dense."""
+    import plotly.express as px
+
+    if len(data) <= WEBGL_POINTS:
+        return px.line(data, x=x, y=y, title=title, labels=labels)
+    xs = data[x]
+    positions = np.asarray(xs.astype('int64') if pd.api.types.is_datetime64_any_dtype(xs) else xs)
+    sampled = data.iloc[lttb(positions, data[y].to_numpy())]
+    fig = px.line(sampled, x=x, y=y, title=title, labels=labels, render_mode='webgl')
+    fig.update_layout(meta={'points': len(data), 'shown': len(sampled)})
+    return fig
+
+
+def time_series_figures(chart_counts, authors):
+    """Publications by year and by decade."""
+    import plotly.express as px
+
+    figures = {}
+    with profiling.stage("chart.yearly"):
+        yearly_counts = chart_counts(['Year'])
+        yearly_data = yearly_counts.reset_index(name='Count')
+        fig_yearly = px.bar(
+            yearly_data,
+            x='Year',
+            y='Count',
+            title='Publications by Year',
+            labels={'Count': 'Number of Publications', 'Year': 'Publication Year'},
+            color='Count',
+            color_continuous_scale='blues'
+        )
+        fig_yearly.update_layout(height=400, showlegend=False)
+        figures['yearly'] = fig_yearly
+
+    with profiling.stage("chart.decade"):
+        decade_data = yearly_counts.groupby((yearly_counts.index // 10) * 10).sum().rename_axis('Decade').reset_index(name='Count')
+        fig_decade = px.line(
+            decade_data,
+            x='Decade',
+            y='Count',
+            title='Publications by Decade',
+            labels={'Count': 'Number of Publications', 'Decade': 'Decade'},
+            markers=True
+        )
+        fig_decade.update_layout(height=400)
+        figures['decade'] = fig_decade
+    return figures
+
+
+def distribution_figures(chart_counts, authors):
+    """Shares of the content types and publishers."""
+    import plotly.express as px
+
+    figures = {}
+    with profiling.stage("chart.type"):
+        type_data = chart_counts(['Type']).sort_values(ascending=False).head(10)
+        fig_type = px.pie(
+            values=type_data.values,
+            names=type_data.index,
+            title='Distribution by Content Type (Top 10)',
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        fig_type.update_layout(height=400)
+        figures['type'] = fig_type
+
+    with profiling.stage("chart.publisher"):
+        publisher_data = chart_counts(['Publisher']).sort_values(ascending=False).head(8)
+        fig_publisher = px.pie(
+            values=publisher_data.values,
+            names=publisher_data.index,
+            title='Distribution by Publisher (Top 8)',
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+        fig_publisher.update_layout(height=400)
+        figures['publisher'] = fig_publisher
+    return figures
+
+
+def detail_figures(chart_counts, authors):
+    """The most prolific authors and, for larger selections, monthly trends."""
+    import plotly.express as px
+
+    figures = {}
+    selected_authors = authors()
+    with profiling.stage("chart.authors"):
+        author_data = selected_authors.value_counts().head(15)
+        fig_authors = px.bar(
+            x=author_data.values,
+            y=author_data.index,
+            orientation='h',
+            title='Top 15 Most Prolific Authors',
+            labels={'x': 'Number of Publications', 'y': 'Author'},
+            color=author_data.values,
+            color_continuous_scale='viridis'
+        )
+        fig_authors.update_layout(height=600, showlegend=False)
+        figures['authors'] = fig_authors
+
+    if len(selected_authors) > MONTHLY_MIN_RECORDS:
+        with profiling.stage("chart.monthly"):
+            monthly_data = chart_counts(['Year', 'Month']).reset_index(name='Count')
+            monthly_data['Date'] = pd.to_datetime(monthly_data[['Year', 'Month']].assign(day=1))
+            fig_monthly = time_series(
+                monthly_data,
+                x='Date',
+                y='Count',
+                title='Monthly Publication Trends',
+                labels={'Count': 'Number of Publications', 'Date': 'Publication Date'}
+            )
+            fig_monthly.update_layout(height=400)
+            figures['monthly'] = fig_monthly
+    return figures
+
+
+# Tab label -> builder of its figures, ``build(chart_counts, authors)`` where
+# ``chart_counts(by)`` counts the selection by columns and ``authors()``
+# returns its Author column
+CHART_TABS = {
+    "Time Series Analysis": time_series_figures,
+    "Distribution Charts": distribution_figures,
+    "Detailed Analytics": detail_figures,
+}
@@ -0,0 +1,313 @@
+"""Command line interface to the corpus analytics.
+
+Runs the dashboard's queries without Streamlit and precomputes the
+artifacts the pages would otherwise build on first use::
+
+    python -m telugu_corpus build                    # sidecar + stored artifacts
+    python -m telugu_corpus build "shards/*.csv"     # parse CSV shards in parallel
+    python -m telugu_corpus update new_entries.csv   # merge a delta (upsert by ID)
+    python -m telugu_corpus questions
+    python -m telugu_corpus ask 1 --type కథ
+    python -m telugu_corpus ask --all --years 1950 1990
+    python -m telugu_corpus records --search "ప్రేమ" --sort Year --limit 20
+    python -m telugu_corpus records --author "..." --author "..." --export CSV -o out.csv
+    python -m telugu_corpus authors "sri"
+    python -m telugu_corpus duplicates --same author --type కథ
+    python -m telugu_corpus links --magazine "..."     # check links, cached
+    python -m telugu_corpus index-texts texts/         # full-text index
+    python -m telugu_corpus records --search "వాన" --in-texts
+    python -m telugu_corpus counts Year --status active
+
+Every command takes ``--csv`` (default: the dashboard's corpus file, or a
+directory or glob of CSV shards with the same columns) and the
+sidebar filters (``--type``, ``--author``, ``--publisher``, ``--magazine``,
+``--status``, ``--years``, ``--search``, ``--in-texts``).
+"""
+import argparse
+import shutil
+import sys
+import time
+
+import pandas as pd
+
+from telugu_corpus import links as link_health
+from telugu_corpus import sidecar
+from telugu_corpus.corpus import Corpus
+from telugu_corpus.delta import add_delta, check_columns, read_delta
+from telugu_corpus.duplicates import GROUP_FIELDS
+from telugu_corpus.export import EXPORT_FORMATS
+from telugu_corpus.frame import KEY_COLUMNS, format_bytes
+from telugu_corpus.fulltext import TEXT_INDEX_PATH, TEXTS_DIR, build_text_index
+from telugu_corpus.ingest import EXPECTED_COLUMNS, SchemaError
+from telugu_corpus.loader import DEFAULT_CORPUS_PATH
+from telugu_corpus.questions import QUESTIONS
+from telugu_corpus.shards import is_shard_source, shard_paths
+
+STATUS_VALUES = {'active': True, 'inactive': False}
+
+# Columns of the loaded corpus frame
+FRAME_COLUMNS = EXPECTED_COLUMNS + KEY_COLUMNS
+
+
+def _add_filters(parser):
+    parser.add_argument("--csv", default=DEFAULT_CORPUS_PATH, help="Path of the corpus CSV file")
+    parser.add_argument("--type", help="Content type")
+    parser.add_argument("--author", action="append", help="Author (repeat for several)")
+    parser.add_argument("--publisher")
+    parser.add_argument("--magazine")
+    parser.add_argument("--status", choices=STATUS_VALUES)
+    parser.add_argument("--years", type=int, nargs=2, metavar=("FROM", "TO"), help="Inclusive year range")
+    parser.add_argument("--search", help="Cross-field search query")
+    parser.add_argument("--in-texts", action="store_true", help="Run --search on the full-text index")
+    parser.add_argument("--index", default=TEXT_INDEX_PATH, help="Full-text index directory for --in-texts")
+
+
+def _selection(args):
+    corpus = Corpus.load(args.csv)
+    corpus.text_index = args.index
+    if args.in_texts and corpus.texts is None:
+        raise SystemExit(f"No complete full-text index in {args.index} (run `python -m telugu_corpus index-texts`)")
+    filters = {
+        'Type': args.type,
+        'Author': args.author,
+        'Publisher': args.publisher,
+        'Magazine': args.magazine,
+        'STATUS': STATUS_VALUES.get(args.status),
+    }
+    return corpus, filters, corpus.narrow_years(args.years)
+
+
+def _print(result):
+    if isinstance(result, pd.DataFrame):
+        print(result.to_string(index=False))
+    elif isinstance(result, pd.Series):
+        print(result.to_string())
+    else:
+        print(result)
+
+
+def _question(text):
+    """A question by its text or its number in ``questions``."""
+    if text.isdigit() and 1 <= int(text) <= len(QUESTIONS):
+        return list(QUESTIONS)[int(text) - 1]
+    if text not in QUESTIONS:
+        raise SystemExit(f"Unknown question: {text} (see `python -m telugu_corpus questions`)")
+    return text
+
+
+def build(args):
+    start = time.perf_counter()
+    if is_shard_source(args.csv):
+        corpus = Corpus.load(args.csv, args.workers)
+        print(f"Parsed {len(shard_paths(args.csv))} shards ({time.perf_counter() - start:.1f}s)")
+        for name, ms in corpus.precompute().items():
+            print(f"Built {name} in {ms:,.0f} ms")
+        print("Artifacts are only stored for single corpus files")
+        return
+    dest = sidecar.sidecar_path(args.csv)
+    if args.force or not sidecar.is_fresh(args.csv, dest):
+        sidecar.build_sidecar(args.csv, dest)
+        print(f"Wrote {dest} ({time.perf_counter() - start:.1f}s)")
+    else:
+        print(f"{dest} is up to date")
+    # Artifacts are stored for the file itself; deltas are merged on load
+    corpus = Corpus.load(args.csv, deltas=False)
+    for name, ms in corpus.precompute().items():
+        print(f"Built {name} in {ms:,.0f} ms")
+    for path in corpus.save_artifacts():
+        print(f"Wrote {path}")
+    deltas = Corpus.load(args.csv).deltas
+    if deltas:
+        print(f"{len(deltas)} delta file(s) are merged in on load")
+
+
+def update(args):
+    start = time.perf_counter()
+    before = Corpus.load(args.csv)
+    # A delta is only added once it is known to merge
+    try:
+        delta = read_delta(args.delta)
+        check_columns(before.df, delta)
+    except SchemaError as e:
+        raise SystemExit(f"Invalid delta {args.delta}: {e}")
+    ids = delta['ID'].drop_duplicates()
+    updated = int(ids.isin(before.df['ID']).sum())
+    dest = add_delta(args.csv, args.delta)
+    after = Corpus.load(args.csv)
+    print(f"Added {dest}: {updated:,} records updated, {len(ids) - updated:,} added")
+    print(f"{len(after):,} records after {len(after.deltas)} delta file(s) ({time.perf_counter() - start:.1f}s)")
+
+
+def questions(args):
+    for i, question in enumerate(QUESTIONS, 1):
+        print(f"{i:3d}. {question}")
+
+
+def ask(args):
+    if not args.all and args.question is None:
+        raise SystemExit("Give a question or --all")
+    asked = list(QUESTIONS) if args.all else [_question(args.question)]
+    corpus, filters, year_range = _selection(args)
+    rows = corpus.select(filters, year_range, args.search, args.in_texts)
+    failed = False
+    for question in asked:
+        if len(asked) > 1:
+            print(f"\n## {question}")
+        try:
+            _print(corpus.ask(question, rows))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+def records(args):
+    corpus, filters, year_range = _selection(args)
+    rows = corpus.order(corpus.select(filters, year_range, args.search, args.in_texts), args.sort, not args.descending)
+    if args.export:
+        path = corpus.export(rows, args.export)
+        if args.output:
+            shutil.copyfile(path, args.output)
+            path = args.output
+        print(f"Wrote {len(rows):,} records to {path}")
+        return
+    print(f"{len(rows):,} records")
+    shown = corpus.records(rows[:args.limit])
+    _print(shown.drop(columns=KEY_COLUMNS, errors='ignore'))
+
+
+def counts(args):
+    corpus, filters, year_range = _selection(args)
+    _print(corpus.counts(args.by, filters, year_range, args.search, args.in_texts))
+
+
+def authors(args):
+    corpus = Corpus.load(args.csv)
+    for author in corpus.complete_authors(args.prefix, args.limit):
+        print(f"{corpus.authors.work_count(author):6,d}  {author}")
+
+
+def duplicates(args):
+    corpus, filters, year_range = _selection(args)
+    rows = corpus.select(filters, year_range, args.search, args.in_texts)
+    groups = corpus.duplicates(rows, [field.title() for field in args.same or ()])
+    if groups.empty:
+        print("No possible duplicates")
+        return
+    print(f"{groups['Group'].max():,} groups, {len(groups):,} records")
+    _print(groups[groups['Group'] <= args.limit])
+
+
+def links(args):
+    corpus, filters, year_range = _selection(args)
+    rows = corpus.select(filters, year_range, args.search, args.in_texts)
+    cache = link_health.LinkCache(args.cache)
+    if not args.cached:
+        urls = corpus.df['Link'].iloc[rows].dropna().unique().tolist()
+        checked = link_health.refresh_links(
+            urls, cache, args.ttl_days * 24 * 3600,
+            progress=lambda done, total: print(f"Checked {done:,} of {total:,} links", file=sys.stderr),
+            concurrency=args.concurrency, per_host=args.per_host, timeout=args.timeout, retries=args.retries,
+        )
+        print(f"Checked {checked:,} links ({len(urls) - checked:,} cached)")
+    states = pd.Series(corpus.link_states(rows, cache), dtype=object).fillna("No link")
+    _print(states.value_counts().rename_axis("Link").rename("Records"))
+
+
+def index_texts(args):
+    start = time.perf_counter()
+    rebuilt = build_text_index(args.docs, args.index, args.workers, args.force)
+    print(f"Re-indexed {len(rebuilt)} shards of {args.index} ({time.perf_counter() - start:.1f}s)")
+
+
+def info(args):
+    corpus = Corpus.load(args.csv)
+    report = corpus.memory_report()
+    print(f"{len(corpus):,} records, years {corpus.year_bounds}")
+    for path in corpus.deltas:
+        print(f"Merged delta {path}")
+    report['Size'] = report['Bytes'].map(format_bytes)
+    print(report[['Column', 'Dtype', 'Size', 'Share']].to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m telugu_corpus", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("build", help="Build the sidecar and store the derived artifacts")
+    p.add_argument("csv", nargs="?", default=DEFAULT_CORPUS_PATH,
+                   help="Path of the corpus CSV file, or a directory or glob of CSV shards")
+    p.add_argument("--force", action="store_true", help="Rebuild the sidecar even if it is fresh")
+    p.add_argument("--workers", type=int, help="Shard parsing processes (default: one per CPU)")
+    p.set_defaults(run=build)
+
+    p = commands.add_parser("update", help="Merge a delta CSV into the corpus (upsert by ID)")
+    p.add_argument("delta", help="CSV of new or changed records, with the corpus columns")
+    p.add_argument("--csv", default=DEFAULT_CORPUS_PATH, help="Path of the corpus CSV file")
+    p.set_defaults(run=update)
+
+    p = commands.add_parser("questions", help="List the Q&A questions")
+    p.set_defaults(run=questions)
+
+    p = commands.add_parser("ask", help="Answer a Q&A question for a selection")
+    p.add_argument("question", nargs="?", help="Question text or number")
+    p.add_argument("--all", action="store_true", help="Answer every question")
+    _add_filters(p)
+    p.set_defaults(run=ask)
+
+    p = commands.add_parser("records", help="List or export the records of a selection")
+    _add_filters(p)
+    p.add_argument("--sort", choices=FRAME_COLUMNS, help="Column to sort by")
+    p.add_argument("--descending", action="store_true")
+    p.add_argument("--limit", type=int, default=20, help="Records to print")
+    p.add_argument("--export", choices=EXPORT_FORMATS, help="Write the records in this format")
+    p.add_argument("-o", "--output", help="Export path (default: the export cache)")
+    p.set_defaults(run=records)
+
+    p = commands.add_parser("counts", help="Count the records of a selection by columns")
+    p.add_argument("by", nargs="+", choices=FRAME_COLUMNS, metavar="COLUMN",
+                   help="Columns to group by, e.g. Year or Type Year")
+    _add_filters(p)
+    p.set_defaults(run=counts)
+
+    p = commands.add_parser("authors", help="Complete an author name (Telugu or romanized)")
+    p.add_argument("prefix", nargs="?", default="", help="Typed prefix of a name or surname")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--csv", default=DEFAULT_CORPUS_PATH, help="Path of the corpus CSV file")
+    p.set_defaults(run=authors)
+
+    p = commands.add_parser("duplicates", help="List records with near-duplicate titles")
+    _add_filters(p)
+    p.add_argument("--same", action="append", choices=[field.lower() for field in GROUP_FIELDS],
+                   help="Also require the same author, magazine or year (repeat for several)")
+    p.add_argument("--limit", type=int, default=20, help="Groups to print")
+    p.set_defaults(run=duplicates)
+
+    p = commands.add_parser("links", help="Check the links of a selection and cache the results")
+    _add_filters(p)
+    p.add_argument("--cache", default=link_health.LINK_CACHE_PATH, help="Link cache file")
+    p.add_argument("--ttl-days", type=float, default=link_health.TTL / 86400, help="Re-check results older than this")
+    p.add_argument("--concurrency", type=int, default=link_health.CONCURRENCY)
+    p.add_argument("--per-host", type=int, default=link_health.PER_HOST)
+    p.add_argument("--timeout", type=float, default=link_health.TIMEOUT, help="Seconds per request")
+    p.add_argument("--retries", type=int, default=link_health.RETRIES)
+    p.add_argument("--cached", action="store_true", help="Only report the cached results")
+    p.set_defaults(run=links)
+
+    p = commands.add_parser("index-texts", help="Build the full-text index of the downloaded documents")
+    p.add_argument("docs", nargs="?", default=TEXTS_DIR, help="Directory of documents named by record ID")
+    p.add_argument("--index", default=TEXT_INDEX_PATH, help="Index directory")
+    p.add_argument("--workers", type=int, help="Indexing processes (default: one per CPU)")
+    p.add_argument("--force", action="store_true", help="Re-index every document")
+    p.set_defaults(run=index_texts)
+
+    p = commands.add_parser("info", help="Show the size and memory use of the corpus")
+    p.add_argument("--csv", default=DEFAULT_CORPUS_PATH, help="Path of the corpus CSV file")
+    p.set_defaults(run=info)
+
+    args = parser.parse_args(argv)
+    return args.run(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Headless analytics over one corpus version.
+
+``Corpus`` wraps a cached corpus frame and answers everything the pages
+and the command line ask of it: filters, cross-field and full-text
+search, facet counts, chart aggregations, ordered rows for the data
+table, Q&A questions and exports.  Results are memoized per corpus version by a fingerprint of the
+filter state, so the dashboard, the Q&A page and scripts importing the
+package share them.
+
+    from telugu_corpus import Corpus
+
+    corpus = Corpus.load("sorted_data[1].csv")   # with its delta files merged
+    rows = corpus.select({'Type': 'కథ'}, search="ప్రేమ")
+    corpus.counts(['Year'], {'Type': 'కథ'})
+    corpus.ask("Who wrote the most stories?", rows)
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from telugu_corpus.artifacts import prune_artifacts, save_artifact
+from telugu_corpus.authors import TOP_K, AuthorIndex, author_index
+from telugu_corpus.cube import CUBE_DIMENSIONS, CountCube, count_cube
+from telugu_corpus.delta import applied_deltas, base_key, delta_key, delta_paths, merge_delta, read_delta
+from telugu_corpus.duplicates import duplicate_index
+from telugu_corpus.export import export_file
+from telugu_corpus.filters import FilterEngine, filter_engine
+from telugu_corpus.frame import memory_report
+from telugu_corpus.fulltext import TEXT_INDEX_PATH, open_text_index
+from telugu_corpus.grid import order_rows
+from telugu_corpus.links import LINK_STATES, link_status
+from telugu_corpus.loader import (
+    DEFAULT_CORPUS_PATH,
+    add_version,
+    cached_corpus,
+    corpus_key,
+    existing,
+    file_fingerprint,
+    load_corpus,
+    load_sharded_corpus,
+    load_uploaded_corpus,
+)
+from telugu_corpus.memo import fingerprint, memoized
+from telugu_corpus.queries import QueryColumns, answer, query_columns
+from telugu_corpus.questions import QUESTIONS
+from telugu_corpus.search import SearchIndex, search_index
+from telugu_corpus.selection import Selection
+from telugu_corpus.shards import is_shard_source
+from telugu_corpus.transliterate import normalize
+
+# Derived structures built by ``precompute``, by artifact name
+ARTIFACTS = {
+    "filter_engine": filter_engine,
+    "search_index": search_index,
+    "count_cube": count_cube,
+    "query_columns": query_columns,
+    "author_index": author_index,
+    "duplicate_index": duplicate_index,
+}
+
+# Derived structures carried over to a corpus version with a delta merged
+# in, by artifact name; the others are rebuilt when first used
+UPDATES = {
+    "filter_engine": FilterEngine.updated,
+    "search_index": SearchIndex.updated,
+    "count_cube": CountCube.updated,
+    "query_columns": QueryColumns.updated,
+    "author_index": AuthorIndex.updated,
+}
+
+
+class Corpus:
+    """Filters, search, aggregations and questions over a corpus frame.
+
+    ``filters`` arguments map filter columns (Type, Author, Publisher,
+    Magazine, STATUS) to a value or a list of values, ``None`` or an empty
+    list meaning "All"; ``year_range`` is an inclusive ``(low, high)`` pair
+    or ``None``; ``search`` is a query string for the cross-field index.
+    Rows are int32 positions in ``df``.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        # Directory of the full-text index searched with ``in_texts``
+        self.text_index = TEXT_INDEX_PATH
+
+    @classmethod
+    def load(cls, path=DEFAULT_CORPUS_PATH, workers=None, deltas=True):
+        """The corpus stored at ``path`` (parsed once per file version).
+
+        The delta CSVs of the file are merged in unless ``deltas`` is false
+        (see ``telugu_corpus.delta``); only deltas that are new since the
+        last load are merged.  ``path`` may also be a directory or glob of
+        CSV shards, parsed by ``workers`` processes.
+        """
+        if is_shard_source(path):
+            return cls(load_sharded_corpus(path, workers))
+        paths = delta_paths(path) if deltas else []
+        if not paths:
+            return cls(load_corpus(path))
+
+        # Start from the newest cached version and merge the deltas after it
+        keys = [file_fingerprint(path)]
+        for delta in paths:
+            keys.append(delta_key(keys[-1], delta))
+        for start in range(len(keys) - 1, -1, -1):
+            df = cached_corpus(keys[start])
+            if df is not None:
+                break
+        corpus = cls(df)
+        for delta in paths[start:]:
+            corpus = corpus.update(delta)
+        return corpus
+
+    @classmethod
+    def from_upload(cls, uploaded_file, progress=None):
+        """The corpus of an uploaded CSV, see ``load_uploaded_corpus``."""
+        return cls(load_uploaded_corpus(uploaded_file, progress))
+
+    @classmethod
+    def from_key(cls, key):
+        """The cached corpus for ``key``, or None if that version is gone."""
+        df = cached_corpus(key) if key is not None else None
+        if df is None and key is not None and key[0] == "delta" and base_key(key)[0] == "file":
+            # An evicted version is merged again if its deltas are still current
+            try:
+                corpus = cls.load(base_key(key)[1])
+            except OSError:
+                return None
+            return corpus if corpus.key == key else None
+        return None if df is None else cls(df)
+
+    def update(self, path):
+        """This corpus with the delta CSV ``path`` merged in, as a new version.
+
+        Records are upserted by ``ID`` (see ``merge_delta``).  The derived
+        structures already built for this version are updated rather than
+        rebuilt, and this version is dropped from the cache.  Raises
+        ``telugu_corpus.ingest.SchemaError`` for an invalid delta.
+        """
+        key = None if self.key is None else delta_key(self.key, path)
+        df = cached_corpus(key) if key is not None else None
+        if df is not None:
+            return Corpus(df)
+        df, change = merge_delta(self.df, read_delta(path))
+        if key is None:
+            return Corpus(df)
+        structures = {}
+        for name, update in UPDATES.items():
+            structure = existing(self.df, name)
+            if structure is not None:
+                structures[name] = update(structure, df, change)
+        return Corpus(add_version(key, df, structures, replaces=self.key))
+
+    @property
+    def deltas(self):
+        """Paths of the delta CSVs merged into this version, oldest first."""
+        return applied_deltas(self.key)
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def key(self):
+        return corpus_key(self.df)
+
+    @property
+    def engine(self):
+        return filter_engine(self.df)
+
+    @property
+    def index(self):
+        return search_index(self.df)
+
+    @property
+    def cube(self):
+        return count_cube(self.df)
+
+    @property
+    def columns(self):
+        return query_columns(self.df)
+
+    @property
+    def authors(self):
+        return author_index(self.df)
+
+    @property
+    def duplicate_index(self):
+        return duplicate_index(self.df)
+
+    @property
+    def year_bounds(self):
+        """``(first, last)`` publication year, or None without dated records."""
+        years = self.df['Year']
+        if not years.notna().any():
+            return None
+        return int(years.min()), int(years.max())
+
+    def narrow_years(self, year_range):
+        """``year_range`` as a filter, or None if it spans every year.
+
+        Undated records are kept unless the year range is narrowed.
+        """
+        if not year_range or tuple(year_range) == self.year_bounds:
+            return None
+        return tuple(year_range)
+
+    def memoized(self, key, build):
+        """``build()`` memoized under ``key`` for this corpus version."""
+        return memoized(self.df, key, build)
+
+    def complete_authors(self, query, k=TOP_K):
+        """Up to ``k`` authors matching a typed prefix, most works first."""
+        return self.memoized(('authors', query, k), lambda: self.authors.complete(query, k))
+
+    @property
+    def texts(self):
+        """The full-text index of the linked documents, or None if not built."""
+        return open_text_index(self.text_index)
+
+    def search(self, query, in_texts=False):
+        """Rows matching every term of ``query``, or None for no query.
+
+        With ``in_texts`` the query runs on the full-text index of the
+        linked documents and the rows come best match first; otherwise it
+        runs on the metadata search index and the rows are sorted.
+        """
+        query = normalize(query or "")
+        if not query:
+            return None
+        if in_texts:
+            texts = self.texts
+            if texts is None:
+                raise ValueError(f"No complete full-text index in {self.text_index} "
+                                 "(run `python -m telugu_corpus index-texts` to build it)")
+            return self.memoized(('text_search', query, texts.version), lambda: self._text_rows(texts, query))
+        return self.memoized(('search', query), lambda: self.index.search(query))
+
+    def _text_rows(self, texts, query):
+        ids, _ = texts.search(query)
+        rows = pd.Index(self.df['ID']).get_indexer(ids)
+        return rows[rows >= 0].astype(np.int32)
+
+    def filter_rows(self, filters=None, year_range=None):
+        """Rows matching the filters and year range (no search)."""
+        return self.memoized(
+            ('filter_rows', fingerprint(filters, year_range)),
+            lambda: self.engine.select(filters, year_range),
+        )
+
+    def select(self, filters=None, year_range=None, search=None, in_texts=False):
+        """Rows matching the filters, the year range and the search query.
+
+        Full-text matches (``in_texts``) keep their ranking order.
+        """
+        rows = self.filter_rows(filters, year_range)
+        hits = self.search(search, in_texts)
+        if hits is None:
+            return rows
+        if in_texts:
+            return self.memoized(
+                ('result_rows', fingerprint(filters, year_range, search, in_texts, self.texts.version)),
+                lambda: hits[np.isin(hits, rows, assume_unique=True)],
+            )
+        return self.memoized(
+            ('result_rows', fingerprint(filters, year_range, search)),
+            lambda: np.intersect1d(rows, hits, assume_unique=True),
+        )
+
+    def facets(self, filters=None, year_range=None, search=None, in_texts=False):
+        """Counts per value of every filter column given the other filters.
+
+        See ``FilterEngine.facet_counts``.
+        """
+        version = self.texts.version if in_texts and search else None
+        return self.memoized(
+            ('facets', fingerprint(filters, year_range, search, in_texts, version)),
+            lambda: self.engine.facet_counts(filters, year_range, self.search(search, in_texts)),
+        )
+
+    def counts(self, by, filters=None, year_range=None, search=None, in_texts=False):
+        """Row counts grouped by the columns ``by`` for a selection.
+
+        Served from the count cube unless the grouping columns or the
+        selection (an author filter or a search) are not expressible in it.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if not search and set(by) <= set(CUBE_DIMENSIONS) and self.cube.covers(filters or {}):
+            return self.cube.counts(by, filters, year_range)
+        rows = self.select(filters, year_range, search, in_texts)
+        return self.df[by].iloc[rows].groupby(by, observed=True).size()
+
+    def order(self, rows, sort_by=None, ascending=True, column_filters=None, rows_key=None):
+        """``rows`` after column filters and sorting, memoized.
+
+        ``rows_key`` identifies ``rows`` (e.g. the filter-state fingerprint)
+        so they need not be hashed.
+        """
+        key = fingerprint(rows if rows_key is None else rows_key, sort_by, ascending, column_filters)
+        return self.memoized(
+            ('grid_rows', key),
+            lambda: order_rows(self.df, rows, sort_by, ascending, column_filters),
+        )
+
+    def ask(self, question, rows=None):
+        """Answer one of ``QUESTIONS`` for ``rows`` (default: every row)."""
+        if question not in QUESTIONS:
+            raise KeyError(f"Unknown question: {question}")
+        if rows is None:
+            rows = np.arange(len(self.df))
+        return answer(self.df, rows, question, QUESTIONS[question])
+
+    def duplicates(self, rows=None, fields=()):
+        """Possible duplicate records among ``rows`` (default: every row).
+
+        Records are grouped by near-duplicate title and, optionally, the
+        same ``fields`` (Author, Magazine, Year); see ``DuplicateIndex``.
+        """
+        fields = tuple(fields)
+        rows_fp = None if rows is None else fingerprint(np.asarray(rows))
+        return self.memoized(
+            ('duplicates', rows_fp, fields),
+            lambda: self.duplicate_index.groups(self.df, rows, fields),
+        )
+
+    def link_states(self, rows, cache=None):
+        """Link state label of ``rows`` from the link cache (None: no link)."""
+        labels = np.array(LINK_STATES + [None], dtype=object)
+        return labels[link_status(self.df, cache)[np.asarray(rows)]]
+
+    def records(self, rows):
+        """``df.iloc[rows]``, a transient view for display."""
+        return self.df.iloc[rows]
+
+    def export(self, rows, fmt):
+        """Write ``rows`` in export format ``fmt`` and return the file path."""
+        return export_file(self.df, rows, fmt)
+
+    def selection(self, rows, spec=None):
+        """A compact ``Selection`` of ``rows`` for session state."""
+        return Selection.of(self.df, rows, spec)
+
+    def memory_report(self):
+        return memory_report(self.df)
+
+    def precompute(self, names=tuple(ARTIFACTS)):
+        """Build the derived structures ``names``; return build times in ms."""
+        timings = {}
+        for name in names:
+            start = time.perf_counter()
+            ARTIFACTS[name](self.df)
+            timings[name] = (time.perf_counter() - start) * 1e3
+        return timings
+
+    def save_artifacts(self, names=tuple(ARTIFACTS)):
+        """Store the derived structures next to the corpus file.
+
+        Artifacts of older file versions are removed.  Returns the paths.
+        """
+        key = self.key
+        if key is None or key[0] != "file":
+            raise ValueError("Only corpora loaded from a file can store artifacts")
+        paths = [save_artifact(key, name, ARTIFACTS[name](self.df)) for name in names]
+        prune_artifacts(key)
+        return paths
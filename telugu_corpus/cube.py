@@ -0,0 +1,86 @@
+"""Pre-aggregated count cube for the dashboard charts.
+
+The cube holds one cell per observed combination of Year, Month, Type,
+Publisher, Magazine and STATUS with the number of rows in it (a sparse
+cube: empty combinations are not stored).  It is built once per corpus
+version; chart data for a filter selection is then a slice and a sum over
+the cells, so its cost depends on the number of distinct combinations
+rather than on the number of rows.  A merged delta updates the cells by
+the counts of the replaced and changed rows (see ``CountCube.updated``).
+"""
+import numpy as np
+import pandas as pd
+
+from telugu_corpus.filters import is_active, is_multi
+from telugu_corpus.loader import derived
+
+CUBE_DIMENSIONS = ["Year", "Month", "Type", "Publisher", "Magazine", "STATUS"]
+
+
+class CountCube:
+    """Sparse Year x Month x Type x Publisher x Magazine x STATUS counts."""
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def build(cls, df):
+        cells = (
+            df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)
+            .size()
+            .reset_index(name='Count')
+        )
+        cells['Count'] = cells['Count'].astype(np.int64)
+        return cls(cells)
+
+    def updated(self, df, change):
+        """The cube of ``df``, the corpus after ``change``.
+
+        The replaced rows are counted out of their cells and the changed rows
+        into theirs, without regrouping the corpus.
+        """
+        def aligned(frame):
+            # Categorical dimensions take the categories of the merged corpus
+            frame = frame[CUBE_DIMENSIONS].copy()
+            for col in CUBE_DIMENSIONS:
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    frame[col] = frame[col].cat.set_categories(df[col].cat.categories)
+            return frame
+
+        combined = pd.concat([
+            aligned(self.cells).assign(Count=self.cells['Count'].to_numpy()),
+            aligned(change.previous).assign(Count=np.int64(-1)),
+            aligned(df.iloc[change.rows]).assign(Count=np.int64(1)),
+        ], ignore_index=True)
+        counts = combined.groupby(CUBE_DIMENSIONS, observed=True, dropna=False)['Count'].sum().reset_index()
+        return CountCube(counts[counts['Count'] != 0].reset_index(drop=True))
+
+    def covers(self, filters):
+        """True if every active filter is a cube dimension."""
+        return all(not is_active(value) or col in CUBE_DIMENSIONS for col, value in filters.items())
+
+    def _mask(self, filters=None, year_range=None):
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for col, value in (filters or {}).items():
+            if is_multi(value) and is_active(value):
+                mask &= cells[col].isin(list(value)).to_numpy(dtype=bool)
+            elif is_active(value):
+                mask &= (cells[col] == value).fillna(False).to_numpy(dtype=bool)
+        if year_range is not None:
+            in_range = (cells['Year'] >= year_range[0]) & (cells['Year'] <= year_range[1])
+            mask &= in_range.fillna(False).to_numpy(dtype=bool)
+        return mask
+
+    def counts(self, by, filters=None, year_range=None):
+        """Row counts grouped by the dimensions ``by`` for a filter selection.
+
+        Same result as ``df_filtered.groupby(by, observed=True).size()``.
+        """
+        selected = self.cells[self._mask(filters, year_range)]
+        return selected.groupby(by, observed=True)['Count'].sum()
+
+
+def count_cube(df):
+    """Return the shared ``CountCube`` for a cached corpus frame."""
+    return derived(df, "count_cube", CountCube.build)
@@ -0,0 +1,183 @@
+"""Format-aware parsing of the ``Published date`` column.
+
+Dates repeat a lot, so only the distinct strings of a column are parsed
+and the result is spread back to the rows through their factorized codes.
+The date format is inferred once from a sample of those strings and they
+are parsed with that exact format.  Only the values that do not fit fall
+back, one step at a time:
+
+1. partial dates (``1950``, ``1950-03``, ``03/1950``) keep the year and,
+   if given, the month;
+2. anything else goes through pandas' per-value ``format="mixed"`` parser;
+3. what is left is flagged ``invalid``.
+
+Dates outside ``MIN_YEAR``..``MAX_YEAR`` are flagged ``invalid`` too, so a
+placeholder such as ``0000`` never reaches the mixed parser (which would
+read it as a day in year 0).
+
+Every row gets a ``Date precision`` of ``day``, ``month``, ``year`` or
+``invalid`` (``<NA>`` when the date is empty), and compact ``Year`` and
+``Month`` keys.  A partial date is stored as the first day of its period.
+"""
+import functools
+
+import pandas as pd
+
+# Candidate formats, most common first; ties go to the earlier format
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d.%m.%Y",
+    "%d %B %Y",
+    "%B %d, %Y",
+]
+SAMPLE_SIZE = 500
+
+# Years a publication date can plausibly have
+MIN_YEAR = 1800
+MAX_YEAR = 2100
+
+PRECISIONS = ["day", "month", "year", "invalid"]
+PRECISION_DTYPE = pd.CategoricalDtype(PRECISIONS)
+
+_PARTIAL_PATTERNS = [
+    r"^(?P<year>\d{4})$",
+    r"^(?P<year>\d{4})[-/.](?P<month>\d{1,2})$",
+    r"^(?P<month>\d{1,2})[-/.](?P<year>\d{4})$",
+]
+
+
+@functools.lru_cache(maxsize=32)
+def _infer(sample):
+    values = pd.Series(sample, dtype=object)
+    best, best_hits = None, 0
+    for fmt in DATE_FORMATS:
+        hits = int(pd.to_datetime(values, format=fmt, errors='coerce').notna().sum())
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def infer_format(values):
+    """Return the format matching most of a sample of ``values``, or None."""
+    sample = pd.Series(values).dropna().astype(str).str.strip().drop_duplicates()
+    return _infer(tuple(sample.head(SAMPLE_SIZE)))
+
+
+def _partial(text):
+    """Year and month (``<NA>`` if absent) of partial dates in ``text``."""
+    year = pd.Series(pd.NA, index=text.index, dtype=pd.Int32Dtype())
+    month = pd.Series(pd.NA, index=text.index, dtype=pd.Int32Dtype())
+    for pattern in _PARTIAL_PATTERNS:
+        todo = year.isna()
+        if not todo.any():
+            break
+        parts = text[todo].str.extract(pattern)
+        found = parts['year'].notna()
+        if 'month' in parts:
+            months = pd.to_numeric(parts['month'], errors='coerce')
+            found &= months.between(1, 12)
+            month.loc[found[found].index] = months[found].astype(int)
+        year.loc[found[found].index] = parts['year'][found].astype(int)
+    return year, month
+
+
+class DateParser:
+    """Parses date strings with a format inferred on first use.
+
+    One parser is reused across the chunks of a streamed file, so the
+    format is inferred from the first chunk only.
+    """
+
+    def __init__(self, date_format=None):
+        self.date_format = date_format
+
+    def parse(self, values):
+        """Return a frame of ``Published date``, ``Year``, ``Month`` and
+        ``Date precision`` for the date strings ``values``."""
+        values = pd.Series(values)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return self._result(values, values.notna().map({True: "day", False: None}))
+
+        codes, uniques = pd.factorize(values.astype(object))
+        # Missing values take the code of a trailing empty string
+        codes[codes < 0] = len(uniques)
+        keys = self._parse_distinct(pd.Series([*uniques, ""], dtype=object).astype(str))
+        return keys.take(codes).reset_index(drop=True).set_axis(values.index)
+
+    def _parse_distinct(self, text):
+        text = text.str.strip()
+        text = text.mask(text == "")
+        if self.date_format is None:
+            self.date_format = infer_format(text)
+
+        dates = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+        precision = pd.Series(None, index=text.index, dtype=object)
+        if self.date_format is not None:
+            dates = pd.to_datetime(text, format=self.date_format, errors='coerce')
+        precision[dates.notna()] = "day"
+
+        todo = text.notna() & dates.isna()
+        if todo.any():
+            year, month = _partial(text[todo])
+            found = year.notna()
+            implausible = found & ~year.between(MIN_YEAR, MAX_YEAR)
+            precision[implausible[implausible].index] = "invalid"
+            todo[implausible[implausible].index] = False
+            found &= ~implausible
+            if found.any():
+                starts = pd.to_datetime(pd.DataFrame({
+                    'year': year[found], 'month': month[found].fillna(1), 'day': 1,
+                }), errors='coerce')
+                dates[starts.index] = starts
+                precision[found[found].index] = month[found].notna().map({True: "month", False: "year"})
+            todo &= dates.isna()
+
+        if todo.any():
+            mixed = pd.to_datetime(text[todo], format="mixed", errors='coerce')
+            dates[mixed.index] = mixed
+            precision[mixed.index] = mixed.notna().map({True: "day", False: "invalid"})
+
+        implausible = dates.notna() & ~dates.dt.year.between(MIN_YEAR, MAX_YEAR)
+        dates[implausible] = pd.NaT
+        precision[implausible] = "invalid"
+        return self._result(dates, precision)
+
+    @staticmethod
+    def _result(dates, precision):
+        precision = precision.astype(PRECISION_DTYPE)
+        year = dates.dt.year.astype(pd.Int16Dtype())
+        month = dates.dt.month.astype(pd.Int8Dtype()).mask(precision == "year")
+        return pd.DataFrame({
+            'Published date': dates,
+            'Year': year,
+            'Month': month,
+            'Date precision': precision,
+        })
+
+
+def format_date(date, precision):
+    """Show a parsed date only down to its precision, e.g. ``1950-03``."""
+    if pd.isna(date):
+        return "N/A"
+    if precision == "year":
+        return f"{date.year}"
+    if precision == "month":
+        return f"{date.year}-{date.month:02d}"
+    return date.strftime("%Y-%m-%d")
+
+
+def format_dates(dates, precision):
+    """Vectorized ``format_date`` for a column of dates and precisions."""
+    text = dates.dt.strftime("%Y-%m-%d")
+    text = text.mask(precision == "month", dates.dt.strftime("%Y-%m"))
+    return text.mask(precision == "year", dates.dt.strftime("%Y"))
+
+
+def parse_dates(values, date_format=None):
+    """Parse ``values`` in one go; see ``DateParser.parse``."""
+    return DateParser(date_format).parse(values)
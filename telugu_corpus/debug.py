@@ -0,0 +1,26 @@
+"""Streamlit debug panel for rerun profiles (see ``telugu_corpus.profiling``).
+
+Pages show it when opened with ``?debug=1``.  Kept apart from the rest of
+the package, which does not depend on Streamlit.
+"""
+import streamlit as st
+
+from telugu_corpus import profiling
+
+
+def debug_enabled():
+    return st.query_params.get("debug") == "1"
+
+
+def show_profile(profile):
+    """Sidebar panel with the stage timings and cache counts of a rerun."""
+    if profile is None:
+        return
+    with st.sidebar.expander("⏱️ Rerun profile", expanded=True):
+        memory = "" if profile.rss_delta is None else f", memory {profile.rss_delta / 2 ** 20:+.1f} MB"
+        st.caption(f"{profile.label}: {profile.total_ms:,.1f} ms{memory}")
+        st.dataframe(profile.stage_frame(), hide_index=True)
+        st.markdown("**Cache hits and misses (this rerun)**")
+        st.dataframe(profile.cache_frame(), hide_index=True)
+        st.markdown("**Since process start**")
+        st.dataframe(profiling.cache_totals(), hide_index=True)
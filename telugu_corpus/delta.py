@@ -0,0 +1,174 @@
+"""Incremental corpus updates from delta CSVs.
+
+New catalog entries arrive as small CSV files with the corpus columns.  A
+delta is an upsert keyed on ``ID``: a record whose ID is already in the
+corpus replaces that record in place (same row position), any other record
+is appended.  Deltas are kept next to the corpus file in a ``.deltas``
+directory and applied in file name order each time the corpus is loaded::
+
+    sorted_data[1].csv
+    sorted_data[1].deltas/2026-10-05.csv
+    sorted_data[1].deltas/2026-10-12.csv
+
+``merge_delta`` builds the merged frame and a ``Change`` naming the rows
+it touched.  The derived structures (filter bitmaps, search index, count
+cube, Q&A columns, author index) are then updated from the ``Change``
+rather than rebuilt, so the cost of tokenizing, grouping and indexing
+grows with the delta rather than with the corpus (see
+``Corpus.update``).  Each merged corpus is a new version with its own
+cache key, so memoized results of the previous version are never reused.
+"""
+import os
+import shutil
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from telugu_corpus.frame import arrow_types_mapper, compact_frame
+from telugu_corpus.ingest import SchemaError, read_batches
+
+DELTA_SUFFIX = ".deltas"
+DELTA_PATTERN = ".csv"
+
+
+class Change(namedtuple("Change", "n_rows updated added previous")):
+    """Rows touched by a merged delta.
+
+    ``n_rows`` is the number of rows before the merge, ``updated`` the
+    sorted positions of the replaced rows, ``added`` the number of rows
+    appended after them and ``previous`` the replaced rows as they were.
+    """
+
+    @property
+    def rows(self):
+        """Positions of every updated or added row, sorted."""
+        return np.concatenate([self.updated, np.arange(self.n_rows, self.n_rows + self.added)]).astype(np.int64)
+
+
+def delta_dir(path):
+    """Return the directory of delta CSVs for the corpus file ``path``."""
+    root, _ = os.path.splitext(path)
+    return root + DELTA_SUFFIX
+
+
+def delta_paths(path):
+    """The delta CSVs of the corpus file ``path``, in the order they apply."""
+    directory = delta_dir(path)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(DELTA_PATTERN) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def delta_key(parent, path):
+    """Cache key of corpus version ``parent`` with the delta ``path`` merged in."""
+    stat = os.stat(path)
+    return ("delta", parent, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def base_key(key):
+    """The key of the corpus a chain of deltas was merged into."""
+    while key[0] == "delta":
+        key = key[1]
+    return key
+
+
+def applied_deltas(key):
+    """Paths of the deltas merged into the corpus version ``key``, oldest first."""
+    paths = []
+    while key is not None and key[0] == "delta":
+        paths.append(key[2])
+        key = key[1]
+    return paths[::-1]
+
+
+def add_delta(path, source):
+    """Copy the delta CSV ``source`` into the deltas of ``path``; return the copy.
+
+    The copy is named by the current time so it applies after the others.
+    """
+    directory = delta_dir(path)
+    os.makedirs(directory, exist_ok=True)
+    dest = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.path.basename(source)}")
+    shutil.copyfile(source, dest)
+    return dest
+
+
+def read_delta(path):
+    """Parse and validate a delta CSV into a compact frame (see ``ingest``).
+
+    Raises ``SchemaError`` when it does not fit the corpus schema.
+    """
+    with open(path, "rb") as source:
+        table = pa.Table.from_batches(list(read_batches(source)))
+    return compact_frame(table.to_pandas(types_mapper=arrow_types_mapper))
+
+
+def _merge_categorical(old, new, take, added):
+    """Merge categorical columns; categories stay in lexical order."""
+    categories = old.cat.categories
+    extra = new.cat.categories.difference(categories)
+    codes = old.cat.codes.to_numpy().astype(np.int32)
+    if len(extra):
+        merged = categories.append(extra).sort_values()
+        # Old codes shift past the inserted categories; remap them
+        codes = np.append(merged.get_indexer(categories), -1).astype(np.int32)[codes]
+        categories = merged
+    new_codes = np.append(categories.get_indexer(new.cat.categories), -1).astype(np.int32)[new.cat.codes.to_numpy()]
+    codes = np.concatenate([codes, new_codes[added]])
+    codes[take[0]] = new_codes[take[1]]
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories, ordered=old.cat.ordered), validate=False)
+
+
+def _merge_column(old, new, take, added):
+    """``old`` with the rows ``take`` replaced and the rows ``added`` appended from ``new``."""
+    old_categorical = isinstance(old.dtype, pd.CategoricalDtype)
+    new_categorical = isinstance(new.dtype, pd.CategoricalDtype)
+    if old_categorical or new_categorical:
+        # A column can be categorical on one side only (free-form Vol labels)
+        if not old_categorical:
+            old = old.astype(pd.StringDtype("pyarrow")).astype('category')
+        if not new_categorical:
+            new = new.astype(pd.StringDtype("pyarrow")).astype('category')
+        return _merge_categorical(old, new, take, added)
+    merged = pd.concat([old, new.iloc[added]], ignore_index=True)
+    merged.iloc[take[0]] = new.iloc[take[1]].astype(merged.dtype).array
+    return merged
+
+
+def check_columns(df, delta):
+    """Raise ``SchemaError`` unless ``delta`` has the columns of the corpus ``df``."""
+    if set(delta.columns) != set(df.columns):
+        extra = sorted(set(delta.columns) - set(df.columns))
+        missing = sorted(set(df.columns) - set(delta.columns))
+        raise SchemaError(
+            "Delta columns differ from the corpus"
+            + (f" (extra: {', '.join(extra)})" if extra else "")
+            + (f" (missing: {', '.join(missing)})" if missing else "")
+        )
+
+
+def merge_delta(df, delta):
+    """Upsert the records of ``delta`` into the corpus frame ``df`` by ``ID``.
+
+    Returns the merged frame and the ``Change``.  A later record of an ID
+    repeated within the delta wins.  Raises ``SchemaError`` if the columns
+    differ from the corpus.
+    """
+    check_columns(df, delta)
+    delta = delta[~delta['ID'].duplicated(keep='last')].reset_index(drop=True)
+    ids = df['ID'].to_numpy()
+    delta_ids = delta['ID'].to_numpy()
+
+    updated = np.flatnonzero(np.isin(ids, delta_ids))
+    take = (updated, pd.Index(delta_ids).get_indexer(ids[updated]))
+    added = np.flatnonzero(~np.isin(delta_ids, ids[updated]))
+
+    merged = pd.DataFrame({col: _merge_column(df[col], delta[col], take, added) for col in df.columns})
+    change = Change(len(df), updated.astype(np.int64), len(added), df.iloc[updated])
+    return merged, change
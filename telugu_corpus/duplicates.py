@@ -0,0 +1,302 @@
+"""Near-duplicate title detection with MinHash and LSH banding.
+
+Duplicated records in the catalog rarely repeat a title byte for byte:
+they differ in spacing, punctuation, zero-width joiners, vowel signs
+(matras) or a word or two.  Titles are compared in three steps:
+
+* titles with the same *compact* form (NFC, case-folded, without spaces,
+  punctuation and zero-width characters) are grouped;
+* so are titles with the same *skeleton*, the compact form without Telugu
+  vowel signs, viramas, anusvara and visarga, if it keeps at least
+  ``MIN_SKELETON`` letters (dropping the matras of a short word often
+  yields another word);
+* the compact forms of these groups (of at least ``MIN_LENGTH`` code
+  points) are cut into ``SHINGLE``-grams and hashed into MinHash
+  signatures; LSH banding (``BANDS`` bands of ``NUM_HASHES / BANDS``
+  values) proposes candidate pairs in near-linear time, and candidates
+  whose exact shingle Jaccard similarity reaches ``THRESHOLD`` are merged.
+
+Merged groups are closed transitively, then members not similar to the
+cluster's most common title are split off again, so chains of small edits
+cannot grow a cluster without bound.  Every record gets the cluster of its
+title; ``DuplicateIndex.groups`` further splits clusters by author,
+magazine or year to list possible duplicate records.  The index is built
+once per corpus version.
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from telugu_corpus.loader import derived
+
+SHINGLE = 3
+NUM_HASHES = 64
+BANDS = 16
+THRESHOLD = 0.7
+MIN_SKELETON = 5
+MIN_LENGTH = 8
+
+# Skeletons hashed per block, and candidate pairs verified per block
+CHUNK = 10_000
+
+# Fields ``groups`` can additionally compare
+GROUP_FIELDS = ["Author", "Magazine", "Year"]
+
+# Anything but letters, digits and combining marks (RE2 syntax)
+_NOT_TEXT = r"[^\p{L}\p{N}\p{M}]+"
+
+# Telugu vowel signs, virama, anusvara, visarga and other marks
+_MARKS = "[" + "".join(
+    chr(cp) for cp in range(0x0C00, 0x0C80)
+    if unicodedata.category(chr(cp)) in ("Mn", "Mc")
+) + "]"
+
+
+def compact_titles(titles):
+    """Compact forms of an array of titles (see module docstring)."""
+    text = pc.utf8_lower(pc.utf8_normalize(pa.array(titles, type=pa.string()), "NFC"))
+    return pc.replace_substring_regex(text, _NOT_TEXT, "")
+
+
+def skeletons(compact):
+    """Compact titles without Telugu vowel signs and other marks."""
+    return pc.replace_substring_regex(compact, _MARKS, "")
+
+
+def _shingle_csr(texts):
+    """Sorted unique shingles of every text, as CSR offsets and values.
+
+    A shingle of three code points (each below 2**21) is packed exactly
+    into one uint64, so no hashing is needed.
+    """
+    lengths = np.array([len(t) for t in texts], dtype=np.int64)
+    points = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    text_of = np.repeat(np.arange(len(texts)), lengths)
+    # A shingle starts at every position but the last SHINGLE - 1 of a text
+    ends = np.repeat(np.cumsum(lengths), lengths)
+    starts = np.flatnonzero(np.arange(len(points)) + SHINGLE <= ends)
+    owner = text_of[starts]
+    values = np.zeros(len(starts), dtype=np.uint64)
+    for i in range(SHINGLE):
+        values = (values << np.uint64(21)) | points[starts + i]
+
+    # Drop repeated shingles within a text
+    order = np.lexsort((values, owner))
+    owner, values = owner[order], values[order]
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = (owner[1:] != owner[:-1]) | (values[1:] != values[:-1])
+    owner, values = owner[keep], values[keep]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=len(texts)), out=offsets[1:])
+    return offsets, values
+
+
+def _band_keys(offsets, shingles, seed=0):
+    """LSH band keys (``BANDS`` x texts) of the MinHash signatures.
+
+    Hash functions are multiply-shift hashes (``(a * x + b) >> 32`` in
+    wrapping 64-bit arithmetic), one per signature value.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 63, NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, NUM_HASHES, dtype=np.uint64)
+    rows = NUM_HASHES // BANDS
+    mix = rng.integers(1, 1 << 63, rows, dtype=np.uint64) | np.uint64(1)
+
+    n = len(offsets) - 1
+    keys = np.empty((BANDS, n), dtype=np.uint64)
+    for start in range(0, n, CHUNK):
+        stop = min(start + CHUNK, n)
+        lo, hi = offsets[start], offsets[stop]
+        values = ((shingles[lo:hi, None] * a + b) >> np.uint64(32)).astype(np.uint32)
+        signature = np.minimum.reduceat(values, offsets[start:stop] - lo, axis=0).astype(np.uint64)
+        # uint64 arithmetic wraps around, which is fine for a hash
+        banded = signature.reshape(stop - start, BANDS, rows) * mix
+        keys[:, start:stop] = banded.sum(axis=2, dtype=np.uint64).T
+    return keys
+
+
+def _candidate_pairs(keys):
+    """Pairs of texts sharing a band key: each bucket's members with its first."""
+    n = keys.shape[1]
+    codes = []
+    for band in keys:
+        order = np.argsort(band, kind="stable")
+        sorted_keys = band[order]
+        new_run = np.ones(n, dtype=bool)
+        new_run[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        leader = order[np.flatnonzero(new_run)][np.cumsum(new_run) - 1]
+        first, second = leader[~new_run], order[~new_run]
+        low, high = np.minimum(first, second), np.maximum(first, second)
+        codes.append(low.astype(np.int64) * n + high)
+    codes = np.unique(np.concatenate(codes)) if codes else np.empty(0, np.int64)
+    return codes // max(n, 1), codes % max(n, 1)
+
+
+def _jaccard(offsets, shingles, first, second):
+    """Exact Jaccard similarity of the shingle sets of each pair."""
+    sizes = np.diff(offsets)
+    result = np.empty(len(first), dtype=np.float64)
+    for start in range(0, len(first), CHUNK):
+        a, b = first[start:start + CHUNK], second[start:start + CHUNK]
+        pair = np.arange(len(a))
+        both = np.concatenate([a, b])
+        owner = np.concatenate([np.repeat(pair, sizes[a]), np.repeat(pair, sizes[b])])
+        # Positions of every shingle of every pair member in ``shingles``
+        counts = sizes[both]
+        starts = np.repeat(offsets[both] - np.cumsum(counts) + counts, counts)
+        values = shingles[np.arange(counts.sum()) + starts]
+        order = np.lexsort((values, owner))
+        owner, values = owner[order], values[order]
+        same = (owner[1:] == owner[:-1]) & (values[1:] == values[:-1])
+        shared = np.bincount(owner[1:][same], minlength=len(a))
+        union = sizes[a] + sizes[b] - shared
+        result[start:start + len(a)] = shared / np.maximum(union, 1)
+    return result
+
+
+def _components(n, first, second):
+    """Connected component label of each of ``n`` nodes given the edges."""
+    labels = np.arange(n)
+    while True:
+        # Hook the root of each edge's higher end under the lower root
+        root_first, root_second = labels[first], labels[second]
+        low = np.minimum(root_first, root_second)
+        before = labels.copy()
+        np.minimum.at(labels, root_first, low)
+        np.minimum.at(labels, root_second, low)
+        # Pointer jumping until every node points at its component's root
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, before):
+            return labels
+
+
+def _centered(labels, weights, offsets, shingles):
+    """Split off component members that are not similar to its center.
+
+    Transitive closure can chain titles that differ more and more ("X",
+    "X a", "X ab", ...); keeping only members similar to the component's
+    heaviest title bounds how far a cluster drifts.
+    """
+    order = np.lexsort((-weights, labels))
+    first = np.r_[True, labels[order][1:] != labels[order][:-1]]
+    center = np.empty(len(labels), dtype=np.int64)
+    center[labels[order[first]]] = order[first]
+    members = np.flatnonzero(center[labels] != np.arange(len(labels)))
+    far = members[_jaccard(offsets, shingles, members, center[labels[members]]) < THRESHOLD]
+    labels = labels.copy()
+    labels[far] = far  # never a root of another component, so stays unique
+    return labels
+
+
+def cluster_titles(titles, weights=None):
+    """Cluster ids of an array of distinct titles (equal ids: near duplicates).
+
+    ``weights`` (e.g. the number of records of each title) pick the center
+    of each cluster; by default every title weighs the same.
+    """
+    weights = np.ones(len(titles), dtype=np.int64) if weights is None else np.asarray(weights)
+    compact = compact_titles(titles)
+    compact_codes, compact_uniques = pd.factorize(compact.to_numpy(zero_copy_only=False))
+    compact_weights = np.bincount(compact_codes, weights, minlength=len(compact_uniques))
+
+    # Exact groups: by skeleton if long enough, otherwise by compact form
+    skeleton = skeletons(pa.array(compact_uniques, type=pa.string()))
+    long_skeleton = pc.utf8_length(skeleton).to_numpy() >= MIN_SKELETON
+    skeleton_codes, skeleton_uniques = pd.factorize(skeleton.filter(pa.array(long_skeleton)).to_numpy(zero_copy_only=False))
+    group = np.empty(len(compact_uniques), dtype=np.int64)
+    group[long_skeleton] = skeleton_codes
+    group[~long_skeleton] = len(skeleton_uniques) + np.arange((~long_skeleton).sum())
+
+    # Each group is represented by its heaviest compact form
+    order = np.lexsort((-compact_weights, group))
+    heads = order[np.r_[True, group[order][1:] != group[order][:-1]]]
+    head_weights = np.bincount(group, compact_weights)
+    sizes = np.array([len(compact_uniques[i]) for i in heads], dtype=np.int64)
+
+    labels = np.arange(len(heads))
+    hashed = np.flatnonzero(sizes >= MIN_LENGTH)
+    if len(hashed):
+        offsets, shingles = _shingle_csr([compact_uniques[i] for i in heads[hashed]])
+        first, second = _candidate_pairs(_band_keys(offsets, shingles))
+        # Titles of very different length are not duplicates even when one
+        # contains the other (or repeats its words), which would chain clusters
+        size = sizes[hashed]
+        close = np.minimum(size[first], size[second]) >= THRESHOLD * np.maximum(size[first], size[second])
+        first, second = first[close], second[close]
+        similar = _jaccard(offsets, shingles, first, second) >= THRESHOLD
+        hashed_labels = _components(len(hashed), first[similar], second[similar])
+        hashed_labels = _centered(hashed_labels, head_weights[hashed], offsets, shingles)
+        labels[hashed] = hashed[hashed_labels]
+
+    return pd.factorize(labels[group[compact_codes]])[0].astype(np.int32)
+
+
+class DuplicateIndex:
+    """Near-duplicate title cluster of every record."""
+
+    def __init__(self, row_cluster, labels):
+        self.row_cluster = row_cluster
+        self.labels = labels
+        self.sizes = np.bincount(row_cluster[row_cluster >= 0], minlength=len(labels))
+
+    @classmethod
+    def build(cls, df):
+        title_codes, titles = pd.factorize(df['Title'])
+        counts = np.bincount(title_codes[title_codes >= 0], minlength=len(titles))
+        clusters = cluster_titles(np.asarray(titles, dtype=object), counts)
+        row_cluster = np.where(title_codes >= 0, clusters[title_codes], -1).astype(np.int32)
+
+        # A cluster is labelled with its most frequent spelling
+        order = np.lexsort((-counts, clusters))
+        first = order[np.r_[True, clusters[order][1:] != clusters[order][:-1]]]
+        labels = pd.Index(np.asarray(titles, dtype=object)[first], dtype=object)
+        return cls(row_cluster, labels)
+
+    def key(self):
+        """Group key (cluster per row) and labels, for ``QueryColumns``."""
+        return self.row_cluster, self.labels
+
+    def groups(self, df, rows=None, fields=()):
+        """Records of ``rows`` in possible duplicate groups.
+
+        Records are grouped by title cluster and by the ``fields`` (any of
+        ``GROUP_FIELDS``); groups of at least two records are returned,
+        largest first, with a ``Group`` number column.
+        """
+        rows = np.arange(len(df)) if rows is None else np.asarray(rows)
+        rows = rows[self.row_cluster[rows] >= 0]
+        # Only clusters holding several records can form a group
+        rows = rows[self.sizes[self.row_cluster[rows]] > 1]
+        keys = [self.row_cluster[rows].astype(np.int64)]
+        for field in fields:
+            codes = pd.factorize(df[field].iloc[rows])[0].astype(np.int64)
+            # A missing value matches nothing
+            rows, keys = rows[codes >= 0], [key[codes >= 0] for key in keys + [codes]]
+        if len(rows) == 0:
+            group = size = np.empty(0, dtype=np.int64)
+        else:
+            _, group, size = np.unique(np.stack(keys), axis=1, return_inverse=True, return_counts=True)
+            group = group.ravel()
+        keep = size[group] > 1
+        rows, group = rows[keep], group[keep]
+        order = np.lexsort((df['ID'].to_numpy()[rows], group, -size[group]))
+        rows, group = rows[order], group[order]
+        numbers = np.cumsum(np.r_[True, group[1:] != group[:-1]]) if len(group) else group
+
+        columns = [col for col in ['ID', 'Title', 'Author', 'Magazine', 'Published date', 'Type'] if col in df.columns]
+        result = df[columns].iloc[rows].reset_index(drop=True)
+        result.insert(0, 'Group', numbers)
+        return result
+
+
+def duplicate_index(df):
+    """Return the shared ``DuplicateIndex`` for a cached corpus frame."""
+    return derived(df, "duplicate_index", DuplicateIndex.build)
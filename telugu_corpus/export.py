@@ -0,0 +1,146 @@
+"""Chunked export of a selection to CSV, Parquet and XLSX.
+
+An export never builds the selected frame or the output file in memory:
+rows are taken from the corpus ``CHUNK_ROWS`` at a time and appended to a
+file on disk (CSV text, Parquet row groups, or rows of a write-only
+openpyxl workbook).  Files are named by a fingerprint of the corpus
+version, the format and the selected rows, so asking again for the same
+selection reuses the file that is already there.  Only the
+``MAX_EXPORTS`` most recently used files are kept.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from telugu_corpus.dates import format_dates
+from telugu_corpus.ingest import EXPECTED_COLUMNS
+from telugu_corpus.loader import corpus_key
+from telugu_corpus.memo import fingerprint
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+CHUNK_ROWS = 50_000
+
+# Rows per worksheet, leaving one row for the header
+EXCEL_MAX_ROWS = 1_048_575
+
+# Export files kept on disk; older ones are deleted after each new export
+MAX_EXPORTS = 16
+
+
+def export_chunks(df, rows, chunk_rows=CHUNK_ROWS):
+    """Yield the export columns of ``df.iloc[rows]``, one chunk at a time.
+
+    Dates are written at their precision (``1950``, ``1950-03``, ...).
+    """
+    columns = [col for col in EXPECTED_COLUMNS if col in df.columns]
+    rows = np.asarray(rows)
+    # An empty selection still yields one (empty) chunk for the header
+    for start in range(0, max(len(rows), 1), chunk_rows):
+        chunk = df.iloc[rows[start:start + chunk_rows]]
+        out = chunk[columns].copy()
+        if 'Date precision' in chunk.columns:
+            out['Published date'] = format_dates(chunk['Published date'], chunk['Date precision'])
+        yield out
+
+
+def _write_csv(chunks, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=i == 0, index=False)
+
+
+def _write_parquet(chunks, path):
+    writer = schema = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(chunks, path):
+    from openpyxl import Workbook
+
+    # A write-only workbook streams rows to disk instead of keeping cells
+    workbook = Workbook(write_only=True)
+    sheet, sheet_rows = None, EXCEL_MAX_ROWS
+    for chunk in chunks:
+        header = list(chunk.columns)
+        for record in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False):
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Records {len(workbook.worksheets) + 1}")
+                sheet.append(header)
+                sheet_rows = 0
+            sheet.append(list(record))
+            sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet("Records 1").append(header)
+    workbook.save(path)
+
+
+_WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}
+
+
+def export_path(df, rows, fmt):
+    """Return where the export of ``rows`` in format ``fmt`` is stored."""
+    extension, _ = EXPORT_FORMATS[fmt]
+    name = fingerprint(corpus_key(df), fmt, np.asarray(rows, dtype=np.int64))
+    return os.path.join(tempfile.gettempdir(), "telugu_corpus", "exports", f"{name}.{extension}")
+
+
+def prune_exports(directory, keep=MAX_EXPORTS):
+    """Delete all but the ``keep`` most recently used export files in ``directory``."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:
+                pass
+    for _, path in sorted(entries, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_file(df, rows, fmt, chunk_rows=CHUNK_ROWS):
+    """Write ``df.iloc[rows]`` in format ``fmt`` and return the file path.
+
+    An existing export of the same corpus version and rows is reused;
+    frames outside the corpus cache are always written afresh.
+    """
+    path = export_path(df, rows, fmt)
+    if corpus_key(df) is not None and os.path.exists(path):
+        try:
+            # Mark it as recently used so pruning keeps it
+            os.utime(path)
+            return path
+        except OSError:
+            pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write under a unique name so concurrent exports never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        _WRITERS[EXPORT_FORMATS[fmt][0]](export_chunks(df, rows, chunk_rows), tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    prune_exports(os.path.dirname(path))
+    return path
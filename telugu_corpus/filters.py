@@ -0,0 +1,294 @@
+"""Bitmap filter engine for the sidebar filters.
+
+Every distinct value of a filter column gets a precomputed row set, stored
+the way Roaring bitmaps store containers: values covering a large share of
+the corpus keep a packed bitmap (one bit per row), rarer values keep a
+sorted int32 array of row positions.  A years index (row positions sorted
+by year) answers the year range.
+
+A filter combination is resolved by ANDing those sets, starting from the
+smallest one, and only the final row positions are returned; the caller
+materializes a single ``df.iloc[rows]``.
+
+The engine also keeps the integer category codes of every filter column so
+facet counts for all dropdowns come out of one ``np.bincount``.
+
+A merged delta (see ``telugu_corpus.delta``) updates the engine in place of
+a rebuild: only the row sets of values held by changed rows are touched.
+"""
+import copy
+
+import numpy as np
+import pandas as pd
+
+from telugu_corpus.loader import derived
+
+FILTER_COLUMNS = ["Type", "Author", "Publisher", "Magazine", "STATUS"]
+
+# Values matching more than 1/DENSE_RATIO of the rows are stored as bitmaps
+DENSE_RATIO = 32
+
+
+class RowSet:
+    """Rows holding one value: a packed bitmap or a sorted position array."""
+
+    def __init__(self, rows, n_rows):
+        self.count = len(rows)
+        if self.count * DENSE_RATIO > n_rows:
+            mask = np.zeros(n_rows, dtype=bool)
+            mask[rows] = True
+            self.bitmap = np.packbits(mask, bitorder="little")
+            self.rows = None
+        else:
+            self.bitmap = None
+            self.rows = rows.astype(np.int32)
+
+    def contains(self, rows):
+        """Boolean mask telling which of ``rows`` belong to this set."""
+        if self.bitmap is not None:
+            return (self.bitmap[rows >> 3] >> (rows & 7).astype(np.uint8)) & 1 == 1
+        return np.isin(rows, self.rows, assume_unique=True)
+
+    def to_rows(self, n_rows):
+        if self.bitmap is not None:
+            return np.flatnonzero(np.unpackbits(self.bitmap, count=n_rows, bitorder="little")).astype(np.int32)
+        return self.rows
+
+    def updated(self, removed, added, n_rows):
+        """A new set without the rows ``removed`` and with the rows ``added``.
+
+        ``removed`` must belong to the set and ``added`` must not, unless
+        also removed.  ``n_rows`` may grow.
+        """
+        if self.bitmap is None:
+            rows = np.setdiff1d(self.rows, removed, assume_unique=True)
+            return RowSet(np.union1d(rows, added), n_rows)
+        row_set = copy.copy(self)
+        row_set.bitmap = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        row_set.bitmap[:len(self.bitmap)] = self.bitmap
+        np.bitwise_and.at(row_set.bitmap, removed >> 3, ~np.left_shift(1, removed & 7).astype(np.uint8))
+        np.bitwise_or.at(row_set.bitmap, added >> 3, np.left_shift(1, added & 7).astype(np.uint8))
+        row_set.count = self.count - len(removed) + len(added)
+        return row_set
+
+
+def is_multi(value):
+    """True for a filter value that selects several values (any of them)."""
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+def is_active(value):
+    """False for "All": ``None`` or an empty multi-value selection."""
+    return value is not None and not (is_multi(value) and len(value) == 0)
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, list(uniques)
+
+
+class FilterEngine:
+    """Per-value row sets for the filter columns plus a sorted year index."""
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.values = {}
+        self.codes = {}
+        self.categories = {}
+        for col in columns:
+            codes, categories = _codes(df[col])
+            self.codes[col] = codes.astype(np.int32)
+            self.categories[col] = categories
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+            self.values[col] = {
+                value: RowSet(order[bounds[i]:bounds[i + 1]], self.n_rows)
+                for i, value in enumerate(categories)
+            }
+
+        years = df['Year']
+        dated = np.flatnonzero(years.notna().to_numpy())
+        year_values = years.to_numpy(dtype=np.int32, na_value=0)[dated]
+        order = np.argsort(year_values, kind="stable")
+        self._years_sorted = year_values[order]
+        self._year_rows = dated[order].astype(np.int32)
+        self._years = years.to_numpy(dtype=np.float32, na_value=np.nan)
+
+    def updated(self, df, change):
+        """The engine of ``df``, the corpus after ``change``, reusing this one.
+
+        Row sets of values that no changed row held or holds are shared
+        (bitmaps only grow by the added rows).
+        """
+        engine = copy.copy(self)
+        engine.n_rows = n_rows = len(df)
+        rows = change.rows
+        is_updated = np.zeros(n_rows, dtype=bool)
+        is_updated[change.updated] = True
+        engine.values, engine.codes, engine.categories = {}, {}, {}
+        for col, old_codes in self.codes.items():
+            codes, categories = _codes(df[col])
+            engine.codes[col] = codes = codes.astype(np.int32)
+            engine.categories[col] = categories
+            old_values = self.values[col]
+            removed = dict(zip(*_grouped(self.categories[col], old_codes[change.updated], change.updated)))
+            added = dict(zip(*_grouped(categories, codes[rows], rows)))
+            empty = np.empty(0, np.int64)
+            values = {}
+            for value in categories:
+                row_set = old_values.get(value) or RowSet(empty, n_rows)
+                if value in removed or value in added or (row_set.bitmap is not None and n_rows != self.n_rows):
+                    row_set = row_set.updated(removed.get(value, empty), added.get(value, empty), n_rows)
+                values[value] = row_set
+            engine.values[col] = values
+
+        # The years index loses the updated rows and gets the changed ones
+        years = df['Year'].iloc[rows].to_numpy(dtype=np.float32, na_value=np.nan)
+        engine._years = np.concatenate([self._years, np.full(change.added, np.nan, dtype=np.float32)])
+        engine._years[rows] = years
+        keep = ~is_updated[self._year_rows]
+        dated = ~np.isnan(years)
+        new_years = years[dated].astype(np.int32)
+        kept_years = self._years_sorted[keep]
+        at = np.searchsorted(kept_years, new_years, side="right")
+        engine._years_sorted = np.insert(kept_years, at, new_years)
+        engine._year_rows = np.insert(self._year_rows[keep], at, rows[dated].astype(np.int32))
+        return engine
+
+    def _code(self, col, value):
+        try:
+            return self.categories[col].index(value)
+        except ValueError:
+            return -2  # matches no row (missing values are coded -1)
+
+    def _row_set(self, col, value):
+        """Rows holding ``value``, or any of several values; None if none."""
+        if not is_multi(value):
+            return self.values[col].get(value)
+        sets = [self.values[col][v] for v in dict.fromkeys(value) if v in self.values[col]]
+        if len(sets) <= 1:
+            return sets[0] if sets else None
+        # Values of one column hold disjoint rows, so a sort makes the union
+        rows = np.sort(np.concatenate([s.to_rows(self.n_rows) for s in sets]))
+        return RowSet(rows, self.n_rows)
+
+    def _fails(self, col, value):
+        """Boolean mask of the rows not holding (any of) ``value``."""
+        if is_multi(value):
+            return ~np.isin(self.codes[col], [self._code(col, v) for v in value])
+        return self.codes[col] != self._code(col, value)
+
+    def _year_rows_between(self, low, high):
+        lo = np.searchsorted(self._years_sorted, low, side="left")
+        hi = np.searchsorted(self._years_sorted, high, side="right")
+        return np.sort(self._year_rows[lo:hi])
+
+    def select(self, filters=None, year_range=None):
+        """Return sorted row positions matching every active filter.
+
+        ``filters`` maps a column to the selected value, or to a list of
+        values any of which may match (``None``, an empty list or a missing
+        column means "All"); ``year_range`` is an inclusive ``(low, high)``
+        pair.
+        """
+        sets = []
+        for col, value in (filters or {}).items():
+            if not is_active(value):
+                continue
+            row_set = self._row_set(col, value)
+            if row_set is None:
+                return np.empty(0, np.int32)
+            sets.append(row_set)
+
+        if not sets and year_range is None:
+            return np.arange(self.n_rows, dtype=np.int32)
+
+        sets.sort(key=lambda s: s.count)
+        if year_range is not None:
+            year_count = (
+                np.searchsorted(self._years_sorted, year_range[1], side="right")
+                - np.searchsorted(self._years_sorted, year_range[0], side="left")
+            )
+        if year_range is not None and (not sets or year_count < sets[0].count):
+            rows = self._year_rows_between(*year_range)
+            year_range = None
+        elif sets[0].bitmap is not None:
+            # Only dense sets: AND the packed bitmaps word-wise, unpack once
+            bits = np.bitwise_and.reduce([s.bitmap for s in sets])
+            rows = np.flatnonzero(np.unpackbits(bits, count=self.n_rows, bitorder="little")).astype(np.int32)
+            sets = []
+        else:
+            rows = sets.pop(0).to_rows(self.n_rows)
+
+        # AND the remaining sets, probing only the surviving rows
+        for row_set in sets:
+            if len(rows) == 0:
+                break
+            rows = rows[row_set.contains(rows)]
+        if year_range is not None and len(rows):
+            years = self._years[rows]
+            rows = rows[(years >= year_range[0]) & (years <= year_range[1])]
+        return rows
+
+    def facet_counts(self, filters=None, year_range=None, within=None):
+        """Count, for every filter column, the rows each value would return.
+
+        Each column's counts honour all *other* active filters, the year
+        range and ``within`` (row positions, e.g. search hits), which is what
+        a dropdown needs to show before the user picks from it.  Returns a
+        dict of column -> ``pd.Series`` of counts indexed by value.
+        """
+        filters = {col: value for col, value in (filters or {}).items() if is_active(value)}
+
+        # Rows must pass the constraints that are not facets themselves
+        base = np.ones(self.n_rows, dtype=bool)
+        if year_range is not None:
+            base &= (self._years >= year_range[0]) & (self._years <= year_range[1])
+        if within is not None:
+            in_results = np.zeros(self.n_rows, dtype=bool)
+            in_results[within] = True
+            base &= in_results
+
+        # Number of facet filters each row fails
+        failed = {col: self._fails(col, value) for col, value in filters.items()}
+        misses = np.zeros(self.n_rows, dtype=np.uint8)
+        for fails in failed.values():
+            misses += fails
+
+        # A row counts towards a column if it fails no filter except that one;
+        # offsetting each column's codes lets a single bincount do all of them
+        keys, offsets = [], {}
+        total = 0
+        for col, codes in self.codes.items():
+            eligible = base & (misses == failed[col]) if col in failed else base & (misses == 0)
+            col_codes = codes[eligible]
+            keys.append(col_codes[col_codes >= 0] + total)
+            offsets[col] = total
+            total += len(self.categories[col])
+        counts = np.bincount(np.concatenate(keys), minlength=total)
+
+        return {
+            col: pd.Series(
+                counts[offsets[col]:offsets[col] + len(self.categories[col])],
+                index=pd.Index(self.categories[col], dtype=object),
+                name=col,
+            )
+            for col in self.codes
+        }
+
+
+def _grouped(categories, codes, rows):
+    """Values of ``codes`` and, for each, the sorted ``rows`` holding it."""
+    valid = codes >= 0
+    codes, rows = codes[valid], rows[valid]
+    order = np.lexsort((rows, codes))
+    codes, rows = codes[order], rows[order]
+    uniques, starts = np.unique(codes, return_index=True)
+    return [categories[code] for code in uniques], np.split(rows.astype(np.int64), starts[1:])
+
+
+def filter_engine(df):
+    """Return the shared ``FilterEngine`` for a cached corpus frame."""
+    return derived(df, "filter_engine", FilterEngine)
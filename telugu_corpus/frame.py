@@ -0,0 +1,117 @@
+"""Compact canonical in-memory representation of the corpus.
+
+Every page works against the frame returned by ``compact_frame``: repeated
+strings are categorical, free text is stored as pyarrow strings and the
+derived time keys use the smallest integer dtype that fits.  The frame is
+built once per corpus version and shared read-only between sessions.
+
+Print the per-column memory breakdown of a corpus with::
+
+    python -m telugu_corpus.frame "sorted_data[1].csv"
+"""
+import argparse
+
+import pandas as pd
+import pyarrow as pa
+
+from telugu_corpus.dates import PRECISION_DTYPE, parse_dates
+
+CATEGORY_COLUMNS = ["Type", "Author", "Publisher", "Magazine"]
+TEXT_COLUMNS = ["Title", "Link"]
+# Keys compact_frame adds to the CSV columns
+KEY_COLUMNS = ["Year", "Month", "Date precision", "Decade"]
+
+_ARROW_TO_PANDAS = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+}
+
+
+def arrow_types_mapper(arrow_type):
+    """``types_mapper`` for ``Table.to_pandas`` producing compact dtypes.
+
+    Strings stay in Arrow memory instead of becoming Python objects and
+    nullable ints/bools keep their width instead of widening to float/object.
+    """
+    return _ARROW_TO_PANDAS.get(arrow_type)
+
+
+def _compact_vol(vol):
+    # Volumes are usually small integers; keep free-form labels categorical
+    numeric = pd.to_numeric(vol, errors='coerce')
+    if numeric.notna().sum() == vol.notna().sum() and (numeric.dropna() % 1 == 0).all():
+        return numeric.astype(pd.Int32Dtype() if (numeric.abs() >= 2 ** 15).any() else pd.Int16Dtype())
+    return vol.astype('category')
+
+
+def compact_frame(df):
+    """Return the canonical compact frame for a parsed corpus.
+
+    Adds the ``Year``, ``Month``, ``Decade`` and ``Date precision`` keys
+    derived from ``Published date`` (see ``telugu_corpus.dates``) unless the
+    sidecar already holds them.  Rows without a usable date get ``<NA>``
+    keys; partial dates have a Year but may lack a Month.
+    """
+    df = df.copy(deep=False)
+
+    for col in CATEGORY_COLUMNS:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in TEXT_COLUMNS:
+        df[col] = df[col].astype(pd.StringDtype("pyarrow"))
+
+    if df['STATUS'].dtype != pd.BooleanDtype():
+        df['STATUS'] = df['STATUS'].astype(pd.BooleanDtype())
+    df['Vol'] = _compact_vol(df['Vol'])
+
+    if 'Date precision' not in df.columns:
+        keys = parse_dates(df['Published date'])
+        for col in keys.columns:
+            df[col] = keys[col]
+    df['Year'] = df['Year'].astype(pd.Int16Dtype())
+    df['Month'] = df['Month'].astype(pd.Int8Dtype())
+    df['Date precision'] = df['Date precision'].astype(PRECISION_DTYPE)
+    df['Decade'] = ((df['Year'] // 10) * 10).astype(pd.Int16Dtype())
+    return df
+
+
+def memory_report(df):
+    """Return the memory used by each column of ``df``, largest first."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'Column': usage.index,
+        'Dtype': [str(df[col].dtype) for col in usage.index],
+        'Bytes': usage.values,
+    })
+    report['Share'] = (report['Bytes'] / max(report['Bytes'].sum(), 1)).round(4)
+    return report.sort_values('Bytes', ascending=False).reset_index(drop=True)
+
+
+def format_bytes(n):
+    """Human readable byte count, e.g. ``12.3 MB``."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:,.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+
+
+def main(argv=None):
+    from telugu_corpus.loader import load_corpus
+
+    parser = argparse.ArgumentParser(description="Show per-column memory usage of the corpus frame.")
+    parser.add_argument("csv", nargs="?", default="sorted_data[1].csv", help="Path of the corpus CSV file")
+    args = parser.parse_args(argv)
+
+    report = memory_report(load_corpus(args.csv))
+    report['Size'] = report['Bytes'].map(format_bytes)
+    print(report[['Column', 'Dtype', 'Size', 'Share']].to_string(index=False))
+    print(f"Total: {format_bytes(report['Bytes'].sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Full-text BM25 index over the documents behind the records' links.
+
+The documents are downloaded ahead of time into a directory, one file per
+record named by its ``ID`` (``123.txt``, ``123.html``; markup is stripped).
+``build_text_index`` tokenizes them (``normalize``d words, so encodings of
+the same Telugu text agree) and writes an Okapi BM25 inverted index in
+``SHARDS`` shards, a document going to shard ``ID % SHARDS``.  Shards are
+built in parallel by a process pool, each worker writing its own shard
+file.  A manifest records the mtime and size of every indexed file, so a
+rebuild only re-indexes the shards whose files were added, changed or
+removed.
+
+``FullTextIndex.search`` ranks the records containing every query term by
+BM25 score; the corpus-wide statistics (document count, average length,
+document frequencies) are combined from the shards at query time.  Build
+the index with::
+
+    python -m telugu_corpus index-texts texts/     # writes texts.index/
+"""
+import html
+import json
+import os
+import pickle
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from telugu_corpus.transliterate import normalize
+
+TEXTS_DIR = "texts"
+TEXT_INDEX_PATH = "texts.index"
+DOCUMENT_EXTENSIONS = (".txt", ".md", ".html", ".htm")
+
+SHARDS = 16
+INDEX_VERSION = 1
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+MANIFEST = "manifest.json"
+
+_WORD = re.compile("[\\w\u0c00-\u0c7f]+")
+_SCRIPT = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+
+_lock = threading.Lock()
+_opened = {}
+
+
+def tokenize(text):
+    """Normalized words of a document or a query."""
+    return _WORD.findall(normalize(text))
+
+
+def _document_id(name):
+    stem, ext = os.path.splitext(name)
+    if ext.lower() not in DOCUMENT_EXTENSIONS or not stem.isdigit():
+        return None
+    return int(stem)
+
+
+def _read_document(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if path.lower().endswith((".html", ".htm")):
+        text = html.unescape(_TAG.sub(" ", _SCRIPT.sub(" ", text)))
+    return text
+
+
+def _scan(docs_dir):
+    """Indexable files of ``docs_dir``: name -> [mtime_ns, size]."""
+    files = {}
+    with os.scandir(docs_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and _document_id(entry.name) is not None:
+                stat = entry.stat()
+                files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+
+def _shard_path(index_dir, shard):
+    return os.path.join(index_dir, f"shard-{shard:03d}.pkl")
+
+
+def _build_shard(docs_dir, names, path):
+    """Index the files ``names`` into one shard file; return its document count."""
+    texts = {}
+    for name in sorted(names):
+        doc_id = _document_id(name)
+        texts[doc_id] = texts.get(doc_id, "") + "\n" + _read_document(os.path.join(docs_dir, name))
+
+    vocab = {}
+    term_ids, docs, lengths = [], [], []
+    for doc, text in enumerate(texts.values()):
+        words = tokenize(text)
+        lengths.append(len(words))
+        term_ids.append(np.array([vocab.setdefault(w, len(vocab)) for w in words], dtype=np.int64))
+        docs.append(np.full(len(words), doc, dtype=np.int64))
+    term_ids = np.concatenate(term_ids) if term_ids else np.empty(0, np.int64)
+    docs = np.concatenate(docs) if docs else np.empty(0, np.int64)
+
+    # (term, doc) pairs with their counts, sorted by term: CSR postings
+    pairs, tfs = np.unique(term_ids * max(len(texts), 1) + docs, return_counts=True)
+    pair_terms = pairs // max(len(texts), 1)
+    shard = {
+        'ids': np.fromiter(texts, dtype=np.int64, count=len(texts)),
+        'lengths': np.array(lengths, dtype=np.int32),
+        'terms': vocab,
+        'offsets': np.searchsorted(pair_terms, np.arange(len(vocab) + 1)).astype(np.int64),
+        'docs': (pairs % max(len(texts), 1)).astype(np.int32),
+        'tfs': tfs.astype(np.int32),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(shard, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return len(texts)
+
+
+def _read_manifest(index_dir):
+    try:
+        with open(os.path.join(index_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def build_text_index(docs_dir=TEXTS_DIR, index_dir=TEXT_INDEX_PATH, workers=None, force=False):
+    """Index the documents of ``docs_dir``, re-indexing only changed shards.
+
+    ``workers`` processes build the shards (default: one per CPU).  Returns
+    the numbers of the rebuilt shards.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    files = _scan(docs_dir)
+
+    manifest = _read_manifest(index_dir)
+    if force or not manifest or manifest.get('version') != INDEX_VERSION or manifest.get('shards') != SHARDS:
+        manifest = {'files': {}}
+    indexed = manifest['files']
+    changed = {name for name in files.keys() | indexed.keys() if files.get(name) != indexed.get(name)}
+    stale = {_document_id(name) % SHARDS for name in changed}
+    stale |= {shard for shard in range(SHARDS) if not os.path.exists(_shard_path(index_dir, shard))}
+
+    members = {shard: [] for shard in stale}
+    for name in files:
+        shard = _document_id(name) % SHARDS
+        if shard in members:
+            members[shard].append(name)
+    shards = sorted(stale)
+    if shards:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                _build_shard,
+                [docs_dir] * len(shards),
+                [members[shard] for shard in shards],
+                [_shard_path(index_dir, shard) for shard in shards],
+            ))
+
+    # The manifest is written last: an interrupted build redoes its shards
+    tmp = os.path.join(index_dir, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({'version': INDEX_VERSION, 'shards': SHARDS, 'files': files}, f)
+    os.replace(tmp, os.path.join(index_dir, MANIFEST))
+    return shards
+
+
+class FullTextIndex:
+    """BM25 search over the shards of a built full-text index."""
+
+    def __init__(self, shards, version=None):
+        self.shards = shards
+        self.version = version
+        self.n_docs = sum(len(shard['ids']) for shard in shards)
+        total = sum(int(shard['lengths'].sum()) for shard in shards)
+        self.avgdl = total / max(self.n_docs, 1)
+
+    @classmethod
+    def load(cls, index_dir):
+        """Load a built index, or return None if there is none.
+
+        An index missing some of its shard files (an interrupted first
+        build) counts as not built; ``build_text_index`` rebuilds them.
+        """
+        manifest = _read_manifest(index_dir)
+        if not manifest or manifest.get('version') != INDEX_VERSION:
+            return None
+        paths = [_shard_path(index_dir, shard) for shard in range(manifest['shards'])]
+        if not all(os.path.exists(path) for path in paths):
+            return None
+        shards = []
+        for path in paths:
+            with open(path, "rb") as f:
+                shards.append(pickle.load(f))
+        return cls(shards, _index_version(index_dir))
+
+    def __len__(self):
+        return self.n_docs
+
+    def _postings(self, shard, term):
+        term_id = shard['terms'].get(term)
+        if term_id is None:
+            return None
+        lo, hi = shard['offsets'][term_id], shard['offsets'][term_id + 1]
+        return shard['docs'][lo:hi], shard['tfs'][lo:hi]
+
+    def search(self, query, k1=K1, b=B):
+        """IDs of the documents containing every term of ``query``, best first.
+
+        Returns ``(ids, scores)``; equal scores are ordered by ID.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        empty = np.empty(0, np.int64), np.empty(0, np.float64)
+        if not terms:
+            return empty
+        frequencies = []
+        for term in terms:
+            found = (self._postings(shard, term) for shard in self.shards)
+            frequencies.append(sum(len(postings[0]) for postings in found if postings is not None))
+        if not all(frequencies):
+            return empty
+        idf = [np.log1p((self.n_docs - df + 0.5) / (df + 0.5)) for df in frequencies]
+
+        ids, scores = [], []
+        for shard in self.shards:
+            postings = [self._postings(shard, term) for term in terms]
+            if any(p is None for p in postings):
+                continue
+            docs = postings[0][0]
+            for other, _ in postings[1:]:
+                docs = np.intersect1d(docs, other, assume_unique=True)
+            if len(docs) == 0:
+                continue
+            norm = k1 * (1 - b + b * shard['lengths'][docs] / self.avgdl)
+            score = np.zeros(len(docs))
+            for weight, (term_docs, tfs) in zip(idf, postings):
+                tf = tfs[np.searchsorted(term_docs, docs)]
+                score += weight * tf * (k1 + 1) / (tf + norm)
+            ids.append(shard['ids'][docs])
+            scores.append(score)
+        if not ids:
+            return empty
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        order = np.lexsort((ids, -scores))
+        return ids[order], scores[order]
+
+
+def _index_version(index_dir):
+    # The directory is part of the version, so results memoized for one
+    # index are never served for another
+    return os.path.abspath(index_dir), os.stat(os.path.join(index_dir, MANIFEST)).st_mtime_ns
+
+
+def open_text_index(index_dir=TEXT_INDEX_PATH):
+    """The ``FullTextIndex`` in ``index_dir``, or None if none was built.
+
+    Loaded once per build and shared by all sessions.
+    """
+    index_dir = os.path.abspath(index_dir)
+    try:
+        version = _index_version(index_dir)
+    except FileNotFoundError:
+        return None
+    with _lock:
+        cached = _opened.get(index_dir)
+        if cached is not None and cached.version == version:
+            return cached
+    index = FullTextIndex.load(index_dir)
+    with _lock:
+        _opened[index_dir] = index
+    return index
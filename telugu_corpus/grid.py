@@ -0,0 +1,80 @@
+"""Server-side row model for the interactive data table.
+
+Instead of shipping the whole selection to the browser, the dashboard asks
+for one page window at a time.  Sorting and column filters are applied here
+on row positions (category codes for the categorical columns, a single
+column otherwise) and only the rows of the visible page are materialized.
+"""
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+def _column_filter(df, rows, col, text):
+    """Keep the rows whose ``col`` contains ``text`` (case-insensitive)."""
+    text = text.strip().casefold()
+    if not text:
+        return rows
+    series = df[col]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Match the (few) categories once, then compare integer codes
+        categories = series.cat.categories.astype(str)
+        allowed = np.flatnonzero([text in c.casefold() for c in categories])
+        return rows[np.isin(series.cat.codes.to_numpy()[rows], allowed)]
+    values = series.take(rows)
+    matches = values.astype(str).str.casefold().str.contains(text, regex=False) & values.notna()
+    return rows[matches.fillna(False).to_numpy(dtype=bool)]
+
+
+def _sort(df, rows, col, ascending):
+    series = df[col]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categories are in lexical order, so sorting codes sorts values;
+        # missing values (code -1) go last like with sort_values
+        codes = series.cat.codes.to_numpy()[rows].astype(np.int64)
+        if ascending:
+            codes[codes < 0] = len(series.cat.categories)
+            order = np.argsort(codes, kind="stable")
+        else:
+            order = np.argsort(-codes, kind="stable")
+        return rows[order]
+    ordered = series.take(rows).reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last")
+    return rows[ordered.index.to_numpy()]
+
+
+def order_rows(df, rows, sort_by=None, ascending=True, column_filters=None):
+    """Apply column filters and sorting to the row positions ``rows``.
+
+    ``column_filters`` maps column names to case-insensitive substrings.
+    """
+    rows = np.asarray(rows)
+    for col, text in (column_filters or {}).items():
+        if text:
+            rows = _column_filter(df, rows, col, text)
+    if sort_by:
+        rows = _sort(df, rows, sort_by, ascending)
+    return rows
+
+
+def page_window(df, rows, page=1, page_size=50, sort_by=None, ascending=True, column_filters=None):
+    """Return ``(page_df, total)`` for one page of ``df.iloc[rows]``.
+
+    ``total`` is the number of rows after column filters, for the pager.
+    """
+    rows = order_rows(df, rows, sort_by, ascending, column_filters)
+    start = (max(page, 1) - 1) * page_size
+    return df.iloc[rows[start:start + page_size]], len(rows)
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def update_selection(selected_ids, page_ids, page_selected_ids):
+    """Merge the grid's selection for one page into the tracked row IDs.
+
+    Rows of the current page take their state from the grid; selections on
+    other pages are kept untouched.
+    """
+    return (set(selected_ids) - set(page_ids)) | set(page_selected_ids)
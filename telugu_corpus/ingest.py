@@ -0,0 +1,140 @@
+"""Streaming ingest of uploaded corpus CSVs.
+
+An upload is read in bounded chunks of ``CHUNK_ROWS`` rows.  The first
+chunk is checked against the expected columns and dtypes, so a wrong file
+fails before the rest of it is read, and every later chunk is checked the
+same way.  Dates are parsed with the format inferred from the first chunk
+(see ``telugu_corpus.dates``).  Each chunk is converted to an Arrow record
+batch with a fixed schema and appended to a sidecar file (see
+``telugu_corpus.sidecar``), so at most one chunk of raw text and one chunk of parsed values are held in
+memory at a time; the finished sidecar is then memory-mapped.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from telugu_corpus.dates import DateParser
+
+EXPECTED_COLUMNS = ['ID', 'Title', 'Type', 'Author', 'Publisher', 'Magazine', 'Published date', 'Vol', 'Link', 'STATUS']
+
+CHUNK_ROWS = 100_000
+
+# Arrow type of each known column; any extra column is kept as a string
+COLUMN_TYPES = {
+    'ID': pa.int64(),
+    'Published date': pa.timestamp('us'),
+    'STATUS': pa.bool_(),
+    'Year': pa.int16(),
+    'Month': pa.int8(),
+}
+
+_BOOLEANS = {'true': True, 'false': False, '1': True, '0': False}
+
+
+class SchemaError(ValueError):
+    """The uploaded CSV does not have the expected columns or values."""
+
+
+def _size(source):
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def _first_bad(values, bad, offset):
+    row = int(bad.to_numpy().nonzero()[0][0])
+    return f"row {offset + row + 1}: {values.iloc[row]!r}"
+
+
+def _parse_chunk(chunk, offset, dates):
+    """Validate a raw chunk of strings and convert it to its stored dtypes.
+
+    ``offset`` is the number of data rows before the chunk, for messages;
+    ``dates`` is the ``DateParser`` shared by all chunks of the file.
+    """
+    missing = [col for col in EXPECTED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise SchemaError(f"Missing columns: {', '.join(missing)}")
+
+    ids = pd.to_numeric(chunk['ID'], errors='coerce')
+    bad = ids.isna() | (ids % 1 != 0)
+    if bad.any():
+        raise SchemaError(f"ID must be an integer ({_first_bad(chunk['ID'], bad, offset)})")
+    chunk['ID'] = ids.astype('int64')
+
+    status = chunk['STATUS'].str.strip().str.lower().map(_BOOLEANS)
+    bad = status.isna() & chunk['STATUS'].notna()
+    if bad.any():
+        raise SchemaError(f"STATUS must be True or False ({_first_bad(chunk['STATUS'], bad, offset)})")
+    chunk['STATUS'] = status.astype('boolean')
+
+    keys = dates.parse(chunk['Published date'])
+    for col in keys.columns:
+        chunk[col] = keys[col]
+    chunk['Date precision'] = chunk['Date precision'].astype(object)
+    return chunk
+
+
+def _schema(columns):
+    return pa.schema([(col, COLUMN_TYPES.get(col, pa.string())) for col in columns])
+
+
+def read_batches(source, chunk_rows=CHUNK_ROWS, progress=None):
+    """Yield validated Arrow record batches read from the CSV ``source``.
+
+    ``source`` is a seekable binary file object; ``progress(done, total)``
+    is called with the bytes consumed so far after every chunk.  Raises
+    ``SchemaError`` on the first chunk that does not fit the schema.
+    """
+    total = _size(source)
+    source.seek(0)
+    try:
+        reader = pd.read_csv(source, chunksize=chunk_rows, dtype=str)
+        schema = None
+        offset = 0
+        dates = DateParser()
+        with reader:
+            for chunk in reader:
+                if chunk.empty:
+                    continue
+                chunk = _parse_chunk(chunk, offset, dates)
+                if schema is None:
+                    schema = _schema(chunk.columns)
+                elif list(chunk.columns) != schema.names:
+                    raise SchemaError("Columns change within the file")
+                yield pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+                offset += len(chunk)
+                if progress is not None:
+                    progress(min(source.tell(), total), total)
+    except pd.errors.EmptyDataError:
+        raise SchemaError("The file is empty") from None
+    except pd.errors.ParserError as e:
+        raise SchemaError(f"Not a valid CSV file: {e}") from None
+    if schema is None:
+        raise SchemaError("The file has no data rows")
+
+
+def ingest_csv(source, dest, chunk_rows=CHUNK_ROWS, progress=None):
+    """Stream the CSV ``source`` into the Arrow sidecar ``dest``.
+
+    Nothing is left at ``dest`` if the file fails validation.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    tmp = dest + ".tmp"
+    writer = None
+    try:
+        with pa.OSFile(tmp, "wb") as sink:
+            for batch in read_batches(source, chunk_rows, progress):
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, batch.schema)
+                writer.write_batch(batch)
+            writer.close()
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, dest)
+    return dest
@@ -0,0 +1,318 @@
+"""Link health: concurrent checks of the ``Link`` URLs with a persistent cache.
+
+Checking the links of the whole corpus one request at a time would take
+hours, so ``LinkChecker`` runs the requests on an asyncio event loop:
+
+* ``CONCURRENCY`` workers share the links, at most ``PER_HOST`` of them
+  talking to the same host;
+* connections are pooled per host and reused (HTTP/1.1 keep-alive);
+* every request has a ``TIMEOUT``; timeouts, connection errors and server
+  errors (5xx) are retried ``RETRIES`` times with exponential backoff,
+  while results a retry would not change (4xx, redirect loops, malformed
+  responses) are recorded at once;
+* redirects are followed up to ``MAX_REDIRECTS`` times, and a ``HEAD`` the
+  server does not allow is repeated as ``GET``.
+
+Results (status, final URL, error, checked-at time) go into a SQLite
+``LinkCache`` keyed by URL, and ``refresh_links`` only re-checks links
+whose result is older than the TTL.  The Q&A page and the data table only
+read the cache (``link_status``); the checks run from the command line::
+
+    python -m telugu_corpus links
+"""
+import asyncio
+import os
+import sqlite3
+import ssl
+import time
+from collections import namedtuple
+from urllib.parse import urljoin, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from telugu_corpus.memo import memoized
+
+LINK_CACHE_PATH = "link_health.sqlite"
+
+CONCURRENCY = 64
+PER_HOST = 4
+TIMEOUT = 10.0
+RETRIES = 2
+BACKOFF = 0.5
+MAX_REDIRECTS = 5
+TTL = 7 * 24 * 3600
+
+# Results written to the cache per transaction while checking
+BATCH = 500
+
+USER_AGENT = "telugu-corpus-link-checker/1.0"
+
+# Per-row link states (``link_status``); -1 is a record without a link
+WORKING, BROKEN, UNCHECKED = 0, 1, 2
+LINK_STATES = ["Working", "Broken", "Unchecked"]
+
+LinkResult = namedtuple("LinkResult", "url status final_url error checked_at")
+
+_COLUMNS = ["url", "status", "final_url", "error", "checked_at"]
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    status INTEGER,
+    final_url TEXT,
+    error TEXT,
+    checked_at REAL NOT NULL
+)
+"""
+
+
+async def _read_head(reader):
+    """Status line and headers of a response: ``(version, status, headers)``."""
+    line = await reader.readuntil(b"\r\n")
+    version, status = line.decode("latin-1").split(None, 2)[:2]
+    headers = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            return version, int(status), headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+
+class LinkChecker:
+    """Checks URLs concurrently over pooled connections (see module docstring)."""
+
+    def __init__(self, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT,
+                 retries=RETRIES, backoff=BACKOFF, max_redirects=MAX_REDIRECTS):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_redirects = max_redirects
+        self._idle = {}  # (scheme, host, port) -> idle (reader, writer) pairs
+        self._hosts = {}  # host -> semaphore
+        self._ssl = None
+
+    async def _connect(self, origin):
+        idle = self._idle.get(origin)
+        if idle:
+            return idle.pop(), True
+        scheme, host, port = origin
+        if scheme == "https" and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        ssl_context = self._ssl if scheme == "https" else None
+        return await asyncio.open_connection(host, port, ssl=ssl_context), False
+
+    def _close_idle(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+    async def _request(self, method, url):
+        """Send one request and read the response head: ``(status, headers)``."""
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        # A GET body is not read, so its connection cannot be reused
+        keep_alive = method == "HEAD"
+        request = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+
+        (reader, writer), reused = await self._connect(origin)
+        try:
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+            version, status, headers = await _read_head(reader)
+        except (OSError, asyncio.IncompleteReadError):
+            writer.close()
+            if reused:
+                # The server dropped an idle pooled connection; use another
+                return await self._request(method, url)
+            raise
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive and version == "HTTP/1.1" and headers.get("connection", "").lower() != "close":
+            self._idle.setdefault(origin, []).append((reader, writer))
+        else:
+            writer.close()
+        return status, headers
+
+    async def _fetch(self, url):
+        """Follow redirects from ``url``: ``(status, final url)``."""
+        method = "HEAD"
+        redirects = 0
+        while True:
+            status, headers = await asyncio.wait_for(self._request(method, url), self.timeout)
+            if method == "HEAD" and status in (405, 501):
+                method = "GET"
+                continue
+            location = headers.get("location")
+            if not (300 <= status < 400 and location):
+                return status, url
+            if redirects == self.max_redirects:
+                raise ValueError(f"more than {self.max_redirects} redirects")
+            redirects += 1
+            url = urljoin(url, location)
+            if urlsplit(url).scheme not in ("http", "https"):
+                raise ValueError(f"redirect to unsupported URL {url}")
+
+    async def check(self, url):
+        """Check one URL; returns a ``LinkResult``."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return LinkResult(url, None, None, "unsupported URL", time.time())
+
+        status = final_url = error = None
+        host = self._hosts.setdefault(parts.hostname, asyncio.Semaphore(self.per_host))
+        async with host:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    status, final_url = await self._fetch(url)
+                    error = None
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    status, final_url, error = None, None, _error(e)
+                    continue
+                except Exception as e:
+                    # Redirect loops, unsupported redirects and malformed or
+                    # oversized responses would fail the same way again; one
+                    # bad host must not abort the other checks either
+                    status, final_url, error = None, None, _error(e)
+                    break
+                if status < 500:
+                    break
+        return LinkResult(url, status, final_url, error, time.time())
+
+    async def check_all(self, urls, on_result=None):
+        """Check every URL of ``urls``; ``on_result`` sees each result as it arrives."""
+        pending = iter(urls)
+        results = []
+
+        async def worker():
+            for url in pending:
+                result = await self.check(url)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            self._close_idle()
+        return results
+
+
+class LinkCache:
+    """Link check results keyed by URL, in a SQLite file."""
+
+    def __init__(self, path=LINK_CACHE_PATH):
+        self.path = path
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute(_SCHEMA)
+        return connection
+
+    def version(self):
+        """Changes whenever results are stored (None without a cache file)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def results(self):
+        """Every stored result, as a frame with ``LinkResult`` columns."""
+        if not os.path.exists(self.path):
+            return pd.DataFrame({col: [] for col in _COLUMNS})
+        connection = self._connect()
+        try:
+            return pd.read_sql_query(f"SELECT {', '.join(_COLUMNS)} FROM links", connection)
+        finally:
+            connection.close()
+
+    def stale(self, urls, ttl=TTL, now=None):
+        """The URLs of ``urls`` without a result younger than ``ttl`` seconds."""
+        now = time.time() if now is None else now
+        known = self.results()
+        fresh = set(known['url'][known['checked_at'] >= now - ttl])
+        return [url for url in urls if url not in fresh]
+
+    def store(self, results):
+        if not results:
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO links ({', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                    [tuple(result) for result in results],
+                )
+        finally:
+            connection.close()
+
+
+def refresh_links(urls, cache=None, ttl=TTL, progress=None, **options):
+    """Check the ``urls`` without a fresh cached result; return how many.
+
+    Results are stored every ``BATCH`` links, so an interrupted run keeps
+    its progress.  ``progress(done, total)`` is called after each batch;
+    ``options`` are passed to ``LinkChecker``.
+    """
+    cache = cache or LinkCache()
+    stale = cache.stale(list(dict.fromkeys(urls)), ttl)
+    batch = []
+    done = 0
+
+    def on_result(result):
+        nonlocal done
+        batch.append(result)
+        done += 1
+        if len(batch) >= BATCH:
+            cache.store(batch)
+            batch.clear()
+            if progress is not None:
+                progress(done, len(stale))
+
+    try:
+        asyncio.run(LinkChecker(**options).check_all(stale, on_result))
+    finally:
+        cache.store(batch)
+    if progress is not None:
+        progress(done, len(stale))
+    return len(stale)
+
+
+def _link_states(df, cache):
+    link_codes, urls = pd.factorize(df['Link'])
+    results = cache.results().drop_duplicates('url').set_index('url').reindex(pd.Index(urls, dtype=object))
+    status = results['status'].to_numpy(dtype=np.float64, na_value=np.nan)
+    states = np.where(results['checked_at'].isna().to_numpy(), UNCHECKED,
+                      np.where((status >= 200) & (status < 400), WORKING, BROKEN)).astype(np.int8)
+    return np.append(states, np.int8(-1))[link_codes]  # code -1 picks the trailing -1
+
+
+def link_status(df, cache=None):
+    """Per-row link state of a cached corpus frame, read from the cache.
+
+    Returns int8 codes: ``WORKING``, ``BROKEN``, ``UNCHECKED`` (the link was
+    never checked) or -1 (no link).  Memoized per cache version.
+    """
+    cache = cache or LinkCache()
+    return memoized(df, ('link_status', os.path.abspath(cache.path), cache.version()),
+                    lambda: _link_states(df, cache))
@@ -0,0 +1,200 @@
+"""Shared corpus loading for the dashboard pages.
+
+The corpus is parsed at most once per process.  Parsed frames are kept in a
+process-wide cache keyed by a fingerprint of their source: the file's mtime
+and size for corpora on disk, or the content hash for uploaded files.  The
+cached frames are shared between sessions and must be treated as read-only.
+
+CSVs are not parsed directly: they are ingested into an Arrow sidecar (see
+``telugu_corpus.sidecar``) which is then memory-mapped, and the cached
+value is the compact frame from ``telugu_corpus.frame.compact_frame``.
+Uploads are streamed into their sidecar in chunks by
+``telugu_corpus.ingest``, and corpora kept as many CSV shards are parsed
+in parallel by ``telugu_corpus.shards``.
+
+Structures derived from a corpus file are read from the artifact store
+(see ``telugu_corpus.artifacts``) when ``python -m telugu_corpus build``
+has precomputed them, and built in process otherwise.  A corpus with a
+delta merged in (see ``telugu_corpus.delta``) is cached as a new version
+together with its incrementally updated structures (``add_version``).
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+
+from telugu_corpus import ingest, profiling, shards, sidecar
+from telugu_corpus.artifacts import STORED_ARTIFACTS, load_artifact
+from telugu_corpus.frame import arrow_types_mapper, compact_frame
+
+DEFAULT_CORPUS_PATH = "sorted_data[1].csv"
+
+# Number of parsed corpora kept alive per process (existing file + uploads)
+MAX_CACHED_CORPORA = 4
+
+_cache = OrderedDict()
+_derived = {}
+_lock = threading.RLock()
+
+
+def file_fingerprint(path):
+    """Fingerprint a corpus file by its absolute path, mtime and size."""
+    stat = os.stat(path)
+    return ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def upload_fingerprint(uploaded_file):
+    """Fingerprint an uploaded file by the hash of its contents."""
+    h = hashlib.sha256()
+    uploaded_file.seek(0)
+    for block in iter(lambda: uploaded_file.read(1 << 20), b""):
+        h.update(block)
+    uploaded_file.seek(0)
+    return ("upload", h.hexdigest())
+
+
+def _load_upload(uploaded_file, digest, progress=None):
+    dest = sidecar.upload_sidecar_path(digest)
+    if not os.path.exists(dest):
+        try:
+            ingest.ingest_csv(uploaded_file, dest, progress=progress)
+        except OSError:
+            batches = list(ingest.read_batches(uploaded_file, progress=progress))
+            return pa.Table.from_batches(batches).to_pandas(types_mapper=arrow_types_mapper)
+    return sidecar.read_sidecar(dest)
+
+
+def _cached(key, parse):
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            profiling.count_cache("corpus", True)
+            return _cache[key]
+        profiling.count_cache("corpus", False)
+
+        # A file that changed on disk invalidates its previous entries
+        if key[0] in ("file", "shards"):
+            for stale in [k for k in _cache if k[0] == key[0] and k[1] == key[1]]:
+                del _cache[stale]
+                _derived.pop(stale, None)
+
+        return _store(key, compact_frame(parse()), {})
+
+
+def _store(key, df, artifacts):
+    _cache[key] = df
+    _derived[key] = artifacts
+    while len(_cache) > MAX_CACHED_CORPORA:
+        evicted, _ = _cache.popitem(last=False)
+        _derived.pop(evicted, None)
+    return df
+
+
+def add_version(key, df, artifacts, replaces=None):
+    """Cache ``df`` as corpus version ``key`` with derived structures already built.
+
+    ``artifacts`` maps structure names to their values (see ``derived``).
+    The version ``replaces`` is dropped: sessions asking for it learn that
+    it is gone and move to the new one.
+    """
+    with _lock:
+        if replaces is not None:
+            _cache.pop(replaces, None)
+            _derived.pop(replaces, None)
+        return _store(key, df, dict(artifacts))
+
+
+def corpus_key(df):
+    """Return the cache key of a cached corpus frame, or None."""
+    with _lock:
+        return next((k for k, v in _cache.items() if v is df), None)
+
+
+def cached_corpus(key):
+    """Return the cached corpus for ``key``, reloading files that are unchanged.
+
+    Returns None when the corpus is no longer available in that version
+    (an evicted upload, or a file that changed on disk).
+    """
+    with _lock:
+        if key in _cache:
+            return _cache[key]
+    try:
+        if key[0] == "file" and file_fingerprint(key[1]) == key:
+            return load_corpus(key[1])
+        if key[0] == "shards" and shards.shards_fingerprint(key[1]) == key:
+            return load_sharded_corpus(key[1])
+    except OSError:
+        pass
+    return None
+
+
+def derived(df, name, build):
+    """Return the structure ``name`` derived from a cached corpus frame.
+
+    ``build(df)`` runs once per corpus version; the result is shared by all
+    sessions and dropped together with the corpus when it is invalidated.
+    Frames that are not in the corpus cache get a fresh, uncached build.
+    """
+    with _lock:
+        key = next((k for k, v in _cache.items() if v is df), None)
+        if key is None:
+            return build(df)
+        artifacts = _derived[key]
+        profiling.count_cache(f"derived.{name}", name in artifacts)
+        if name not in artifacts:
+            stored = load_artifact(key, name)
+            if name in STORED_ARTIFACTS:
+                profiling.count_cache("artifacts", stored is not None)
+            artifacts[name] = build(df) if stored is None else stored
+        return artifacts[name]
+
+
+def existing(df, name):
+    """The structure ``name`` of a cached corpus frame if built or stored, else None."""
+    with _lock:
+        key = next((k for k, v in _cache.items() if v is df), None)
+        if key is None:
+            return None
+        artifacts = _derived[key]
+        if name not in artifacts:
+            stored = load_artifact(key, name)
+            if stored is None:
+                return None
+            artifacts[name] = stored
+        return artifacts[name]
+
+
+def load_corpus(path=DEFAULT_CORPUS_PATH):
+    """Return the corpus stored at ``path``, parsing it only when it changed."""
+    return _cached(file_fingerprint(path), lambda: sidecar.load_csv_via_sidecar(path))
+
+
+def load_sharded_corpus(source, workers=None):
+    """Return the corpus kept as the CSV shards of a directory or glob.
+
+    Shards are parsed in a process pool of ``workers`` processes when any
+    of them changed.  Raises ``telugu_corpus.shards.ShardError`` naming
+    every shard that does not fit the schema.
+    """
+    return _cached(shards.shards_fingerprint(source), lambda: shards.load_shards(source, workers))
+
+
+def load_uploaded_corpus(uploaded_file, progress=None):
+    """Return the corpus from a Streamlit ``UploadedFile``, cached by content.
+
+    A new upload is streamed in chunks; ``progress(done, total)`` reports the
+    bytes read.  Raises ``telugu_corpus.ingest.SchemaError`` when the file
+    does not have the expected columns and values.
+    """
+    key = upload_fingerprint(uploaded_file)
+    return _cached(key, lambda: _load_upload(uploaded_file, key[1], progress))
+
+
+def clear_cache():
+    """Drop every cached corpus."""
+    with _lock:
+        _cache.clear()
+        _derived.clear()
@@ -0,0 +1,78 @@
+"""Memoization of per-selection results keyed by a filter-state fingerprint.
+
+Results that only depend on the corpus and the filter state (selected row
+positions, facet counts, chart figures, ...) are kept in a small LRU that
+lives with the cached corpus, so a rerun, or another session, with the same
+filter state reuses them instead of recomputing.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from telugu_corpus import profiling
+from telugu_corpus.loader import derived
+
+MEMO_SIZE = 128
+
+
+def _feed(h, part):
+    if isinstance(part, np.ndarray):
+        h.update(b"ndarray")
+        h.update(str(part.dtype).encode())
+        h.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(part, dict):
+        h.update(b"dict")
+        for key in sorted(part, key=repr):
+            _feed(h, key)
+            _feed(h, part[key])
+    elif isinstance(part, (list, tuple)):
+        h.update(b"seq%d" % len(part))
+        for item in part:
+            _feed(h, item)
+    else:
+        h.update(repr(part).encode())
+    h.update(b"\x00")
+
+
+def fingerprint(*parts):
+    """Stable short hash of filter-state parts (dicts, tuples, arrays, ...)."""
+    h = hashlib.sha1()
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()[:16]
+
+
+class LRUMemo:
+    """Thread-safe LRU of computed values."""
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        # Counted per key family, e.g. memo.search or memo.chart_figures
+        name = f"memo.{key[0] if isinstance(key, tuple) else key}"
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                profiling.count_cache(name, True)
+                return self._values[key]
+        profiling.count_cache(name, False)
+        value = build()
+        with self._lock:
+            self._values[key] = value
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+
+def memoized(df, key, build):
+    """Return ``build()`` memoized under ``key`` for the corpus frame ``df``.
+
+    ``key`` is usually ``(name, fingerprint(...))``.  Values are shared
+    between sessions and must not be mutated.
+    """
+    return derived(df, "memo", lambda _df: LRUMemo()).get_or_build(key, build)
@@ -0,0 +1,181 @@
+"""Per-rerun stage timings for the dashboard pages.
+
+A page starts a ``RerunProfile`` at the top of each script run and wraps
+its stages in ``stage(name)``; the profile records the wall time and the
+change in process memory (RSS) of every stage, plus the hits and misses of
+the corpus cache, the derived artifacts and the memo LRU during the run.
+Recording costs a few microseconds per stage, so it is always on.
+
+Finished profiles can be shown in the page's debug panel and, when
+``TELUGU_CORPUS_PROFILE_LOG`` names a file, are appended to it as JSON
+lines.  Outside a profiled run, ``stage`` does nothing.
+"""
+import contextlib
+import contextvars
+import datetime
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+PROFILE_LOG_ENV = "TELUGU_CORPUS_PROFILE_LOG"
+
+_current = contextvars.ContextVar("telugu_corpus_profile", default=None)
+
+# Process-wide cache counters: name -> [hits, misses]
+_totals = {}
+_lock = threading.Lock()
+
+
+def _rss():
+    """Resident set size of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _delta(before, after):
+    return None if before is None or after is None else after - before
+
+
+class RerunProfile:
+    """Stage timings, memory deltas and cache counts of one script run."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = datetime.datetime.now(datetime.timezone.utc)
+        self.stages = []
+        self.cache = {}
+        self.total_ms = None
+        self.rss_delta = None
+        self._start = time.perf_counter()
+        self._rss = _rss()
+
+    def add_stage(self, name, ms, rss_delta):
+        self.stages.append({'stage': name, 'ms': ms, 'rss_delta_bytes': rss_delta})
+
+    def count(self, name, hit):
+        counts = self.cache.setdefault(name, {'hits': 0, 'misses': 0})
+        counts['hits' if hit else 'misses'] += 1
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self._start) * 1e3
+        self.rss_delta = _delta(self._rss, _rss())
+        return self
+
+    def to_record(self):
+        """The profile as a JSON-serializable dict (one log line)."""
+        return {
+            'label': self.label,
+            'started': self.started.isoformat(),
+            'total_ms': None if self.total_ms is None else round(self.total_ms, 3),
+            'rss_bytes': _rss(),
+            'rss_delta_bytes': self.rss_delta,
+            'stages': [{**s, 'ms': round(s['ms'], 3)} for s in self.stages],
+            'cache': self.cache,
+        }
+
+    def stage_frame(self):
+        """Stages as a frame with ``Stage``, ``ms`` and ``Memory delta (MB)``."""
+        return pd.DataFrame({
+            'Stage': [s['stage'] for s in self.stages],
+            'ms': [round(s['ms'], 2) for s in self.stages],
+            'Memory delta (MB)': [
+                None if s['rss_delta_bytes'] is None else round(s['rss_delta_bytes'] / 2 ** 20, 2)
+                for s in self.stages
+            ],
+        })
+
+    def cache_frame(self):
+        """Cache hits and misses of this run, one row per cache."""
+        return pd.DataFrame(
+            [(name, c['hits'], c['misses']) for name, c in sorted(self.cache.items())],
+            columns=['Cache', 'Hits', 'Misses'],
+        )
+
+
+def current():
+    """The profile of the running script, or None."""
+    return _current.get()
+
+
+def start(label):
+    """Start profiling a script run, replacing any unfinished profile."""
+    profile = RerunProfile(label)
+    _current.set(profile)
+    return profile
+
+
+def finish(log_path=None):
+    """Finish the current profile, append it to the log and return it.
+
+    ``log_path`` defaults to the ``TELUGU_CORPUS_PROFILE_LOG`` variable.
+    """
+    profile = _current.get()
+    if profile is None:
+        return None
+    _current.set(None)
+    profile.finish()
+    log_path = log_path or os.environ.get(PROFILE_LOG_ENV)
+    if log_path:
+        append_log(profile.to_record(), log_path)
+    return profile
+
+
+@contextlib.contextmanager
+def profiled(label):
+    """Profile the block unless it already runs inside a profiled run.
+
+    Used for fragments, which rerun on their own or as part of the page.
+    """
+    if _current.get() is not None:
+        yield _current.get()
+        return
+    profile = start(label)
+    try:
+        yield profile
+    finally:
+        finish()
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time the block as stage ``name`` of the current profile, if any."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    rss = _rss()
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_stage(name, (time.perf_counter() - start_time) * 1e3, _delta(rss, _rss()))
+
+
+def count_cache(name, hit):
+    """Record a hit or miss of cache ``name`` (process totals and current run)."""
+    with _lock:
+        counts = _totals.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+    profile = _current.get()
+    if profile is not None:
+        profile.count(name, hit)
+
+
+def cache_totals():
+    """Process-wide cache hits and misses since start, one row per cache."""
+    with _lock:
+        rows = [(name, hits, misses) for name, (hits, misses) in sorted(_totals.items())]
+    return pd.DataFrame(rows, columns=['Cache', 'Hits', 'Misses'])
+
+
+def append_log(record, path):
+    """Append ``record`` to the JSON-lines file ``path``."""
+    line = json.dumps(record, ensure_ascii=False)
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
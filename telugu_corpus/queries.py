@@ -0,0 +1,335 @@
+"""Declarative query layer for the Q&A page.
+
+A question is a ``Query``: an optional filter on precomputed row flags, an
+optional grouping column, an aggregate, a ``having`` threshold, an order,
+a top-k cut and the shape of the answer.  Queries run on integer codes and
+boolean arrays derived once per corpus version (``QueryColumns``), so no
+question re-parses dates or re-scans the text columns.
+
+Answers are memoized per corpus by question and a fingerprint of the
+selected rows (see ``answer``).
+"""
+import copy
+import operator
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from telugu_corpus.duplicates import duplicate_index
+from telugu_corpus.links import BROKEN, LINK_CACHE_PATH, UNCHECKED, WORKING, LinkCache, link_status
+from telugu_corpus.loader import derived
+from telugu_corpus.memo import fingerprint, memoized
+from telugu_corpus.transliterate import normalize
+
+STORY_MARKER = "కథ"
+POEM_MARKER = "కవిత"
+
+CODED_COLUMNS = ["Type", "Author", "Publisher", "Magazine", "Vol", "Title"]
+MISSING_COLUMNS = ['Author', 'Title', 'Type', 'Published date', 'Publisher', 'Magazine', 'Vol', 'Link']
+
+_OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int32), series.cat.categories
+    codes, uniques = pd.factorize(series)
+    return codes.astype(np.int32), pd.Index(uniques)
+
+
+def _extended_codes(codes, labels, series, rows):
+    """``codes`` of ``series`` after its ``rows`` changed, new values appended to ``labels``."""
+    local, uniques = pd.factorize(series.iloc[rows])
+    # Scan the labels for the few changed values rather than hashing every label
+    found = pc.index_in(pa.array(labels.array), value_set=pa.array(uniques))
+    at = np.flatnonzero(found.is_valid().to_numpy(zero_copy_only=False))
+    positions = np.full(len(uniques), -1, dtype=np.int64)
+    positions[found.fill_null(0).to_numpy()[at]] = at
+    new = positions < 0
+    positions[new] = len(labels) + np.arange(new.sum())
+    codes = _extended(codes, len(series), rows, np.append(positions, -1)[local], -1)
+    return codes, labels.append(pd.Index(uniques)[new])
+
+
+def _extended(values, n_rows, rows, changed, fill):
+    """``values`` grown to ``n_rows`` with ``fill``, then ``changed`` at ``rows``."""
+    values = np.concatenate([values, np.full(n_rows - len(values), fill, dtype=values.dtype)])
+    values[rows] = changed
+    return values
+
+
+class QueryColumns:
+    """Per-corpus integer codes and row flags shared by every question."""
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.codes = {}
+        self.labels = {}
+        for col in CODED_COLUMNS:
+            self.codes[col], self.labels[col] = _codes(df[col])
+
+        self.year = df['Year'].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.decade = df['Decade'].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.flags = self._row_flags(df, self.codes['Type'], self.labels['Type'])
+        self._set_missing()
+
+    @classmethod
+    def _row_flags(cls, df, type_codes, type_labels):
+        # Text tests run once per distinct Type, in normalized form (so other
+        # encodings of the markers match too), then fan out through codes
+        types = pd.Index([normalize(str(t)) for t in type_labels], dtype=object)
+        return {
+            'is_story': cls._by_category(type_codes, types.str.contains(normalize(STORY_MARKER), regex=False)),
+            'is_poem': cls._by_category(type_codes, types.str.contains(normalize(POEM_MARKER), regex=False)),
+            'has_link': df['Link'].notna().to_numpy(),
+            'has_http_link': df['Link'].str.startswith('http').fillna(False).to_numpy(dtype=bool),
+            'active': df['STATUS'].eq(True).fillna(False).to_numpy(dtype=bool),
+            'inactive': df['STATUS'].eq(False).fillna(False).to_numpy(dtype=bool),
+            'partial_date': df['Date precision'].isin(['month', 'year']).to_numpy(),
+            'invalid_date': df['Date precision'].eq('invalid').fillna(False).to_numpy(dtype=bool),
+        }
+
+    def _set_missing(self):
+        self.missing = {col: self.codes[col] < 0 for col in CODED_COLUMNS}
+        # Partial dates (year or year-month only) still count as present
+        self.missing['Published date'] = np.isnan(self.year)
+        self.missing['Link'] = ~self.flags['has_link']
+
+    def updated(self, df, change):
+        """The columns of ``df``, the corpus after ``change``, reusing these.
+
+        Only the changed rows are coded and flagged again.  Keys built on
+        demand (years, decades, derived keys) are rebuilt when next used.
+        """
+        cols = copy.copy(self)
+        cols.n_rows = n_rows = len(df)
+        rows = change.rows
+        cols.codes, cols.labels = {}, {}
+        for col in CODED_COLUMNS:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                cols.codes[col], cols.labels[col] = _codes(df[col])
+            else:
+                cols.codes[col], cols.labels[col] = _extended_codes(self.codes[col], self.labels[col], df[col], rows)
+
+        changed = df.iloc[rows]
+        cols.year = _extended(self.year, n_rows, rows, changed['Year'].to_numpy(dtype=np.float64, na_value=np.nan), np.nan)
+        cols.decade = _extended(self.decade, n_rows, rows, changed['Decade'].to_numpy(dtype=np.float64, na_value=np.nan), np.nan)
+        flags = self._row_flags(changed, cols.codes['Type'][rows], cols.labels['Type'])
+        cols.flags = {name: _extended(self.flags[name], n_rows, rows, flags[name], False) for name in flags}
+        cols._set_missing()
+        return cols
+
+    @staticmethod
+    def _by_category(codes, category_flags):
+        lookup = np.append(np.asarray(category_flags, dtype=bool), False)
+        return lookup[codes]  # code -1 picks the trailing False
+
+    def key(self, name):
+        """Group key array and labels for ``name`` (a column, year or decade)."""
+        if name in ('Year', 'Decade') and name not in self.codes:
+            values = self.year if name == 'Year' else self.decade
+            valid = ~np.isnan(values)
+            uniques, codes = np.unique(values[valid], return_inverse=True)
+            full = np.full(self.n_rows, -1, dtype=np.int32)
+            full[valid] = codes
+            self.codes[name], self.labels[name] = full, pd.Index(uniques.astype(np.int64))
+        return self.codes[name], self.labels[name]
+
+
+def query_columns(df):
+    """Return the shared ``QueryColumns`` for a cached corpus frame."""
+    return derived(df, "query_columns", QueryColumns)
+
+
+# Group keys built by their own derived index, added to ``QueryColumns``
+# only when a question uses them
+DERIVED_KEYS = {
+    'Similar titles': lambda df: duplicate_index(df).key(),
+}
+
+
+def _link_cache():
+    # Resolved on each use, as the cache path is relative to the working
+    # directory
+    return LinkCache(os.path.abspath(LINK_CACHE_PATH))
+
+
+def _link_version():
+    cache = _link_cache()
+    return cache.path, cache.version()
+
+
+def _link_flag(state):
+    return lambda df: link_status(df, _link_cache()) == state
+
+
+# Row flags read from state that changes without the corpus (the link
+# cache): name -> (version of that state, flag builder)
+VOLATILE_FLAGS = {
+    'working_link': (_link_version, _link_flag(WORKING)),
+    'broken_link': (_link_version, _link_flag(BROKEN)),
+    'unchecked_link': (_link_version, _link_flag(UNCHECKED)),
+}
+
+
+def _volatile(query):
+    return [name for name in query.where if isinstance(name, str) and name in VOLATILE_FLAGS]
+
+
+def columns_for(df, query, cols=None):
+    """``cols`` (default ``query_columns(df)``) with the keys and flags ``query`` needs.
+
+    Volatile flags are added to a copy: the shared columns outlive the
+    state they are read from and are used by every session at once.
+    """
+    cols = query_columns(df) if cols is None else cols
+    for name in (query.by, query.of):
+        if isinstance(name, str) and name in DERIVED_KEYS and name not in cols.codes:
+            cols.codes[name], cols.labels[name] = DERIVED_KEYS[name](df)
+    volatile = _volatile(query)
+    if volatile:
+        cols = copy.copy(cols)
+        cols.flags = dict(cols.flags)
+        for name in volatile:
+            cols.flags[name] = VOLATILE_FLAGS[name][1](df)
+    return cols
+
+
+class Query:
+    """One Q&A question: filter -> group -> aggregate -> having -> rank -> top-k.
+
+    ``where``      flag names (see ``QueryColumns.flags``) or
+                   ``('year', op, value)`` tuples, all ANDed
+    ``by``         group column; ``None`` aggregates the whole selection
+    ``agg``        ``count``, ``nunique`` (of a column), ``all`` (of a flag),
+                   ``min``/``max`` (of ``year``), ``duplicated`` (of a
+                   column) or ``missing`` (of a list of columns)
+    ``having``     ``(op, value)`` applied to the aggregate of each group
+    ``order``      ``desc``/``asc`` by aggregate, or ``key`` by group label
+    ``answer``     ``table``, ``list`` (group labels), ``value`` (first
+                   label), ``text`` (``template`` with the first label) or
+                   ``scalar`` (a single number for ``missing``)
+    """
+
+    def __init__(self, where=(), by=None, agg="count", of=None, having=None,
+                 order="desc", top=None, answer="table", label="Count", template=None):
+        self.where = where
+        self.by = by
+        self.agg = agg
+        self.of = of
+        self.having = having
+        self.order = order
+        self.top = top
+        self.answer = answer
+        self.label = label
+        self.template = template
+
+    def _rows(self, cols, rows):
+        keep = np.ones(len(rows), dtype=bool)
+        for condition in self.where:
+            if isinstance(condition, str):
+                keep &= cols.flags[condition][rows]
+            else:
+                _, op, value = condition
+                keep &= _OPS[op](cols.year[rows], value)
+        return rows[keep]
+
+    def _scalar(self, cols, rows):
+        if self.agg == "count":
+            return int(len(rows))
+        if self.agg == "nunique":
+            codes = cols.codes[self.of][rows]
+            return int(len(np.unique(codes[codes >= 0])))
+        if self.agg in ("min", "max"):
+            years = cols.year[rows]
+            years = years[~np.isnan(years)]
+            return int(years.max() if self.agg == "max" else years.min())
+        if self.agg == "duplicated":
+            # Missing values count as one value, like Series.duplicated()
+            return int(len(rows) - len(np.unique(cols.codes[self.of][rows])))
+        if self.agg == "missing":
+            if self.answer == "scalar":
+                return int(cols.missing[self.of[0]][rows].sum())
+            return pd.DataFrame({
+                'Column': self.of,
+                'Missing Values': [int(cols.missing[col][rows].sum()) for col in self.of],
+            })
+        raise ValueError(f"Unknown aggregate: {self.agg}")
+
+    def _grouped(self, cols, rows):
+        codes, labels = cols.key(self.by)
+        group = codes[rows]
+        valid = group >= 0
+        counts = np.bincount(group[valid], minlength=len(labels))
+
+        if self.agg == "count":
+            values = counts
+        elif self.agg == "nunique":
+            other = cols.codes[self.of][rows]
+            both = valid & (other >= 0)
+            pairs = np.unique(group[both].astype(np.int64) * max(len(cols.labels[self.of]), 1) + other[both])
+            values = np.bincount(pairs // max(len(cols.labels[self.of]), 1), minlength=len(labels))
+        elif self.agg == "all":
+            failing = valid & ~cols.flags[self.of][rows]
+            values = np.bincount(group[failing], minlength=len(labels)) == 0
+        else:
+            raise ValueError(f"Unknown grouped aggregate: {self.agg}")
+
+        present = counts > 0
+        if self.having is not None:
+            op, threshold = self.having
+            present &= _OPS[op](values, threshold)
+        ids = np.flatnonzero(present)
+
+        if self.order == "desc":
+            ids = ids[np.argsort(-values[ids], kind="stable")]
+        elif self.order == "asc":
+            ids = ids[np.argsort(values[ids], kind="stable")]
+        if self.top is not None:
+            ids = ids[:self.top]
+        return labels[ids], values[ids]
+
+    def run(self, cols, rows):
+        """Answer the query for the row positions ``rows`` of the corpus."""
+        rows = self._rows(cols, np.asarray(rows))
+        if self.by is None:
+            return self._scalar(cols, rows)
+
+        keys, values = self._grouped(cols, rows)
+        if self.answer == "table":
+            return pd.DataFrame({self.by: list(keys), self.label: values})
+        if self.answer == "list":
+            return pd.Series(list(keys), name=self.by)
+        if len(keys) == 0:
+            raise ValueError("No matching records")
+        if self.answer == "value":
+            first = keys[0]
+            return int(first) if self.by in ('Year', 'Decade') else first
+        if self.answer == "text":
+            return self.template.format(keys[0])
+        raise ValueError(f"Unknown answer shape: {self.answer}")
+
+
+def answer(df, rows, question, query):
+    """Run ``query`` on rows of the cached corpus ``df``, memoized.
+
+    The memo key is the question and a fingerprint of ``rows`` (and the
+    version of any volatile flag it reads), so asking the same question
+    again for the same selection is a dictionary lookup.
+    """
+    rows = np.asarray(rows)
+    versions = tuple(VOLATILE_FLAGS[name][0]() for name in _volatile(query))
+    return memoized(
+        df,
+        ('qa', question, fingerprint(rows), versions),
+        lambda: query.run(columns_for(df, query), rows),
+    )
@@ -0,0 +1,62 @@
+"""The questions offered on the Q&A page, as declarative ``Query`` specs.
+
+Kept in the package (rather than in the page script) so the benchmark
+harness and other headless callers can run every question.
+"""
+from telugu_corpus.queries import MISSING_COLUMNS, Query
+
+QUESTIONS = {
+    # 🔹 Author-based
+    "Who wrote the most stories?": Query(by='Author', top=1, answer="text", template="🖋️ Most stories written by: **{}**"),
+    "Top 10 authors by number of works": Query(by='Author', top=10),
+    "Top 5 authors who published poems (కవితలు)": Query(where=['is_poem'], by='Author', top=5, label="Poems"),
+    "Which authors published in more than 5 magazines?": Query(by='Author', agg="nunique", of='Magazine', having=(">", 5), order="key", label="Magazines"),
+    "Top 10 authors?": Query(by='Author', top=10),
+
+    # 🔹 Type-based
+    "Which content type is most common?": Query(by='Type', top=1, answer="text", template="📚 Most common type is: **{}**"),
+    "Top 3 content types and their counts": Query(by='Type', top=3),
+    "How many poems are there?": Query(where=['is_poem']),
+    "How many stories after 1990?": Query(where=['is_story', ('year', '>', 1990)]),
+    "How many stories are there?": Query(where=['is_story']),
+    "How many magazines are there?": Query(agg="nunique", of='Magazine'),
+    # 🔹 Publisher & Magazine
+    "Top 10 publishers": Query(by='Publisher', top=10),
+    "Top 10 magazines by publication count": Query(by='Magazine', top=10),
+    "Which magazine has the most publications?": Query(by='Magazine', top=1, answer="text", template="📰 Magazine with most publications: **{}**"),
+    "Which publisher published most content after 2000?": Query(where=[('year', '>', 2000)], by='Publisher', top=1, answer="value"),
+
+    # 🔹 Time-based
+    "Most recent publication year?": Query(agg="max", of='year'),
+    "Earliest publication year?": Query(agg="min", of='year'),
+    "How many works were published after 2000?": Query(where=[('year', '>', 2000)]),
+    "How many publications per decade?": Query(by='Decade', order="key"),
+    "Which year had the highest number of publications?": Query(by='Year', top=1, answer="value"),
+
+    # 🔹 Status & Metadata
+    "How many active records are there?": Query(where=['active']),
+    "How many inactive records are there?": Query(where=['inactive']),
+    "Which authors have inactive works only?": Query(by='Author', agg="all", of='inactive', having=("==", True), order="key", answer="list"),
+    "Which magazines have only active works?": Query(by='Magazine', agg="all", of='active', having=("==", True), order="key", answer="list"),
+    "Authors ranked by number of works (highest to lowest)": Query(by='Author'),
+    # 🔹 Vol, Link & Extras
+    "Which volume appears most often?": Query(by='Vol', top=1, answer="text", template="🔁 Most frequent volume: **{}**"),
+    "How many records have working links?": Query(where=['working_link']),
+    "How many records have broken links?": Query(where=['broken_link']),
+    "How many records have links not checked yet?": Query(where=['unchecked_link']),
+    "Which author has most linked documents?": Query(where=['has_link'], by='Author', top=1, answer="value"),
+    "Any unknown data?": Query(agg="missing", of=MISSING_COLUMNS),
+
+    # 🔹 Quality Checks
+    "How many missing publication dates?": Query(agg="missing", of=['Published date'], answer="scalar"),
+    "How many publication dates could not be parsed?": Query(where=['invalid_date']),
+    "How many publication dates have only a year or month?": Query(where=['partial_date']),
+    "Are there duplicate titles?": Query(agg="duplicated", of='Similar titles'),
+    "Top 10 duplicated titles": Query(by='Similar titles', having=(">", 1), top=10),
+    "How many records missing volume info?": Query(agg="missing", of=['Vol'], answer="scalar"),
+    "Authors ranked from lowest to highest (min 2 works)": Query(by='Author', having=(">=", 2), order="asc"),
+    "Magazines ranked from lowest to highest (min 2 records)": Query(by='Magazine', having=(">=", 2), order="asc"),
+    "Content types ranked from least to most common": Query(by='Type', order="asc"),
+    "Publishers ranked from lowest to highest (min 2 records)": Query(by='Publisher', having=(">=", 2), order="asc"),
+    "How many records missing magazine info?": Query(agg="missing", of=['Magazine'], answer="scalar"),
+}
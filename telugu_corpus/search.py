@@ -0,0 +1,316 @@
+"""Inverted n-gram index for the cross-field search box.
+
+Text is split into Telugu grapheme clusters (aksharas: a base letter with
+its vowel signs, viramas and conjunct consonants) so a match never lands in
+the middle of an akshara.  The index has two levels:
+
+* every distinct word of the searchable fields has a posting list of the
+  rows containing it, stored as one CSR pair of int32 arrays;
+* a 1..3-gram index over the graphemes of those words finds the words that
+  contain a query term without scanning the vocabulary.
+
+The n-grams only narrow the candidates; they are then checked in one
+vectorized substring scan over their graphemes, joined with a separator
+so a match always starts and ends on a grapheme boundary.
+
+Words and queries are compared in ``normalize``d form (NFC, without
+zero-width joiners, case-folded), so differently encoded spellings of the
+same text match.
+
+A query is split on whitespace and every term must match (AND).  A term
+matches a word containing its graphemes in order; the last grapheme of the
+term may be incomplete, so prefixes and half-typed aksharas already match.
+A term in Latin letters also matches Telugu words whose romanization
+contains it ("katha", "sri"): the ``phonetic_key`` of every Telugu word is
+kept with the index and searched with a vectorized substring scan.
+
+A merged delta (see ``telugu_corpus.delta``) updates the index instead of
+rebuilding it: only the changed rows are tokenized, and only the words new
+to the corpus get n-grams and romanizations.
+"""
+import bisect
+import copy
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from telugu_corpus.loader import derived
+from telugu_corpus.transliterate import ZERO_WIDTH, has_telugu, normalize, phonetic_key
+
+SEARCH_COLUMNS = ["Title", "Author", "Type", "Publisher", "Magazine"]
+GRAM_SIZE = 3
+
+_ZWJ = "\u200d"
+_ZWNJ = "\u200c"
+_VIRAMA_CLASS = 9
+
+# Joins the graphemes of a word for the candidate check; ``str.split``
+# treats it as whitespace, so no word contains it
+_SEPARATOR = "\x1f"
+
+
+def graphemes(text):
+    """Split ``text`` into grapheme clusters (aksharas for Telugu)."""
+    clusters = []
+    joins_next = False
+    for ch in text:
+        attaches = (
+            unicodedata.category(ch) in ("Mn", "Mc", "Me")
+            or ch in (_ZWJ, _ZWNJ)
+            or joins_next
+        )
+        if attaches and clusters:
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+        # A virama (optionally followed by ZWJ) glues the next consonant on
+        if unicodedata.combining(ch) == _VIRAMA_CLASS:
+            joins_next = True
+        elif ch != _ZWJ:
+            joins_next = False
+    return clusters
+
+
+def tokenize(text):
+    """Normalize ``text`` and split it into words."""
+    return normalize(text).split()
+
+
+def _grams(clusters, n):
+    return {tuple(clusters[i:i + n]) for i in range(len(clusters) - n + 1)}
+
+
+def _segmented(clusters):
+    # A term matches where its own segmented form is a substring; the last
+    # grapheme, not followed by a separator, may be a prefix
+    return _SEPARATOR + _SEPARATOR.join(clusters)
+
+
+def _column_pairs(series, vocab):
+    """Return (word id, row) pairs for one column, extending ``vocab``."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Tokenize each category once and fan out through the codes
+        codes = series.cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(series.cat.categories) + 1))
+        word_ids, rows = [], []
+        for code, category in enumerate(series.cat.categories):
+            members = order[bounds[code]:bounds[code + 1]]
+            for word in set(tokenize(str(category))):
+                word_ids.append(np.full(len(members), vocab.setdefault(word, len(vocab)), dtype=np.int64))
+                rows.append(members)
+        if not rows:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        return np.concatenate(word_ids), np.concatenate(rows).astype(np.int64)
+
+    text = series.astype(pd.StringDtype("pyarrow")).fillna("").str.normalize("NFC")
+    words = text.str.replace(f"[{ZERO_WIDTH}]", "", regex=True).str.casefold().str.split().explode().dropna()
+    local_ids, uniques = pd.factorize(words.to_numpy())
+    mapping = np.array([vocab.setdefault(w, len(vocab)) for w in uniques], dtype=np.int64)
+    positions = series.index.get_indexer(words.index)
+    return mapping[local_ids], positions.astype(np.int64)
+
+
+class SearchIndex:
+    """Grapheme n-gram index over the searchable columns of a corpus frame.
+
+    Build it with ``SearchIndex.build(df)``; ``search(query)`` returns the
+    sorted row positions (``iloc``) of ``df`` matching the query.
+    """
+
+    def __init__(self, words, offsets, rows, n_rows):
+        self.words = words
+        self.offsets = offsets
+        self.rows = rows
+        self.n_rows = n_rows
+
+        clusters = [tuple(graphemes(w)) for w in words]
+        self._segmented = pa.array([_segmented(c) for c in clusters], type=pa.string())
+        grams = {}
+        for word_id, clusters in enumerate(clusters):
+            for n in range(1, GRAM_SIZE + 1):
+                for gram in _grams(clusters, n):
+                    grams.setdefault(gram, []).append(word_id)
+        self._grams = {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+        # Sorted single graphemes, for completing a half-typed last akshara
+        self._alphabet = sorted(gram[0] for gram in self._grams if len(gram) == 1)
+        self._initials = self._initial_words(self._alphabet)
+
+        # Romanized Telugu words, for Latin queries
+        telugu = [w for w, word in enumerate(words) if has_telugu(word)]
+        self._roman_ids = np.array(telugu, dtype=np.int32)
+        self._roman = pa.array([phonetic_key(words[w]) for w in telugu], type=pa.string())
+
+    def _add_words(self, words):
+        """Index the n-grams and romanizations of ``words``, new to the vocabulary."""
+        first = len(self.words)
+        self.words = self.words + words
+        clusters = [tuple(graphemes(w)) for w in words]
+        self._segmented = pa.concat_arrays([
+            self._segmented, pa.array([_segmented(c) for c in clusters], type=pa.string()),
+        ])
+        grams = {}
+        for word_id, word_clusters in enumerate(clusters, first):
+            for n in range(1, GRAM_SIZE + 1):
+                for gram in _grams(word_clusters, n):
+                    grams.setdefault(gram, []).append(word_id)
+        self._grams = dict(self._grams)
+        for gram, ids in grams.items():
+            ids = np.array(ids, dtype=np.int32)
+            self._grams[gram] = np.concatenate([self._grams[gram], ids]) if gram in self._grams else ids
+        self._alphabet = sorted(set(self._alphabet).union(gram[0] for gram in grams if len(gram) == 1))
+        initials = {gram[0][0] for gram in grams if len(gram) == 1}
+        self._initials = dict(self._initials)
+        self._initials.update(self._initial_words([g for g in self._alphabet if g[0] in initials]))
+
+        telugu = [w for w, word in enumerate(words, first) if has_telugu(word)]
+        self._roman_ids = np.concatenate([self._roman_ids, np.array(telugu, dtype=np.int32)])
+        self._roman = pa.concat_arrays([
+            self._roman, pa.array([phonetic_key(self.words[w]) for w in telugu], type=pa.string()),
+        ])
+
+    def _initial_words(self, alphabet):
+        # Words with a grapheme starting with each letter, for a last
+        # akshara typed as a single letter: the most common prefix lookup,
+        # and the one whose graphemes are the most numerous to merge
+        ids = {}
+        for gram in alphabet:
+            ids.setdefault(gram[0], []).append(self._grams[(gram,)])
+        return {letter: np.unique(np.concatenate(arrays)) for letter, arrays in ids.items()}
+
+    @classmethod
+    def build(cls, df, columns=SEARCH_COLUMNS):
+        vocab = {}
+        word_ids, rows = zip(*(_column_pairs(df[col], vocab) for col in columns))
+        word_ids = np.concatenate(word_ids)
+        rows = np.concatenate(rows)
+
+        # Sort and deduplicate (word, row) pairs into CSR posting lists
+        n_rows = len(df)
+        keys = np.unique(word_ids * max(n_rows, 1) + rows)
+        sorted_words = keys // max(n_rows, 1)
+        offsets = np.searchsorted(sorted_words, np.arange(len(vocab) + 1)).astype(np.int64)
+        words = [None] * len(vocab)
+        for word, word_id in vocab.items():
+            words[word_id] = word
+        return cls(words, offsets, (keys % max(n_rows, 1)).astype(np.int32), n_rows)
+
+    def updated(self, df, change, columns=SEARCH_COLUMNS):
+        """The index of ``df``, the corpus after ``change``, reusing this one.
+
+        The postings of the updated rows are dropped and the changed rows
+        tokenized again; the other postings are merged in unchanged.
+        """
+        index = copy.copy(self)
+        n_rows = len(df)
+        rows = change.rows
+        vocab = {word: word_id for word_id, word in enumerate(self.words)}
+
+        # Words of the changed rows, tokenized as plain text so only the
+        # values of those rows are (a category would tokenize them all)
+        changed = df.iloc[rows].reset_index(drop=True)
+        pairs = [_column_pairs(changed[col].astype(pd.StringDtype("pyarrow")), vocab) for col in columns]
+        word_ids = np.concatenate([ids for ids, _ in pairs])
+        positions = rows[np.concatenate([positions for _, positions in pairs])]
+        index._add_words([word for word, word_id in vocab.items() if word_id >= len(self.words)])
+
+        # Keep the postings of unchanged rows, keyed by (word, row) for the new size
+        is_updated = np.zeros(n_rows, dtype=bool)
+        is_updated[change.updated] = True
+        keep = ~is_updated[self.rows]
+        old_words = np.repeat(np.arange(len(self.words), dtype=np.int64), np.diff(self.offsets))[keep]
+        keys = old_words * max(n_rows, 1) + self.rows[keep]
+        new_keys = np.unique(word_ids * max(n_rows, 1) + positions)
+        keys = np.insert(keys, np.searchsorted(keys, new_keys), new_keys)
+
+        index.offsets = np.searchsorted(keys // max(n_rows, 1), np.arange(len(vocab) + 1)).astype(np.int64)
+        index.rows = (keys % max(n_rows, 1)).astype(np.int32)
+        index.n_rows = n_rows
+        return index
+
+    def postings(self, word_id):
+        """Sorted row positions containing word ``word_id``."""
+        return self.rows[self.offsets[word_id]:self.offsets[word_id + 1]]
+
+    def _candidate_words(self, term):
+        head, last = term[:-1], term[-1]
+        candidates = None
+        if head:
+            if len(head) <= GRAM_SIZE:
+                lookups = [head]
+            else:
+                lookups = _grams(head, GRAM_SIZE)
+            for gram in lookups:
+                ids = self._grams.get(gram)
+                if ids is None:
+                    return np.empty(0, np.int32)
+                candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+
+        # Words containing any grapheme that starts with the last one typed
+        if len(last) == 1:
+            last_ids = self._initials.get(last)
+            if last_ids is None:
+                return np.empty(0, np.int32)
+        else:
+            start = bisect.bisect_left(self._alphabet, last)
+            end = start
+            while end < len(self._alphabet) and self._alphabet[end].startswith(last):
+                end += 1
+            if start == end:
+                return np.empty(0, np.int32)
+            last_ids = np.unique(np.concatenate([self._grams[(g,)] for g in self._alphabet[start:end]]))
+        if candidates is None:
+            return last_ids
+        return np.intersect1d(candidates, last_ids, assume_unique=True)
+
+    def _roman_words(self, term):
+        key = phonetic_key(term)
+        if not key or has_telugu(term):
+            return []
+        return self._roman_ids[pc.match_substring(self._roman, key).to_numpy(zero_copy_only=False)].tolist()
+
+    def match_words(self, term):
+        """Return the ids of the words matched by a single query term."""
+        clusters = tuple(graphemes(normalize(term)))
+        if not clusters:
+            return []
+        matches = self._candidate_words(clusters)
+        if len(clusters) > 1:
+            # Every candidate contains the graphemes; check they are in order
+            found = pc.match_substring(self._segmented.take(pa.array(matches)), _segmented(clusters))
+            matches = matches[found.to_numpy(zero_copy_only=False)]
+        matches = matches.tolist()
+        roman = self._roman_words(term)
+        return sorted(set(matches).union(roman)) if roman else matches
+
+    def search(self, query):
+        """Return sorted row positions matching every term of ``query``."""
+        terms = tokenize(query)
+        if not terms:
+            return np.arange(self.n_rows, dtype=np.int32)
+
+        result = None
+        # Rarest terms first keeps the running intersection small
+        matches = sorted(
+            (self.match_words(term) for term in terms),
+            key=lambda ids: sum(self.offsets[w + 1] - self.offsets[w] for w in ids),
+        )
+        for word_ids in matches:
+            if not word_ids:
+                return np.empty(0, np.int32)
+            if len(word_ids) == 1:
+                rows = self.postings(word_ids[0])
+            else:
+                rows = np.unique(np.concatenate([self.postings(w) for w in word_ids]))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
+
+
+def search_index(df):
+    """Return the shared ``SearchIndex`` for a cached corpus frame."""
+    return derived(df, "search_index", SearchIndex.build)
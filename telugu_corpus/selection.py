@@ -0,0 +1,65 @@
+"""Compact per-session selection state.
+
+Sessions don't keep their own copy of the filtered frame.  A ``Selection``
+holds the cache key of the shared, read-only corpus, the selected row
+positions and the filter spec that produced them.  Rows are kept as an
+int32 array or, when more than 1/32 of the corpus is selected, as a packed
+bitmap, whichever is smaller.  Pages resolve it lazily against the corpus.
+"""
+import numpy as np
+
+from telugu_corpus.loader import cached_corpus, corpus_key
+
+# Selections larger than 1/BITMAP_RATIO of the corpus are stored as bitmaps
+BITMAP_RATIO = 32
+
+
+class Selection:
+    """Row positions of one session's filter state in a shared corpus."""
+
+    def __init__(self, key, rows, n_rows, spec=None):
+        self.key = key
+        self.n_rows = n_rows
+        self.count = len(rows)
+        self.spec = spec or {}
+        if self.count * BITMAP_RATIO > n_rows:
+            mask = np.zeros(n_rows, dtype=bool)
+            mask[rows] = True
+            self._bitmap = np.packbits(mask, bitorder="little")
+            self._rows = None
+        else:
+            self._bitmap = None
+            self._rows = np.asarray(rows, dtype=np.int32).view()
+            self._rows.setflags(write=False)
+
+    @classmethod
+    def of(cls, df, rows, spec=None):
+        """Selection of ``rows`` in the cached corpus frame ``df``."""
+        return cls(corpus_key(df), rows, len(df), spec)
+
+    @property
+    def rows(self):
+        """Sorted int32 row positions."""
+        if self._bitmap is not None:
+            return np.flatnonzero(np.unpackbits(self._bitmap, count=self.n_rows, bitorder="little")).astype(np.int32)
+        return self._rows
+
+    @property
+    def nbytes(self):
+        return (self._bitmap if self._bitmap is not None else self._rows).nbytes
+
+    def corpus(self):
+        """The shared corpus frame, or None if that version is gone."""
+        if self.key is None:
+            return None
+        return cached_corpus(self.key)
+
+    def resolve(self):
+        """Materialize the selected rows as a DataFrame (a transient view)."""
+        df = self.corpus()
+        if df is None:
+            return None
+        return df.iloc[self.rows]
+
+    def __len__(self):
+        return self.count
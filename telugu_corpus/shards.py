@@ -0,0 +1,160 @@
+"""Loading a corpus kept as many CSV shards (per magazine, per decade, ...).
+
+A shard source is a directory (every ``*.csv`` in it) or a glob pattern.
+The shards are parsed in parallel by a process pool, each worker streaming
+its file through the same validation as uploads (``telugu_corpus.ingest``)
+and dictionary-encoding the categorical columns.  The parent concatenates
+the Arrow tables and unifies their dictionaries, which remaps the integer
+indices instead of re-encoding the strings.
+
+Every shard is validated before anything is combined; a shard that fails,
+or whose columns differ from the others, is reported by file name in a
+single ``ShardError``.  The combined table is written to a sidecar keyed by
+the names, mtimes and sizes of the shards, so a restart memory-maps it
+instead of parsing the shards again.  Each change to a shard gives a new
+sidecar, so only the ``MAX_SHARD_SIDECARS`` most recently used are kept.
+"""
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from telugu_corpus import sidecar
+from telugu_corpus.frame import CATEGORY_COLUMNS, arrow_types_mapper
+from telugu_corpus.ingest import SchemaError, read_batches
+
+SHARD_PATTERN = "*.csv"
+
+# Combined shard sidecars kept on disk; older ones are deleted after each new one
+MAX_SHARD_SIDECARS = 4
+
+
+class ShardError(SchemaError):
+    """Some shards could not be read; ``errors`` maps file names to reasons."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        details = "; ".join(f"{os.path.basename(path)}: {reason}" for path, reason in errors.items())
+        super().__init__(f"{len(errors)} shard(s) failed: {details}")
+
+
+def is_shard_source(source):
+    """True if ``source`` names a directory or a glob of shards.
+
+    An existing file is never a glob, even with brackets in its name (the
+    default corpus is ``sorted_data[1].csv``).
+    """
+    if os.path.isfile(source):
+        return False
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def shard_paths(source):
+    """The sorted CSV paths of a directory or glob ``source``."""
+    pattern = os.path.join(source, SHARD_PATTERN) if os.path.isdir(source) else source
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def shards_fingerprint(source):
+    """Fingerprint a shard source by the names, mtimes and sizes of its files."""
+    h = hashlib.sha256()
+    for path in shard_paths(source):
+        stat = os.stat(path)
+        h.update(f"{os.path.abspath(path)}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return ("shards", os.path.abspath(source), h.hexdigest())
+
+
+def _parse_shard(path):
+    """Parse one shard: ``(table, None)`` or ``(None, reason)``."""
+    try:
+        with open(path, "rb") as source:
+            table = pa.Table.from_batches(list(read_batches(source)))
+    except (SchemaError, OSError, UnicodeDecodeError) as e:
+        return None, str(e)
+    for col in CATEGORY_COLUMNS:
+        i = table.schema.get_field_index(col)
+        table = table.set_column(i, col, pc.dictionary_encode(table[col]))
+    return table, None
+
+
+def read_shards(paths, workers=None):
+    """Parse ``paths`` in a process pool into one table with unified dictionaries.
+
+    Raises ``ShardError`` naming every shard that failed.
+    """
+    if not paths:
+        raise SchemaError("No CSV shards found")
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(paths))) as pool:
+        parsed = list(pool.map(_parse_shard, paths))
+
+    errors = {path: reason for path, (_, reason) in zip(paths, parsed) if reason is not None}
+    tables = {path: table for path, (table, _) in zip(paths, parsed) if table is not None}
+    if tables:
+        # Every shard must have the columns of the first readable one, in
+        # any order
+        first_path, first = next(iter(tables.items()))
+        for path, table in tables.items():
+            if set(table.schema.names) == set(first.schema.names):
+                tables[path] = table.select(first.schema.names)
+            else:
+                extra = sorted(set(table.schema.names) - set(first.schema.names))
+                missing = sorted(set(first.schema.names) - set(table.schema.names))
+                errors[path] = (
+                    f"columns differ from {os.path.basename(first_path)}"
+                    + (f" (extra: {', '.join(extra)})" if extra else "")
+                    + (f" (missing: {', '.join(missing)})" if missing else "")
+                )
+    if errors:
+        raise ShardError({path: errors[path] for path in paths if path in errors})
+    return pa.concat_tables(list(tables.values())).unify_dictionaries()
+
+
+def _sort_categories(df):
+    # The rest of the package expects categories in lexical order, as
+    # ``astype('category')`` gives; reordering only remaps the codes
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+
+def prune_shard_sidecars(directory, keep=MAX_SHARD_SIDECARS):
+    """Delete all but the ``keep`` most recently used shard sidecars in ``directory``."""
+    entries = []
+    for path in glob.glob(os.path.join(glob.escape(directory), f"shards-*{sidecar.SIDECAR_SUFFIX}")):
+        try:
+            entries.append((os.stat(path).st_mtime_ns, path))
+        except OSError:
+            pass
+    for _, path in sorted(entries, reverse=True)[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_shards(source, workers=None):
+    """Parse the shards of ``source`` into one frame, through a sidecar."""
+    digest = shards_fingerprint(source)[2]
+    dest = sidecar.upload_sidecar_path(f"shards-{digest}")
+    if os.path.exists(dest):
+        try:
+            # Mark it as recently used so pruning keeps it
+            os.utime(dest)
+            return _sort_categories(sidecar.read_sidecar(dest))
+        except OSError:
+            pass
+    table = read_shards(shard_paths(source), workers)
+    try:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = dest + ".tmp"
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, dest)
+        prune_shard_sidecars(os.path.dirname(dest))
+    except OSError:
+        pass
+    return _sort_categories(table.to_pandas(types_mapper=arrow_types_mapper))
@@ -0,0 +1,146 @@
+"""Binary columnar sidecar for the corpus CSV.
+
+A CSV is ingested once into an uncompressed Arrow IPC file with its dtypes
+already parsed (``Published date`` with its ``Year``/``Month`` keys and
+``Date precision``, boolean ``STATUS`` and dictionary-encoded ``Type``,
+``Author``, ``Publisher`` and ``Magazine``).
+Later loads memory-map the sidecar instead of re-parsing the text, so start
+up no longer grows with the size of the CSV.
+
+Build a sidecar ahead of time with::
+
+    python -m telugu_corpus.sidecar "sorted_data[1].csv"
+"""
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from telugu_corpus.dates import parse_dates
+from telugu_corpus.frame import CATEGORY_COLUMNS, arrow_types_mapper
+
+SIDECAR_SUFFIX = ".arrow"
+
+# Schema metadata keys recording which CSV the sidecar was built from, and
+# with which layout (bump SIDECAR_VERSION when parse_dtypes changes)
+_SOURCE_MTIME = b"telugu_corpus.source_mtime_ns"
+_SOURCE_SIZE = b"telugu_corpus.source_size"
+_VERSION = b"telugu_corpus.sidecar_version"
+SIDECAR_VERSION = b"3"
+
+
+def sidecar_path(csv_path):
+    """Return the sidecar location next to ``csv_path``."""
+    root, _ = os.path.splitext(csv_path)
+    return root + SIDECAR_SUFFIX
+
+
+def upload_sidecar_path(digest):
+    """Return the sidecar location for an uploaded file with hash ``digest``."""
+    name = f"{digest}.v{SIDECAR_VERSION.decode()}{SIDECAR_SUFFIX}"
+    return os.path.join(tempfile.gettempdir(), "telugu_corpus", name)
+
+
+def parse_dtypes(df):
+    """Convert a raw CSV frame to the dtypes stored in the sidecar."""
+    df = df.copy()
+    keys = parse_dates(df['Published date'])
+    for col in keys.columns:
+        df[col] = keys[col]
+
+    status = df['STATUS']
+    if status.dtype != bool:
+        status = status.astype(str).str.strip().str.lower().map({'true': True, 'false': False})
+    df['STATUS'] = status.astype('boolean')
+
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def write_sidecar(df, dest, source_stat=None):
+    """Write an already parsed frame to ``dest`` as an Arrow IPC file.
+
+    ``source_stat`` is the ``os.stat`` of the CSV it came from; it is stored
+    in the schema so a stale sidecar can be detected.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if source_stat is not None:
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _SOURCE_MTIME: str(source_stat.st_mtime_ns).encode(),
+            _SOURCE_SIZE: str(source_stat.st_size).encode(),
+            _VERSION: SIDECAR_VERSION,
+        })
+
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    # Write to a temporary file first so readers never see a partial sidecar
+    tmp = dest + ".tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, dest)
+    return dest
+
+
+def build_sidecar(csv_path, dest=None):
+    """Ingest ``csv_path`` into its sidecar and return the sidecar path."""
+    dest = dest or sidecar_path(csv_path)
+    stat = os.stat(csv_path)
+    df = parse_dtypes(pd.read_csv(csv_path))
+    return write_sidecar(df, dest, source_stat=stat)
+
+
+def is_fresh(csv_path, dest=None):
+    """Return True if the sidecar for ``csv_path`` exists and matches it."""
+    dest = dest or sidecar_path(csv_path)
+    if not os.path.exists(dest):
+        return False
+    stat = os.stat(csv_path)
+    try:
+        with pa.memory_map(dest) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except pa.ArrowInvalid:
+        return False
+    return (
+        metadata.get(_SOURCE_MTIME) == str(stat.st_mtime_ns).encode()
+        and metadata.get(_SOURCE_SIZE) == str(stat.st_size).encode()
+        and metadata.get(_VERSION) == SIDECAR_VERSION
+    )
+
+
+def read_sidecar(path):
+    """Open a sidecar memory-mapped and return it as a DataFrame."""
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(types_mapper=arrow_types_mapper)
+
+
+def load_csv_via_sidecar(csv_path):
+    """Load ``csv_path`` through its sidecar, (re)building it when stale.
+
+    Falls back to parsing the CSV directly when the sidecar cannot be
+    written, e.g. on a read-only deployment.
+    """
+    dest = sidecar_path(csv_path)
+    try:
+        if not is_fresh(csv_path, dest):
+            build_sidecar(csv_path, dest)
+    except OSError:
+        return parse_dtypes(pd.read_csv(csv_path))
+    return read_sidecar(dest)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Arrow sidecar for a corpus CSV.")
+    parser.add_argument("csv", help="Path of the corpus CSV file")
+    parser.add_argument("-o", "--output", help="Sidecar path (default: next to the CSV)")
+    args = parser.parse_args(argv)
+    dest = build_sidecar(args.csv, args.output)
+    print(f"Wrote {dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Normalization and romanization of Telugu text for matching typed input.
+
+``normalize`` is the canonical form text is compared in: NFC (so composed
+and decomposed vowel signs such as ``ై`` are equal), without zero-width
+joiners and spaces, case-folded, with single spaces.
+
+``to_iso15919`` transliterates Telugu script to ISO 15919 (``శ్రీ శ్రీ`` ->
+``śrī śrī``).  People rarely type it exactly, and spell the same sounds in
+several ways ("sri" / "shri", "chalam" / "calam", "ee" / "i", "kaTha" /
+"katha"), so matching goes through ``phonetic_key``, a lossy folding
+applied the same way to the romanized text and to the typed query.
+"""
+import re
+import unicodedata
+
+# Independent vowels
+VOWELS = {
+    "అ": "a", "ఆ": "ā", "ఇ": "i", "ఈ": "ī", "ఉ": "u", "ఊ": "ū",
+    "ఋ": "r̥", "ౠ": "r̥̄", "ఌ": "l̥", "ౡ": "l̥̄",
+    "ఎ": "e", "ఏ": "ē", "ఐ": "ai", "ఒ": "o", "ఓ": "ō", "ఔ": "au",
+}
+
+# Dependent vowel signs (matras); the virama suppresses the inherent "a"
+VOWEL_SIGNS = {
+    "ా": "ā", "ి": "i", "ీ": "ī", "ు": "u", "ూ": "ū", "ృ": "r̥", "ౄ": "r̥̄",
+    "ె": "e", "ే": "ē", "ై": "ai", "ొ": "o", "ో": "ō", "ౌ": "au", "్": "",
+    "ౢ": "l̥", "ౣ": "l̥̄",
+}
+
+CONSONANTS = {
+    "క": "k", "ఖ": "kh", "గ": "g", "ఘ": "gh", "ఙ": "ṅ",
+    "చ": "c", "ఛ": "ch", "జ": "j", "ఝ": "jh", "ఞ": "ñ",
+    "ట": "ṭ", "ఠ": "ṭh", "డ": "ḍ", "ఢ": "ḍh", "ణ": "ṇ",
+    "త": "t", "థ": "th", "ద": "d", "ధ": "dh", "న": "n",
+    "ప": "p", "ఫ": "ph", "బ": "b", "భ": "bh", "మ": "m",
+    "య": "y", "ర": "r", "ఱ": "ṟ", "ల": "l", "ళ": "ḷ", "ఴ": "ḻ", "వ": "v",
+    "శ": "ś", "ష": "ṣ", "స": "s", "హ": "h", "ౘ": "ts", "ౙ": "dz",
+}
+
+MARKS = {"ం": "ṁ", "ః": "ḥ", "ఁ": "m̐", "ఽ": "'"}
+
+DIGITS = {chr(0x0C66 + i): str(i) for i in range(10)}
+
+ISO15919 = (VOWELS, VOWEL_SIGNS, CONSONANTS, MARKS)
+
+# Zero-width space, non-joiner, joiner and byte order mark
+ZERO_WIDTH = "\u200b\u200c\u200d\ufeff"
+
+_TELUGU = re.compile("[\u0c00-\u0c7f]")
+_ZERO_WIDTH = str.maketrans("", "", ZERO_WIDTH)
+
+# Spellings folded together by phonetic_key, applied in order
+_FOLDS = [
+    (re.compile(r"r̥"), "ri"),
+    (re.compile(r"ṁ(?=[pbm])"), "m"),
+    (re.compile(r"ṁ(?=[kgcjṭḍtdnyrlvśṣsh])"), "n"),
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"([kgcjtdpb])h"), r"\1"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def has_telugu(text):
+    """True if ``text`` contains Telugu script."""
+    return bool(_TELUGU.search(text))
+
+
+def normalize(text):
+    """Canonical form of ``text`` for matching (see module docstring)."""
+    return " ".join(unicodedata.normalize("NFC", text).translate(_ZERO_WIDTH).casefold().split())
+
+
+def transliterate(text, scheme=ISO15919):
+    """Transliterate the Telugu letters of ``text`` with ``scheme``.
+
+    ``scheme`` is a ``(vowels, vowel signs, consonants, marks)`` tuple of
+    tables such as ``ISO15919``; other characters are kept as they are.
+    """
+    vowels, vowel_signs, consonants, marks = scheme
+    out = []
+    pending_a = False  # a consonant waiting for its vowel
+    for ch in unicodedata.normalize("NFC", text).translate(_ZERO_WIDTH):
+        if ch in vowel_signs and pending_a:
+            out.append(vowel_signs[ch])
+            pending_a = False
+            continue
+        if pending_a:
+            out.append("a")
+            pending_a = False
+        if ch in consonants:
+            out.append(consonants[ch])
+            pending_a = True
+        elif ch in vowels:
+            out.append(vowels[ch])
+        elif ch in marks:
+            out.append(marks[ch])
+        else:
+            out.append(DIGITS.get(ch, ch))
+    if pending_a:
+        out.append("a")
+    return "".join(out)
+
+
+def to_iso15919(text):
+    """Transliterate the Telugu letters of ``text`` to ISO 15919."""
+    return transliterate(text, ISO15919)
+
+
+def phonetic_key(text):
+    """Fold Telugu or romanized ``text`` to a plain-ASCII matching key.
+
+    Telugu script is transliterated first; diacritics, aspiration and
+    doubled letters are then dropped, so ``శ్రీ శ్రీ``, "Sri Sri" and
+    "shree shree" share the key ``sri sri``.
+    """
+    text = to_iso15919(text).casefold() if has_telugu(text) else text.casefold()
+    for pattern, repl in _FOLDS:
+        text = pattern.sub(repl, text)
+    text = "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", text).split())
@@ -0,0 +1,47 @@
+"""Corpus counts and the command line over a small corpus file."""
+import pandas as pd
+import pytest
+
+from telugu_corpus import Corpus, clear_cache
+from telugu_corpus.cli import main
+
+RECORDS = [
+    (1, "అమ్మ", "కథ", "గురజాడ అప్పారావు", "వాణీ ప్రకాశన్", "ఆంధ్రజ్యోతి", "1938-05-04", "12", "http://example.com/1", True),
+    (2, "వాన", "కవిత", "శ్రీ శ్రీ", "ఎమెస్కో", "భారతి", "1945", "", "", False),
+    (3, "నది", "కథ", "శ్రీ శ్రీ", "వాణీ ప్రకాశన్", "భారతి", "1952-03", "3", "http://example.com/3", True),
+    (4, "ఊరు", "కథ", "గురజాడ అప్పారావు", "ఎమెస్కో", "ఆంధ్రజ్యోతి", "1958-11-20", "", "", True),
+]
+COLUMNS = ['ID', 'Title', 'Type', 'Author', 'Publisher', 'Magazine', 'Published date', 'Vol', 'Link', 'STATUS']
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "corpus.csv"
+    pd.DataFrame(RECORDS, columns=COLUMNS).to_csv(path, index=False)
+    yield str(path)
+    clear_cache()
+
+
+@pytest.mark.parametrize("by", [["Type"], ["Year", "STATUS"], ["Author"], ["Decade"], ["Decade", "Type"]])
+def test_counts_match_the_rows(csv_path, by):
+    corpus = Corpus.load(csv_path)
+    expected = corpus.df[by].groupby(by, observed=True).size()
+    counts = corpus.counts(by)
+    assert counts[counts > 0].sort_index().to_dict() == expected.sort_index().to_dict()
+
+
+def test_counts_outside_the_cube_with_filters(csv_path):
+    corpus = Corpus.load(csv_path)
+    counts = corpus.counts("Author", {'Type': 'కథ'})
+    assert counts.to_dict() == {"గురజాడ అప్పారావు": 2, "శ్రీ శ్రీ": 1}
+
+
+def test_cli_counts_by_author(csv_path, capsys):
+    assert main(["counts", "Author", "--csv", csv_path]) == 0
+    out = capsys.readouterr().out
+    assert "గురజాడ అప్పారావు" in out and "శ్రీ శ్రీ" in out
+
+
+def test_cli_rejects_unknown_sort_column(csv_path):
+    with pytest.raises(SystemExit):
+        main(["records", "--sort", "Autor", "--csv", csv_path])
@@ -0,0 +1,162 @@
+"""LinkChecker and refresh_links against a local stub HTTP server."""
+import asyncio
+import socketserver
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from telugu_corpus.links import LinkCache, LinkChecker, refresh_links
+
+# Path -> (status, Location header)
+ROUTES = {
+    "/ok": (200, None),
+    "/moved": (301, "/ok"),
+    "/missing": (404, None),
+    "/loop": (302, "/loop"),
+    "/down": (503, None),
+    "/no-head": (200, None),
+}
+
+OK_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        self.server.hits[self.path] += 1
+        status, location = ROUTES.get(self.path, (404, None))
+        if self.command == "HEAD" and self.path == "/no-head":
+            status = 405
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = do_GET = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    httpd.hits = Counter()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class RawHandler(socketserver.BaseRequestHandler):
+    """Answers connection ``n`` (from 1) with ``server.respond(n)``; None closes it."""
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+            n = self.server.connections
+        self.request.recv(65536)
+        response = self.server.respond(n)
+        if response is not None:
+            self.request.sendall(response)
+
+
+@pytest.fixture
+def raw_server():
+    servers = []
+
+    def start(respond):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), RawHandler)
+        server.daemon_threads = True
+        server.respond, server.connections, server.lock = respond, 0, threading.Lock()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _check(server, path, **options):
+    checker = LinkChecker(backoff=0, **options)
+    return asyncio.run(checker.check_all([_url(server, path)]))[0]
+
+
+def test_working_link(server):
+    result = _check(server, "/ok")
+    assert (result.status, result.error) == (200, None)
+
+
+def test_redirect_is_followed(server):
+    result = _check(server, "/moved")
+    assert result.status == 200
+    assert result.final_url == _url(server, "/ok")
+
+
+def test_head_not_allowed_falls_back_to_get(server):
+    assert _check(server, "/no-head").status == 200
+    assert server.hits["/no-head"] == 2
+
+
+def test_client_error_is_not_retried(server):
+    assert _check(server, "/missing", retries=2).status == 404
+    assert server.hits["/missing"] == 1
+
+
+def test_redirect_loop_is_not_retried(server):
+    result = _check(server, "/loop", retries=2, max_redirects=5)
+    assert result.status is None
+    assert "redirects" in result.error
+    assert server.hits["/loop"] == 6
+
+
+def test_server_error_is_retried(server):
+    assert _check(server, "/down", retries=2).status == 503
+    assert server.hits["/down"] == 3
+
+
+def test_dropped_connection_is_retried(raw_server):
+    # The first connection is closed without a response
+    server = raw_server(lambda n: OK_RESPONSE if n > 1 else None)
+    assert _check(server, "/", retries=2).status == 200
+    assert server.connections == 2
+
+
+def test_connection_error_is_retried_until_given_up(raw_server):
+    server = raw_server(lambda n: None)
+    result = _check(server, "/", retries=2)
+    assert result.status is None and result.error
+    assert server.connections == 3
+
+
+def test_oversized_header_is_not_retried(raw_server):
+    huge = b"HTTP/1.1 200 OK\r\nX-Padding: " + b"x" * 200_000 + b"\r\n\r\n"
+    server = raw_server(lambda n: huge)
+    checker = LinkChecker(backoff=0, retries=2)
+    # One misbehaving host does not abort the other checks
+    results = asyncio.run(checker.check_all([_url(server, "/"), "ftp://example.com/"]))
+    assert len(results) == 2
+    result = next(r for r in results if r.url == _url(server, "/"))
+    assert result.status is None and "LimitOverrunError" in result.error
+    assert server.connections == 1
+
+
+def test_refresh_only_checks_stale_links(server, tmp_path):
+    cache = LinkCache(str(tmp_path / "links.sqlite"))
+    urls = [_url(server, "/ok"), _url(server, "/missing")]
+    assert refresh_links(urls, cache, backoff=0) == 2
+    assert refresh_links(urls, cache, backoff=0) == 0
+    results = cache.results().set_index("url")
+    assert results.loc[urls[0], "status"] == 200
+    assert results.loc[urls[1], "status"] == 404